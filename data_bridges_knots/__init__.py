@@ -2,17 +2,54 @@
 
 """
 Wrapper for DataBridges client.
+
+Public names are imported lazily on first access, so ``import data_bridges_knots``
+does not load the generated client, pandas, numpy or yaml until they are needed.
 """
 
-from .client import DataBridgesKnots, config_from_env
-from .labels import get_choice_labels, get_variable_labels, map_value_labels
+import importlib
+import logging
+
+# The package logs nowhere until enable_logging() is called
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    "DataBridgesKnots": "client",
+    "config_from_env": "client",
+    "get_choice_labels": "labels",
+    "get_variable_labels": "labels",
+    "map_value_labels": "labels",
+    "LabelBundle": "bundle",
+    "compile_label_bundle": "bundle",
+    "enable_logging": "log",
+    "disable_logging": "log",
+}
 
 __all__ = [
-    "DataBridgesKnots",
     "DataBridgesKnots",
     "labels",
     "get_variable_labels",
     "get_choice_labels",
     "map_value_labels",
     "config_from_env",
+    "LabelBundle",
+    "compile_label_bundle",
+    "enable_logging",
+    "disable_logging",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name == "labels":
+        return importlib.import_module(".labels", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
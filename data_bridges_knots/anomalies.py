@@ -0,0 +1,237 @@
+from typing import Dict, Optional, Sequence
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.cube import (
+    MARKET_COLUMNS,
+    MARKET_LABELS,
+    SERIES_COLUMNS,
+    SERIES_LABELS,
+    _encode,
+    _month_numbers,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cells of the series x month block processed at once, bounding memory to
+# ~32 MB per intermediate array
+_CHUNK_ELEMENTS = 2**22
+# Variances this small relative to the mean square are rounding noise
+_VARIANCE_EPSILON = 1e-9
+
+METRIC_COLUMNS = (
+    "rollingMean",
+    "rollingStd",
+    "zScore",
+    "momChange",
+    "yoyChange",
+    "seasonalMean",
+    "seasonalDeviation",
+)
+
+
+def _change(values: np.ndarray, periods: int) -> np.ndarray:
+    changes = np.full_like(values, np.nan)
+    if periods < values.shape[1]:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            changes[:, periods:] = values[:, periods:] / values[:, :-periods] - 1
+    return changes
+
+
+def _trailing_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the ``window`` months before each month, the month excluded."""
+    sums = np.zeros_like(values)
+    sums[:, 1:] = np.cumsum(values, axis=1)[:, :-1]
+    sums[:, window:] -= sums[:, :-window].copy()
+    return sums
+
+
+def series_metrics(
+    values: np.ndarray, window: int = 12, min_periods: int = 6, min_years: int = 1
+) -> Dict[str, np.ndarray]:
+    """Anomaly metrics of a series x month price array.
+
+    Column ``j`` of ``values`` must be calendar month ``j % 12`` (column 0 a
+    January), NaN where no price was reported. Every metric compares a month with
+    earlier months only, so adding months never changes past values.
+
+    Args:
+        values (numpy.ndarray): Prices, shape ``(series, months)``
+        window (int, optional): Months in the trailing window. Defaults to 12.
+        min_periods (int, optional): Prices needed in the window. Defaults to 6.
+        min_years (int, optional): Earlier years with a price in the same
+            calendar month needed for the seasonal mean. Defaults to 1.
+
+    Returns:
+        dict: ``METRIC_COLUMNS`` to arrays shaped like ``values``
+    """
+    present = ~np.isnan(values)
+    counts = present.sum(axis=1, keepdims=True)
+    # Centering each series keeps the sums of squares below well conditioned
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.where(counts > 0, np.nansum(values, axis=1, keepdims=True), 0)
+        center = center / np.maximum(counts, 1)
+    centered = np.where(present, values - center, 0.0)
+
+    n = _trailing_sums(present.astype(values.dtype), window)
+    sums = _trailing_sums(centered, window)
+    squares = _trailing_sums(centered**2, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / n
+        variance = (squares - sums * mean) / (n - 1)
+        variance[variance <= _VARIANCE_EPSILON * squares / n] = 0.0
+        std = np.sqrt(variance)
+        enough = n >= max(min_periods, 2)
+        mean = np.where(enough, mean + center, np.nan)
+        std = np.where(enough, std, np.nan)
+        # A flat window gives no scale to measure a deviation against
+        z_score = np.where(std > 0, (values - mean) / std, np.nan)
+
+    # Same calendar month in earlier years: fold months into (years, 12)
+    n_series, n_months = values.shape
+    by_year = values.reshape(n_series, n_months // 12, 12)
+    year_present = ~np.isnan(by_year)
+    year_counts = np.cumsum(year_present, axis=1) - year_present
+    year_sums = np.cumsum(np.where(year_present, by_year, 0.0), axis=1)
+    year_sums -= np.where(year_present, by_year, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        seasonal = np.where(
+            year_counts >= max(min_years, 1), year_sums / year_counts, np.nan
+        ).reshape(n_series, n_months)
+        seasonal_deviation = values / seasonal - 1
+
+    return {
+        "rollingMean": mean,
+        "rollingStd": std,
+        "zScore": z_score,
+        "momChange": _change(values, 1),
+        "yoyChange": _change(values, 12),
+        "seasonalMean": seasonal,
+        "seasonalDeviation": seasonal_deviation,
+    }
+
+
+def detect_anomalies(
+    prices: pd.DataFrame,
+    window: int = 12,
+    min_periods: Optional[int] = None,
+    z_threshold: float = 3.0,
+    min_years: int = 1,
+    market_columns: Sequence[str] = MARKET_COLUMNS,
+    series_columns: Sequence[str] = SERIES_COLUMNS,
+    date_column: str = "commodityPriceDate",
+    price_column: str = "commodityPrice",
+) -> pd.DataFrame:
+    """Score every monthly price of every market series for anomalies.
+
+    A series is one market's prices of a commodity in one unit, price type and
+    currency; several prices in a month are averaged. For each month with a
+    price this computes:
+
+    - ``rollingMean``, ``rollingStd`` and ``zScore``: the price against the mean
+      and standard deviation of the ``window`` months before it;
+    - ``momChange`` and ``yoyChange``: relative change from the previous month
+      and from the same month a year earlier;
+    - ``seasonalMean`` and ``seasonalDeviation``: the mean price of the same
+      calendar month in earlier years, and the relative deviation from it.
+
+    ``anomaly`` is True where ``|zScore| >= z_threshold``. Series are laid out
+    as rows of a series x month array, processed in blocks of rows, so the work
+    is whole-array arithmetic with no per-series Python code.
+
+    Args:
+        prices (pandas.DataFrame): Long price rows, e.g. from ``get_prices``
+        window (int, optional): Months in the trailing window. Defaults to 12.
+        min_periods (int, optional): Prices needed in the window for a z-score.
+            Defaults to half the window, and at least 2.
+        z_threshold (float, optional): Absolute z-score flagged as an anomaly.
+            Defaults to 3.0.
+        min_years (int, optional): Earlier years needed for a seasonal mean.
+            Defaults to 1.
+        market_columns (Sequence[str], optional): Columns identifying a market.
+            Defaults to ``("marketID",)``.
+        series_columns (Sequence[str], optional): Columns identifying a price
+            series. Defaults to ``SERIES_COLUMNS``.
+        date_column (str, optional): Price date column. Defaults to
+            "commodityPriceDate".
+        price_column (str, optional): Price column. Defaults to "commodityPrice".
+
+    Returns:
+        pandas.DataFrame: One row per series and month with a price: the key and
+        label columns, ``month`` (a monthly period), ``price``, the metric
+        columns and ``anomaly``, ordered by series and month
+
+    Examples:
+        >>> prices = client.get_prices("KEN", "2015-01-01")
+        >>> scores = detect_anomalies(prices, window=12, z_threshold=2.5)
+        >>> alerts = scores[scores["anomaly"] & (scores["month"] >= "2025-01")]
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    min_periods = max(window // 2, 2) if min_periods is None else min_periods
+
+    price = pd.to_numeric(prices[price_column], errors="coerce").to_numpy(float)
+    month = _month_numbers(prices[date_column])
+    keys = list(market_columns) + list(series_columns)
+    usable = (
+        ~np.isnan(price)
+        & ~np.isnan(month)
+        & prices[keys].notna().all(axis=1).to_numpy()
+    )
+    prices = prices[usable]
+    price, month = price[usable], month[usable].astype(np.int64)
+
+    codes, labels = _encode(prices, keys, MARKET_LABELS + SERIES_LABELS)
+    if not len(labels):
+        columns = list(labels.columns) + ["month", "price", *METRIC_COLUMNS, "anomaly"]
+        return pd.DataFrame(columns=columns)
+
+    # Months start on a January so that column % 12 is the calendar month
+    first_year = int(month.min()) // 12
+    columns = month - first_year * 12
+    width = (int(columns.max()) // 12 + 1) * 12
+    months = pd.period_range(f"{first_year}-01", periods=width, freq="M")
+
+    # Group rows by block; there are few blocks, so a narrow type lets NumPy
+    # use a radix sort
+    step = max(1, _CHUNK_ELEMENTS // width)
+    blocks = codes // step
+    if blocks.max() < 2**16:
+        blocks = blocks.astype(np.uint16)
+    order = np.argsort(blocks, kind="stable")
+    bounds = np.append(0, np.cumsum(np.bincount(blocks)))
+    rows, cells, values, metrics = [], [], [], {c: [] for c in METRIC_COLUMNS}
+    for chunk, start in enumerate(range(0, len(labels), step)):
+        members = order[bounds[chunk] : bounds[chunk + 1]]
+        n_rows = min(step, len(labels) - start)
+        flat = (codes[members] - start) * width + columns[members]
+        sums = np.bincount(flat, weights=price[members], minlength=n_rows * width)
+        counts = np.bincount(flat, minlength=n_rows * width)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block = np.where(counts > 0, sums / counts, np.nan).reshape(n_rows, width)
+
+        scores = series_metrics(block, window, min_periods, min_years)
+        row, cell = np.nonzero(~np.isnan(block))
+        rows.append(row + start)
+        cells.append(cell)
+        values.append(block[row, cell])
+        for name in METRIC_COLUMNS:
+            metrics[name].append(scores[name][row, cell])
+
+    rows = np.concatenate(rows)
+    df = labels.iloc[rows].reset_index(drop=True)
+    df["month"] = months[np.concatenate(cells)]
+    df["price"] = np.concatenate(values)
+    for name in METRIC_COLUMNS:
+        df[name] = np.concatenate(metrics[name])
+    df["anomaly"] = (df["zScore"].abs() >= z_threshold).to_numpy()
+    logger.debug(
+        "Scored %d prices of %d series, %d anomalies",
+        len(df),
+        len(labels),
+        int(df["anomaly"].sum()),
+    )
+    return df
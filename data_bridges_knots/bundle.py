@@ -0,0 +1,253 @@
+from typing import Dict, Hashable, Optional, Tuple, Union
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.labels import get_choice_labels, get_variable_labels
+
+BUNDLE_FORMAT_VERSION = 1
+
+_MANIFEST = "bundle.json"
+_ARRAYS = (
+    "variables",
+    "variable_labels",
+    "type_codes",
+    "type_names",
+    "choice_offsets",
+    "choice_values",
+    "choice_labels",
+)
+
+
+def _str_array(values) -> np.ndarray:
+    # Fixed-width unicode so the arrays can be memory-mapped without pickling.
+    arr = np.asarray([str(v) for v in values], dtype=np.str_)
+    return arr if arr.size else np.asarray([], dtype="<U1")
+
+
+def compile_label_bundle(
+    xlsform_df: pd.DataFrame,
+    path: Union[str, Path],
+    xls_form_id: Optional[Hashable] = None,
+) -> Path:
+    """
+    Compile an XLSForm into a versioned label bundle stored on disk.
+
+    The bundle holds the variable-label map, the choice maps as flat arrays indexed
+    by variable, and the question-type index. Arrays are saved as ``.npy`` files so
+    :class:`LabelBundle` can memory-map them instead of re-parsing the form.
+
+    Args:
+        xlsform_df (pandas.DataFrame): Questionnaire with ``"name"``, ``"label"`` and
+            ``"choiceList"`` columns, and optionally ``"type"``.
+        path (str | Path): Directory to write the bundle to. Replaced if it exists.
+        xls_form_id (int, optional): Form ID recorded in the bundle manifest.
+
+    Returns:
+        Path: The bundle directory.
+
+    Examples:
+        >>> questionnaire = client.get_household_questionnaire(2075)
+        >>> compile_label_bundle(questionnaire, "labels/2075", xls_form_id=2075)
+        >>> bundle = LabelBundle.load("labels/2075")
+    """
+    path = Path(path)
+    variable_labels = get_variable_labels(xlsform_df, format="dict")
+    choice_labels = get_choice_labels(xlsform_df.copy(), format="dict")
+
+    if "type" in xlsform_df.columns:
+        types = dict(zip(xlsform_df["name"].astype(str), xlsform_df["type"]))
+    else:
+        types = {}
+
+    variables = list(variable_labels)
+    type_per_var = [
+        "" if pd.isna(types.get(name)) else str(types.get(name)) for name in variables
+    ]
+    type_names, type_codes = np.unique(_str_array(type_per_var), return_inverse=True)
+
+    offsets = [0]
+    choice_values, choice_label_values = [], []
+    for name in variables:
+        choices = choice_labels.get(name, {})
+        choice_values.extend(choices.keys())
+        choice_label_values.extend(choices.values())
+        offsets.append(len(choice_values))
+
+    arrays = {
+        "variables": _str_array(variables),
+        "variable_labels": _str_array(variable_labels.values()),
+        "type_codes": type_codes.astype(np.int32),
+        "type_names": type_names,
+        "choice_offsets": np.asarray(offsets, dtype=np.int64),
+        "choice_values": _str_array(choice_values),
+        "choice_labels": _str_array(choice_label_values),
+    }
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "xls_form_id": xls_form_id,
+        "n_variables": len(variables),
+        "n_choices": len(choice_values),
+        "arrays": list(_ARRAYS),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".bundle-", dir=path.parent))
+    try:
+        for name, arr in arrays.items():
+            np.save(tmp_dir / f"{name}.npy", arr, allow_pickle=False)
+        with open(tmp_dir / _MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        if path.exists():
+            shutil.rmtree(path)
+        tmp_dir.replace(path)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return path
+
+
+class LabelBundle:
+    """Read-only view over a compiled label bundle.
+
+    Use :meth:`load` to open a bundle written by :func:`compile_label_bundle`. With
+    ``mmap=True`` (the default) the arrays are memory-mapped, so worker processes
+    share the pages instead of each rebuilding the labels from the XLSForm.
+
+    Examples:
+        >>> bundle = LabelBundle.load("labels/2075")
+        >>> bundle.variable_labels()["HHSize"]
+        'Household size'
+        >>> labelled = bundle.map_value_labels(survey_df)
+    """
+
+    def __init__(self, manifest: dict, arrays: Dict[str, np.ndarray]):
+        self.manifest = manifest
+        self.xls_form_id = manifest.get("xls_form_id")
+        self.variables = arrays["variables"]
+        self.labels = arrays["variable_labels"]
+        self.type_codes = arrays["type_codes"]
+        self.type_names = arrays["type_names"]
+        self.choice_offsets = arrays["choice_offsets"]
+        self.choice_values = arrays["choice_values"]
+        self.choice_labels_array = arrays["choice_labels"]
+        self._index = pd.Index(self.variables)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "LabelBundle":
+        """Open a bundle directory.
+
+        Args:
+            path (str | Path): Bundle directory
+            mmap (bool, optional): Memory-map the arrays. Defaults to True.
+
+        Returns:
+            LabelBundle: The opened bundle
+
+        Raises:
+            FileNotFoundError: If ``path`` is not a bundle directory
+            ValueError: If the bundle was written with an unsupported format version
+        """
+        path = Path(path)
+        manifest_path = path / _MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Label bundle not found at {path}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported label bundle version {manifest.get('format_version')}, "
+                f"expected {BUNDLE_FORMAT_VERSION}"
+            )
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+            for name in _ARRAYS
+        }
+        return cls(manifest, arrays)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def __repr__(self) -> str:
+        return (
+            f"LabelBundle(xls_form_id={self.xls_form_id!r}, "
+            f"variables={len(self.variables)}, choices={len(self.choice_values)})"
+        )
+
+    def _position(self, name: str) -> int:
+        pos = self._index.get_indexer([name])[0]
+        if pos < 0:
+            raise KeyError(name)
+        return pos
+
+    def variable_labels(self) -> Dict[str, str]:
+        """Return the variable-label map, as :func:`get_variable_labels` would."""
+        return dict(zip(self.variables.tolist(), self.labels.tolist()))
+
+    def question_types(self) -> Dict[str, str]:
+        """Return the question type (e.g. ``"select_one"``) of every variable."""
+        return dict(
+            zip(self.variables.tolist(), self.type_names[self.type_codes].tolist())
+        )
+
+    def choices(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the choice codes and labels of a variable as two arrays.
+
+        Raises:
+            KeyError: If ``name`` is not a variable of the form
+        """
+        pos = self._position(name)
+        start, stop = self.choice_offsets[pos], self.choice_offsets[pos + 1]
+        return self.choice_values[start:stop], self.choice_labels_array[start:stop]
+
+    def choice_labels(self) -> Dict[str, Dict[str, str]]:
+        """Return the choice-label map, as :func:`get_choice_labels` would."""
+        result = {}
+        offsets = self.choice_offsets
+        for pos, name in enumerate(self.variables.tolist()):
+            start, stop = offsets[pos], offsets[pos + 1]
+            if stop > start:
+                result[name] = dict(
+                    zip(
+                        self.choice_values[start:stop].tolist(),
+                        self.choice_labels_array[start:stop].tolist(),
+                    )
+                )
+        return result
+
+    def map_value_labels(self, survey_df: pd.DataFrame) -> pd.DataFrame:
+        """Replace choice codes in ``survey_df`` with their labels.
+
+        Codes are matched on their string form, so ``1`` and ``"1"`` both map to the
+        label of choice ``"1"``. Values without a matching choice are kept as is.
+
+        Args:
+            survey_df (pandas.DataFrame): Survey data with coded values
+
+        Returns:
+            pandas.DataFrame: A copy of ``survey_df`` with labelled columns
+        """
+        result = survey_df.copy()
+        positions = self._index.get_indexer(result.columns)
+        for col, pos in zip(result.columns, positions):
+            if pos < 0:
+                continue
+            start, stop = self.choice_offsets[pos], self.choice_offsets[pos + 1]
+            if stop == start:
+                continue
+            series = result[col]
+            codes = series.astype("string")
+            idx = pd.Index(self.choice_values[start:stop]).get_indexer(codes)
+            matched = idx >= 0
+            if not matched.any():
+                continue
+            labelled = series.astype(object).to_numpy(copy=True)
+            labelled[matched] = self.choice_labels_array[start:stop][idx[matched]]
+            result[col] = labelled
+        return result
@@ -0,0 +1,147 @@
+from typing import Dict, Hashable, Optional, Tuple, Union
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CachedForm:
+    """XLSForm definition held by :class:`XlsFormCache`.
+
+    The questionnaire and choice list derived from the definition are parsed
+    lazily and kept alongside it, so repeated calls reuse the parsed frames.
+
+    Args:
+        xlsform (pandas.DataFrame): Form definition as returned by
+            ``get_household_xlsform_definition``.
+    """
+
+    __slots__ = ("xlsform", "questionnaire", "choices")
+
+    def __init__(self, xlsform: pd.DataFrame):
+        self.xlsform = xlsform
+        self.questionnaire: Optional[pd.DataFrame] = None
+        self.choices: Optional[pd.DataFrame] = None
+
+
+class XlsFormCache:
+    """Bounded LRU cache of XLSForm definitions keyed by ``(xls_form_id, env)``.
+
+    Args:
+        maxsize (int, optional): Maximum number of forms kept in memory. The least
+            recently used form is evicted first. Defaults to 32.
+        cache_dir (str | Path, optional): Directory where form definitions are
+            persisted as JSON. Forms evicted from memory, or fetched by another
+            process, are reloaded from here instead of the API. Defaults to None
+            (memory only).
+
+    Examples:
+        >>> cache = XlsFormCache(maxsize=2)
+        >>> entry = cache.put(2067, "prod", xlsform_df)
+        >>> cache.get(2067, "prod") is entry
+        True
+        >>> cache.get(2067, "dev") is None
+        True
+    """
+
+    def __init__(self, maxsize: int = 32, cache_dir: Optional[Union[str, Path]] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries: "OrderedDict[Tuple[Hashable, str], CachedForm]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[Hashable, str]) -> bool:
+        return key in self._entries
+
+    def _path(self, xls_form_id: Hashable, env: str) -> Path:
+        return self.cache_dir / f"xlsform_{env}_{xls_form_id}.json"
+
+    def get(self, xls_form_id: Hashable, env: str) -> Optional[CachedForm]:
+        """Return the cached form, loading it from ``cache_dir`` if needed.
+
+        Args:
+            xls_form_id (int): ID of the questionnaire form
+            env (str): Environment the form was fetched from
+
+        Returns:
+            CachedForm | None: Cached entry, or None on a cache miss
+        """
+        key = (xls_form_id, env)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.cache_dir is None:
+            return None
+        path = self._path(xls_form_id, env)
+        if not path.exists():
+            return None
+
+        logger.debug("Loading XLSForm %s (%s) from %s", xls_form_id, env, path)
+        with open(path, "r", encoding="utf-8") as f:
+            xlsform = pd.DataFrame(json.load(f))
+        return self._insert(key, CachedForm(xlsform))
+
+    def put(self, xls_form_id: Hashable, env: str, xlsform: pd.DataFrame) -> CachedForm:
+        """Store a form definition, persisting it to ``cache_dir`` if configured.
+
+        Args:
+            xls_form_id (int): ID of the questionnaire form
+            env (str): Environment the form was fetched from
+            xlsform (pandas.DataFrame): Form definition
+
+        Returns:
+            CachedForm: The new cache entry
+        """
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(xls_form_id, env)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(xlsform.to_dict(orient="records"), f, default=str)
+            tmp_path.replace(path)
+
+        return self._insert((xls_form_id, env), CachedForm(xlsform))
+
+    def _insert(self, key: Tuple[Hashable, str], entry: CachedForm) -> CachedForm:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug("Evicted XLSForm %s from memory cache", evicted)
+        return entry
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop all cached forms.
+
+        Args:
+            disk (bool, optional): Also delete the persisted forms in
+                ``cache_dir``. Defaults to False.
+        """
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("xlsform_*.json"):
+                path.unlink()
+
+    def info(self) -> Dict[str, object]:
+        """Return the cache size and configuration."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+        }
@@ -0,0 +1,229 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import gzip
+import importlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_FORMAT_VERSION = 1
+SCRUBBED = "<scrubbed>"
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Module whose classes replayed responses may be built from
+MODEL_MODULE = "data_bridges_client.models"
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed call has no recorded response."""
+
+
+def _class_path(obj: Any) -> str:
+    cls = type(obj)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _load_class(path: str, modules: Sequence[str] = (MODEL_MODULE,)):
+    """Import a model class, only from ``modules`` or their submodules.
+
+    Cassettes are shared files, so the class they name is checked before anything
+    is imported.
+
+    Raises:
+        ValueError: If ``path`` is outside ``modules`` or not a class
+    """
+    module, _, name = path.rpartition(".")
+    if not any(module == m or module.startswith(f"{m}.") for m in modules):
+        raise ValueError(
+            f"Cassette names the class {path!r}, outside the allowed modules "
+            f"{list(modules)}"
+        )
+    cls = getattr(importlib.import_module(module), name, None)
+    if not isinstance(cls, type):
+        raise ValueError(f"Cassette names {path!r}, which is not a class")
+    return cls
+
+
+def _encode(response: Any) -> Dict[str, Any]:
+    """Encode a generated-client response as JSON data plus its model class."""
+    if isinstance(response, list):
+        items = [_encode(item) for item in response]
+        return {"kind": "list", "items": items}
+    if hasattr(response, "to_dict"):
+        return {
+            "kind": "model",
+            "class": _class_path(response),
+            "data": response.to_dict(),
+        }
+    return {"kind": "raw", "data": response}
+
+
+def _decode(payload: Dict[str, Any], modules: Sequence[str]) -> Any:
+    kind = payload["kind"]
+    if kind == "list":
+        return [_decode(item, modules) for item in payload["items"]]
+    if kind == "model":
+        return _load_class(payload["class"], modules).from_dict(payload["data"])
+    return payload["data"]
+
+
+class Cassette:
+    """Records API responses to a gzip-compressed file and replays them offline.
+
+    Attach a cassette to a client with ``DataBridgesKnots(..., cassette=...)``. In
+    ``"record"`` mode every successful call made through the client is appended to
+    the cassette with its arguments, latency and response (model JSON plus model
+    class). In ``"replay"`` mode calls are answered from the cassette without
+    network access, and no token is requested.
+
+    Credentials are never written: arguments equal to one of ``secrets`` (the
+    client adds its configured keys) are stored as ``"<scrubbed>"``, and the
+    access token is not part of the recorded calls.
+
+    Replayed responses are only built from classes of
+    ``data_bridges_client.models``, so a cassette from someone else cannot make
+    the client import other modules.
+
+    Calls are matched on endpoint and arguments. Identical calls recorded several
+    times are replayed in order, the last response being repeated.
+
+    Args:
+        path (str | Path): Cassette file, conventionally ``*.jsonl.gz``
+        mode (str, optional): ``"record"`` or ``"replay"``. Defaults to
+            ``"replay"``.
+        replay_latency (bool, optional): Sleep for the recorded latency when
+            replaying. Defaults to False (full speed).
+        secrets (Iterable[str], optional): Values to scrub from recorded
+            arguments.
+        model_modules (Iterable[str], optional): Further modules whose classes
+            responses may be replayed as, e.g. test doubles. Defaults to None.
+
+    Raises:
+        ValueError: If ``mode`` is invalid, or when replaying a response whose
+            class is outside the allowed modules
+        FileNotFoundError: If replaying a cassette that does not exist
+
+    Examples:
+        >>> cassette = Cassette("survey_3094.jsonl.gz", mode="record")
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml", cassette=cassette)
+        >>> df = client.get_household_survey(3094, "official")
+
+        >>> # Later, offline
+        >>> cassette = Cassette("survey_3094.jsonl.gz", mode="replay")
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml", cassette=cassette)
+        >>> df = client.get_household_survey(3094, "official")
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = REPLAY,
+        replay_latency: bool = False,
+        secrets: Optional[Iterable[str]] = None,
+        model_modules: Optional[Iterable[str]] = None,
+    ):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(
+                f"Invalid cassette mode {mode!r}, expected record or replay"
+            )
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._secrets = {s for s in (secrets or ()) if s}
+        self._model_modules = (MODEL_MODULE, *(model_modules or ()))
+        self._lock = threading.Lock()
+        # call key -> recorded (latency, encoded response), decoded on replay
+        self._recorded: Dict[str, List[Tuple[float, Any]]] = defaultdict(list)
+        self._played: Dict[str, int] = defaultdict(int)
+
+        if mode == REPLAY:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "wt", encoding="utf-8") as f:
+                f.write(json.dumps({"format_version": CASSETTE_FORMAT_VERSION}) + "\n")
+
+    def __repr__(self) -> str:
+        return f"Cassette(path='{self.path}', mode='{self.mode}')"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def add_secrets(self, *secrets: str) -> None:
+        """Add values to scrub from recorded arguments."""
+        self._secrets.update(s for s in secrets if s)
+
+    def _scrub(self, value: Any) -> Any:
+        if isinstance(value, str) and value in self._secrets:
+            return SCRUBBED
+        return value
+
+    def _key(self, endpoint: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> str:
+        call = {
+            "endpoint": endpoint,
+            "args": [self._scrub(a) for a in args],
+            "kwargs": {k: self._scrub(v) for k, v in kwargs.items()},
+        }
+        return json.dumps(call, sort_keys=True, default=str)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found at {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format_version") != CASSETTE_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported cassette version {header.get('format_version')}, "
+                    f"expected {CASSETTE_FORMAT_VERSION}"
+                )
+            for line in f:
+                key, latency, response = json.loads(line)
+                self._recorded[key].append((latency, response))
+        logger.debug("Loaded %d calls from cassette %s", len(self._recorded), self.path)
+
+    def record(
+        self,
+        endpoint: str,
+        args: Sequence[Any],
+        kwargs: Dict[str, Any],
+        response: Any,
+        latency: float,
+    ) -> None:
+        """Append a call and its response to the cassette."""
+        line = json.dumps(
+            [self._key(endpoint, args, kwargs), round(latency, 6), _encode(response)],
+            default=str,
+        )
+        with self._lock:
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def play(
+        self, endpoint: str, args: Sequence[Any], kwargs: Dict[str, Any]
+    ) -> Tuple[Any, float]:
+        """Return the recorded response of a call and its recorded latency.
+
+        Raises:
+            CassetteMissError: If the call was not recorded
+        """
+        key = self._key(endpoint, args, kwargs)
+        with self._lock:
+            entries = self._recorded.get(key)
+            if not entries:
+                raise CassetteMissError(
+                    f"No recorded response in {self.path} for {key}"
+                )
+            position = min(self._played[key], len(entries) - 1)
+            self._played[key] += 1
+        latency, response = entries[position]
+        if self.replay_latency:
+            time.sleep(latency)
+        return _decode(response, self._model_modules), latency
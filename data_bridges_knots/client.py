@@ -1,12 +1,21 @@
-from typing import Dict, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import data_bridges_client
-import yaml
+import numpy as np
+import pandas as pd
+from data_bridges_client.rest import ApiException
 from data_bridges_client.token import WfpApiToken
 
+from data_bridges_knots.cache import XlsFormCache
+from data_bridges_knots.cassette import Cassette
+from data_bridges_knots.currency import ExchangeRateIndex
 from data_bridges_knots.endpoints import (
     CommodityApi,
     CurrencyApi,
@@ -21,18 +30,35 @@ from data_bridges_knots.endpoints import (
     MfiSurveysApi,
     RpmeApi,
 )
-
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
+from data_bridges_knots.helpers import (
+    _import_polars,
+    _import_pyarrow,
+    compact_frame,
+    json_column_values,
+    json_columns,
+    json_columns_as_text,
+    records_to_arrow,
+    records_to_polars,
 )
+from data_bridges_knots.metrics import MetricsRegistry
+from data_bridges_knots.pagination import RateLimiter, page_count
+from data_bridges_knots.spatial import MarketIndex
+from data_bridges_knots.store import DatasetStore
+from data_bridges_knots.tracing import Tracer
+from data_bridges_knots.units import UnitConversionIndex
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying: rate limiting and transient gateway errors
+RETRY_STATUSES = (429, 502, 503, 504)
+# HTTP status of an expired access token, retried once with a new token
+UNAUTHORIZED_STATUS = 401
+
+# How endpoint frames represent missing values and types, see DataBridgesKnots
+OUTPUT_POLICIES = ("legacy_none", "pandas_nullable", "arrow")
+# Libraries endpoint frames can be returned in
+BACKENDS = ("pandas", "polars", "arrow")
+
 
 def config_from_env() -> Dict:
     """Construct DataBridges configuration dictionary from environment variables.
@@ -112,6 +138,67 @@ class DataBridgesKnots(
               WFP_API_CLIENT_SECRET, and optionally DATABRIDGES_API_KEY
         env (str, optional): Environment to use ('prod' or 'dev'). Defaults to "prod".
         api_version (str, optional): Data Bridges API version to use. Defaults to "v2" (current version)
+        xlsform_cache_size (int, optional): Maximum number of XLSForm definitions kept
+            in memory, keyed by form ID and environment. Defaults to 32.
+        xlsform_cache_dir (str, optional): Directory where fetched XLSForm definitions
+            are persisted and reused across sessions. Defaults to None (memory only).
+        max_retries (int, optional): Number of times a request is retried after a
+            429 or transient 5xx response. Defaults to 3.
+        retry_backoff (float, optional): Base delay in seconds between retries,
+            doubled on every attempt unless the response has a ``Retry-After``
+            header. Defaults to 1.0.
+        requests_per_second (float, optional): Rate limit shared by all requests of
+            the client, including concurrent page fetches. None disables it.
+            Defaults to 1.0.
+        max_workers (int, optional): Number of pages fetched concurrently by
+            ``all_pages=True`` calls. Defaults to 4.
+        host (str, optional): Gateway URL to use instead of the WFP API gateway,
+            e.g. a proxy or a local stub server. Defaults to None.
+        tracer (Tracer, optional): Tracer whose span hooks are called around each
+            stage of a call. Pass one to also trace the initial token request.
+            Defaults to a new tracer without hooks.
+        cassette (Cassette, optional): Record responses to, or replay them from, a
+            compressed cassette file. When replaying no token is requested and no
+            request is sent. Defaults to None.
+        output_policy (str, optional): Column types of endpoint frames:
+
+            - ``"legacy_none"``: pandas' inferred types, with missing values
+              replaced by None, which turns columns with gaps into objects;
+            - ``"pandas_nullable"``: nullable integers and booleans, datetime64
+              dates and categorical repeated strings, see
+              :func:`~data_bridges_knots.helpers.compact_frame`;
+            - ``"arrow"``: Arrow-backed columns (``pd.ArrowDtype``), built
+              directly from the records. Requires pyarrow.
+
+            Frames of raw survey data and XLSForms keep NaN in every policy.
+            Defaults to "legacy_none".
+        backend (str, optional): ``"pandas"``, ``"polars"`` to have endpoint
+            methods return ``polars.DataFrame`` objects, or ``"arrow"`` for
+            ``pyarrow.Table`` objects, e.g. to hand to R without a copy (see
+            :func:`~data_bridges_knots.ipc.write_ipc`). Both are built directly
+            from the response records, with native nulls; ``output_policy`` then
+            does not apply. XLSForm definitions, questionnaires and choice lists
+            stay pandas frames. Requires polars or pyarrow. Defaults to "pandas".
+        dataset_store (DatasetStore | str, optional): Store, or store directory,
+            where ``get_prices`` and ``get_household_survey`` results are kept
+            as Arrow IPC files and memory-mapped on later calls with the same
+            parameters, by this or any other process. See
+            :class:`~data_bridges_knots.store.DatasetStore`. Requires pyarrow.
+            Defaults to None.
+
+    Attributes:
+        metrics (MetricsRegistry): Per-endpoint request counts, retries, latency,
+            bytes received, rows parsed and conversion time. See
+            :class:`~data_bridges_knots.metrics.MetricsRegistry`.
+        tracer (Tracer): Span hooks around token, request, deserialization and
+            frame-building stages. See :class:`~data_bridges_knots.tracing.Tracer`.
+        market_indexes (dict): Spatial indexes built by ``get_market_index``,
+            keyed by country ISO3 code.
+        unit_conversion_indexes (dict): Unit conversion indexes built by
+            ``get_unit_conversion_index``, keyed by country ISO3 code.
+        exchange_rate_indexes (dict): Exchange-rate indexes built by
+            ``get_exchange_rate_index``, keyed by country ISO3 code.
+        dataset_store (DatasetStore | None): Store of downloaded results.
 
 
     Examples:
@@ -130,15 +217,96 @@ class DataBridgesKnots(
         >>> # Initialize from environment variables
         >>> from data_bridges_knots.client import config_from_env
         >>> client = DataBridgesKnots(config_from_env())
+
+        >>> # Inspect where time went
+        >>> client.metrics.as_dict()
+        >>> print(client.metrics.to_prometheus())
+
+        >>> # Find the slow stage of a call
+        >>> client.tracer.add_hook(on_span_end=print)
+
+        >>> # Typed columns with nullable missing values
+        >>> client = DataBridgesKnots(config, output_policy="pandas_nullable")
+
+        >>> # polars frames, never built through pandas
+        >>> client = DataBridgesKnots(config, backend="polars")
+
+        >>> # Arrow tables, written to a file R can memory-map
+        >>> client = DataBridgesKnots(config, backend="arrow")
+        >>> write_ipc(client.get_household_survey(3094, "official"), "survey.arrow")
+
+        >>> # Worker processes sharing downloaded results through the page cache
+        >>> client = DataBridgesKnots(config, dataset_store="/data/databridges")
     """
 
-    def __init__(self, config_path, env="prod", api_version="v2"):
+    def __init__(
+        self,
+        config_path,
+        env="prod",
+        api_version="v2",
+        xlsform_cache_size=32,
+        xlsform_cache_dir=None,
+        max_retries=3,
+        retry_backoff=1.0,
+        requests_per_second=1.0,
+        max_workers=4,
+        host=None,
+        tracer=None,
+        cassette=None,
+        output_policy="legacy_none",
+        backend="pandas",
+        dataset_store=None,
+    ):
+        if output_policy not in OUTPUT_POLICIES:
+            raise ValueError(
+                f"output_policy must be one of {OUTPUT_POLICIES}, got {output_policy!r}"
+            )
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if backend == "polars":
+            _import_polars()
+        if backend == "arrow" or dataset_store is not None:
+            _import_pyarrow()
+        self.output_policy = output_policy
+        self.backend = backend
         self.api_version = api_version
         self.env = env
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.max_workers = max_workers
+        self.host = host
+        self.metrics = MetricsRegistry()
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.cassette: Optional[Cassette] = cassette
         self.xlsform = None
+        self.xlsform_cache = XlsFormCache(
+            maxsize=xlsform_cache_size, cache_dir=xlsform_cache_dir
+        )
+        self.market_indexes: Dict[str, MarketIndex] = {}
+        self.unit_conversion_indexes: Dict[Optional[str], UnitConversionIndex] = {}
+        self.exchange_rate_indexes: Dict[str, ExchangeRateIndex] = {}
+        self.dataset_store: Optional[DatasetStore] = (
+            DatasetStore(dataset_store)
+            if isinstance(dataset_store, (str, Path))
+            else dataset_store
+        )
 
         self.config = self._load_config(config_path)
         self._validate_config(self.config)
+        if self.cassette is not None:
+            self.cassette.add_secrets(
+                *(
+                    str(self.config[key])
+                    for key in (
+                        "WFP_API_CLIENT_ID",
+                        "WFP_API_CLIENT_SECRET",
+                        "DATABRIDGES_API_KEY",
+                    )
+                    if self.config.get(key)
+                )
+            )
+        self._token_lock = threading.Lock()
         self.configuration = self._setup_configuration_and_authentication(self.config)
         self.data_bridges_api_key = self.config.get("DATABRIDGES_API_KEY", "")
 
@@ -171,6 +339,8 @@ class DataBridgesKnots(
 
         if isinstance(config, str):
             # Load from YAML file
+            import yaml
+
             with open(config, "r") as yamlfile:
                 return yaml.load(yamlfile, Loader=yaml.FullLoader)
         elif isinstance(config, dict):
@@ -210,19 +380,419 @@ class DataBridgesKnots(
         key = config["WFP_API_CLIENT_ID"]
         secret = config["WFP_API_CLIENT_SECRET"]
         BASE_URI = "https://gateway.api.wfp.org/vam-data-bridges"
-        host = f"{BASE_URI}/{self.api_version.strip('/')}"
+        host = self.host or f"{BASE_URI}/{self.api_version.strip('/')}"
         # print("host: ", host) #FIXME: this run every single page!
 
         logger.info("DataBridges API: %s", host)
 
+        if self.cassette is not None and self.cassette.replaying:
+            # Replayed calls never reach the gateway, so no token is needed
+            return data_bridges_client.Configuration(host=host)
+
         token = WfpApiToken(api_key=key, api_secret=secret)
+        with self.tracer.span("token"):
+            start = time.perf_counter()
+            access_token = token.refresh()
+            self.metrics.record_token_refresh(time.perf_counter() - start)
         configuration = data_bridges_client.Configuration(
-            host=host, access_token=token.refresh()
+            host=host, access_token=access_token
         )
 
         logger.debug("Token used: %s", token.__repr__())
         return configuration
 
+    def _call_api(self, api_call: Callable, *args, **kwargs) -> Any:
+        """Calls a generated client method, retrying, logging and timing it.
+
+        Every endpoint method goes through here. Responses with a status in
+        ``RETRY_STATUSES`` are retried up to ``max_retries`` times. Each attempt is
+        recorded in :attr:`metrics` and each completed request is logged once with
+        the structured fields ``endpoint``, ``page``, ``latency`` (seconds) and
+        ``rows``.
+
+        When the generated API class has a ``<method>_with_http_info`` variant it is
+        called instead, so the size of the raw response body can be recorded.
+
+        Each attempt runs in an ``"http_request"`` span of :attr:`tracer`, with a
+        nested ``"deserialize"`` span when hooks are registered.
+
+        With a recording :attr:`cassette` successful responses are also written to
+        it; with a replaying one the response is read from it and nothing is sent.
+
+        Args:
+            api_call (Callable): Bound method of a ``data_bridges_client`` API class
+            *args: Positional arguments for ``api_call``
+            **kwargs: Keyword arguments for ``api_call``
+
+        Returns:
+            The response of ``api_call``
+
+        Raises:
+            ApiException: If the request fails, or still fails after all retries
+            CassetteMissError: If replaying and the call was not recorded
+        """
+        endpoint = getattr(api_call, "__name__", repr(api_call))
+        if self.cassette is not None and self.cassette.replaying:
+            with self.tracer.span("http_request", endpoint=endpoint, replay=True):
+                response, latency = self.cassette.play(endpoint, args, kwargs)
+            bytes_received = None
+        else:
+            response, latency, bytes_received = self._send(
+                endpoint, api_call, args, kwargs
+            )
+            if self.cassette is not None:
+                self.cassette.record(endpoint, args, kwargs, response, latency)
+
+        self.metrics.record_request(endpoint, latency, bytes_received=bytes_received)
+        items = getattr(response, "items", response)
+        logger.info(
+            "Request completed",
+            extra={
+                "endpoint": endpoint,
+                "page": kwargs.get("page"),
+                "latency": round(latency, 3),
+                "rows": len(items) if isinstance(items, list) else None,
+            },
+        )
+        return response
+
+    def _fetch_pages(
+        self,
+        api_call: Callable,
+        *args,
+        page: Optional[int] = 1,
+        all_pages: bool = False,
+        **kwargs,
+    ) -> List[Any]:
+        """Returns the items of one page, or of all pages, of a paged endpoint.
+
+        With ``all_pages=True`` the first page is fetched, then the number of pages
+        is derived from its ``total_items`` and the remaining pages are fetched
+        concurrently by up to ``max_workers`` threads, under the client's shared
+        rate limit. Items are returned in page order. If the response has no
+        ``total_items``, pages are fetched one by one until a short page.
+
+        Args:
+            api_call (Callable): Bound method of a ``data_bridges_client`` API class
+            *args: Positional arguments for ``api_call``
+            page (int, optional): Page to fetch when ``all_pages`` is False.
+                Defaults to 1.
+            all_pages (bool, optional): Fetch every page. Defaults to False.
+            **kwargs: Keyword arguments for ``api_call``
+
+        Returns:
+            list: Response items
+        """
+        first = self._call_api(api_call, *args, page=1 if all_pages else page, **kwargs)
+        if not hasattr(first, "items"):
+            # Single-object response
+            return [first]
+        items = list(first.items or [])
+        if not all_pages or not items:
+            return items
+
+        total_items = getattr(first, "total_items", None)
+        if total_items is None:
+            page, page_length = 1, len(items)
+            while True:
+                page += 1
+                response = self._call_api(api_call, *args, page=page, **kwargs)
+                items.extend(response.items or [])
+                if len(response.items or []) < page_length:
+                    return items
+
+        n_pages = page_count(total_items, len(items))
+        if n_pages > 1:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self.max_workers, n_pages - 1))
+            ) as pool:
+                responses = pool.map(
+                    lambda p: self._call_api(api_call, *args, page=p, **kwargs),
+                    range(2, n_pages + 1),
+                )
+                for response in responses:
+                    items.extend(response.items or [])
+        return items
+
+    def _send(
+        self, endpoint: str, api_call: Callable, args: tuple, kwargs: dict
+    ) -> Tuple[Any, float, Optional[int]]:
+        """Sends a request, retrying it on ``RETRY_STATUSES``.
+
+        A 401 response is retried once with a new access token, so that long
+        ``all_pages`` fetches outlive the token they started with.
+
+        Returns:
+            tuple: The response, its latency in seconds and the response size in
+            bytes (None if unknown)
+        """
+        api_call_with_info = getattr(
+            getattr(api_call, "__self__", None), f"{endpoint}_with_http_info", None
+        )
+
+        if self.tracer.enabled:
+            self._trace_deserialization(api_call)
+
+        attempt = 0
+        reauthenticated = False
+        while True:
+            self.rate_limiter.acquire()
+            access_token = self.configuration.access_token
+            start = time.perf_counter()
+            try:
+                with self.tracer.span(
+                    "http_request",
+                    endpoint=endpoint,
+                    page=kwargs.get("page"),
+                    attempt=attempt,
+                ) as span:
+                    if api_call_with_info is not None:
+                        http_response = api_call_with_info(*args, **kwargs)
+                        response = http_response.data
+                        raw_data = getattr(http_response, "raw_data", None)
+                        bytes_received = len(raw_data) if raw_data is not None else None
+                    else:
+                        response = api_call(*args, **kwargs)
+                        bytes_received = None
+                    span.set_attribute("bytes", bytes_received)
+            except ApiException as e:
+                latency = time.perf_counter() - start
+                self.metrics.record_request(endpoint, latency, error=True)
+                if e.status == UNAUTHORIZED_STATUS and not reauthenticated:
+                    reauthenticated = True
+                    logger.warning("Access token rejected by %s, renewing it", endpoint)
+                    self._refresh_access_token(api_call, access_token)
+                    continue
+                if e.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.metrics.record_retry(endpoint)
+                delay = self._retry_delay(e, attempt)
+                logger.warning(
+                    "Retrying %s after HTTP %s (attempt %d of %d, waiting %.1fs)",
+                    endpoint,
+                    e.status,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            return response, time.perf_counter() - start, bytes_received
+
+    def _refresh_access_token(self, api_call: Callable, rejected_token: str) -> None:
+        """Requests a new access token, unless another thread already has.
+
+        The token is updated in place on :attr:`configuration`, and on the
+        configuration of the API client ``api_call`` is bound to, so requests
+        already being paged pick it up.
+        """
+        with self._token_lock:
+            if self.configuration.access_token == rejected_token:
+                configuration = self._setup_configuration_and_authentication(
+                    self.config
+                )
+                self.configuration.access_token = configuration.access_token
+        api_client = getattr(getattr(api_call, "__self__", None), "api_client", None)
+        if api_client is not None:
+            api_client.configuration.access_token = self.configuration.access_token
+
+    def _trace_deserialization(self, api_call: Callable) -> None:
+        """Wraps the API client's ``response_deserialize`` in a ``"deserialize"`` span.
+
+        Only the ``ApiClient`` of this call is patched, and only once.
+        """
+        api_client = getattr(getattr(api_call, "__self__", None), "api_client", None)
+        deserialize = getattr(api_client, "response_deserialize", None)
+        if deserialize is None or getattr(deserialize, "traced", False):
+            return
+
+        def traced_deserialize(*args, **kwargs):
+            parent = self.tracer.current_span()
+            endpoint = parent.attributes.get("endpoint") if parent else None
+            with self.tracer.span("deserialize", endpoint=endpoint):
+                return deserialize(*args, **kwargs)
+
+        traced_deserialize.traced = True
+        api_client.response_deserialize = traced_deserialize
+
+    def _retry_delay(self, error: ApiException, attempt: int) -> float:
+        """Seconds to wait before retry ``attempt``, honouring ``Retry-After``."""
+        retry_after = (getattr(error, "headers", None) or {}).get("Retry-After")
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            return self.retry_backoff * 2 ** (attempt - 1)
+
+    def _to_frame(
+        self,
+        endpoint: str,
+        items: Iterable[Any],
+        replace_nan: bool = True,
+        compact: bool = False,
+        backend: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Converts API response items to a DataFrame, recording the conversion time.
+
+        Returns a polars frame or an Arrow table with the ``"polars"`` or
+        ``"arrow"`` :attr:`backend`; otherwise columns are typed according to
+        :attr:`output_policy`. The ``"to_dict"``,
+        ``"dataframe"`` and ``"postprocess"`` stages each run in a span of
+        :attr:`tracer`.
+
+        Args:
+            endpoint (str): Name of the generated client method the items came from,
+                used as the metrics label
+            items (Iterable): Response models (converted with ``to_dict()``) or dicts
+            replace_nan (bool, optional): Apply the output policy. False keeps
+                pandas' inferred types and NaN, for raw survey data. Defaults to
+                True.
+            compact (bool, optional): Use the ``"pandas_nullable"`` policy for this
+                call. Defaults to False.
+            backend (str, optional): Backend for this call instead of
+                :attr:`backend`. Defaults to None.
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: One row per item
+        """
+        start = time.perf_counter()
+        records = self._records(endpoint, items)
+
+        backend = backend or self.backend
+        policy = "pandas_nullable" if compact else self.output_policy
+        with self.tracer.span("dataframe", endpoint=endpoint):
+            if backend == "polars":
+                # Nulls are native, no output policy needed
+                policy = None
+                df = records_to_polars(records)
+            elif backend == "arrow":
+                policy = None
+                df = records_to_arrow(records)
+            elif replace_nan and policy == "arrow":
+                df = records_to_arrow(records).to_pandas(types_mapper=pd.ArrowDtype)
+            elif replace_nan and policy == "pandas_nullable":
+                # Object columns keep integer IDs with gaps from turning into floats
+                df = pd.DataFrame(records, dtype=object)
+            else:
+                df = pd.DataFrame(records)
+        df = self._postprocess(endpoint, df, policy if replace_nan else None)
+        self.metrics.record_conversion(endpoint, time.perf_counter() - start, len(df))
+        return df
+
+    def _records(self, endpoint: str, items: Iterable[Any]) -> List[dict]:
+        with self.tracer.span("to_dict", endpoint=endpoint) as span:
+            records = [
+                item.to_dict() if hasattr(item, "to_dict") else item for item in items
+            ]
+            span.set_attribute("rows", len(records))
+        return records
+
+    def _postprocess(self, endpoint: str, df: pd.DataFrame, policy: Optional[str]):
+        if policy == "pandas_nullable":
+            with self.tracer.span("postprocess", endpoint=endpoint):
+                df = compact_frame(df)
+        elif policy == "legacy_none":
+            with self.tracer.span("postprocess", endpoint=endpoint):
+                df = df.replace({np.nan: None})
+        return df
+
+    def _table_to_frame(
+        self,
+        endpoint: str,
+        table,
+        replace_nan: bool = True,
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """Converts a stored Arrow table to a frame like :meth:`_to_frame` would.
+
+        The ``"arrow"`` backend returns the table itself, and the ``"polars"``
+        backend and ``"arrow"`` output policy reuse its buffers, so a
+        memory-mapped table is not copied. Columns of mixed values, stored as
+        JSON, become the strings Arrow-built frames hold, or the original values
+        in pandas frames that :meth:`_to_frame` builds from the records.
+        """
+        start = time.perf_counter()
+        policy = "pandas_nullable" if compact else self.output_policy
+        encoded = json_columns(table)
+        as_text = self.backend != "pandas" or (replace_nan and policy == "arrow")
+        if encoded and as_text:
+            table = json_columns_as_text(table)
+        with self.tracer.span("dataframe", endpoint=endpoint):
+            if self.backend == "arrow":
+                policy = None
+                df = table
+            elif self.backend == "polars":
+                policy = None
+                df = _import_polars().from_arrow(table)
+            elif replace_nan and policy == "arrow":
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            elif replace_nan and policy == "pandas_nullable":
+                # Integers and booleans with gaps stay integers and booleans
+                df = table.to_pandas(types_mapper=_nullable_dtype)
+            else:
+                df = table.to_pandas()
+            if encoded and not as_text:
+                for name in encoded:
+                    df[name] = pd.Series(
+                        json_column_values(table, name), index=df.index, dtype=object
+                    )
+        df = self._postprocess(endpoint, df, policy if replace_nan else None)
+        self.metrics.record_conversion(endpoint, time.perf_counter() - start, len(df))
+        return df
+
+    def _stored_frame(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], List[Any]],
+        replace_nan: bool = True,
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """Returns the frame of a call, read from :attr:`dataset_store` if stored.
+
+        Without a store this is ``_to_frame(endpoint, fetch(), ...)``. With one,
+        the items returned by ``fetch`` are stored as an Arrow table first, with
+        columns of mixed values as JSON, and the frame is built from the
+        memory-mapped file by :meth:`_table_to_frame`.
+
+        Args:
+            endpoint (str): Name of the generated client method
+            params (dict): Parameters identifying the result. The client's
+                ``env`` and ``api_version`` are added.
+            fetch (Callable): Returns the response items, called on a store miss
+            replace_nan (bool, optional): See :meth:`_to_frame`. Defaults to True.
+            compact (bool, optional): See :meth:`_to_frame`. Defaults to False.
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: One row per item
+        """
+        if self.dataset_store is None:
+            return self._to_frame(
+                endpoint, fetch(), replace_nan=replace_nan, compact=compact
+            )
+        params = {**params, "env": self.env, "api_version": self.api_version}
+        table = self.dataset_store.get(endpoint, params)
+        if table is None:
+            records = self._records(endpoint, fetch())
+            with self.tracer.span("dataframe", endpoint=endpoint):
+                table = records_to_arrow(records, mixed="json")
+            table = self.dataset_store.put(endpoint, params, table)
+        return self._table_to_frame(
+            endpoint, table, replace_nan=replace_nan, compact=compact
+        )
+
+
+def _nullable_dtype(arrow_type) -> Optional[Any]:
+    """Nullable pandas dtype of an Arrow integer or boolean type, else None."""
+    pa = _import_pyarrow()
+    if pa.types.is_boolean(arrow_type):
+        return pd.BooleanDtype()
+    if pa.types.is_integer(arrow_type):
+        # e.g. int64 -> Int64, uint8 -> UInt8
+        name = str(arrow_type).replace("u", "U").replace("int", "Int")
+        return pd.api.types.pandas_dtype(name)
+    return None
+
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,197 @@
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Registry field -> key in country_list.json
+COUNTRY_FIELDS: Dict[str, str] = {
+    "iso3": "iso3Alpha3",
+    "iso2": "iso3Alpha2",
+    "numeric": "iso3Numeric",
+    "name": "name",
+    "adm0": "adm0Code",
+}
+_INTEGER_FIELDS = ("numeric", "adm0")
+
+
+def _normalize(field: str, value: Any) -> Any:
+    if field == "name":
+        return value.casefold() if isinstance(value, str) else value
+    if field in _INTEGER_FIELDS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    return value.upper() if isinstance(value, str) else value
+
+
+class CountryRegistry:
+    """Immutable, indexed registry of country codes.
+
+    Every field (``"iso3"``, ``"iso2"``, ``"numeric"``, ``"name"`` and ``"adm0"``) is
+    indexed, so single lookups are O(1) in any direction and whole Series are
+    converted in one vectorized pass. ISO codes are matched case-insensitively and
+    names ignoring case.
+
+    Use :func:`get_country_registry` to get the shared instance built from
+    ``country_list.json``.
+
+    Args:
+        records (Iterable[Mapping]): Country records with the keys listed in
+            ``COUNTRY_FIELDS``.
+
+    Examples:
+        >>> registry = get_country_registry()
+        >>> registry.get("ETH", "iso3", "adm0")
+        79
+        >>> registry.get(79, "adm0", "iso2")
+        'ET'
+        >>> registry.convert(prices["adm0Code"], "adm0", "iso3")
+    """
+
+    __slots__ = ("_columns", "_lookup", "_indexes", "_positions")
+
+    def __init__(self, records: Iterable[Mapping[str, Any]]):
+        records = list(records)
+        columns, lookup, indexes, positions = {}, {}, {}, {}
+        for field, key in COUNTRY_FIELDS.items():
+            values = [record.get(key) for record in records]
+            is_integer = field in _INTEGER_FIELDS
+            columns[field] = pd.array(values, dtype="Int64" if is_integer else "string")
+
+            # normalized code -> row, skipping countries without this code
+            rows = {
+                _normalize(field, value): row
+                for row, value in enumerate(values)
+                if value is not None
+            }
+            lookup[field] = rows
+            indexes[field] = pd.Index(
+                list(rows), dtype="int64" if is_integer else object
+            )
+            positions[field] = np.fromiter(
+                rows.values(), dtype=np.intp, count=len(rows)
+            )
+
+        object.__setattr__(self, "_columns", columns)
+        object.__setattr__(self, "_lookup", lookup)
+        object.__setattr__(self, "_indexes", indexes)
+        object.__setattr__(self, "_positions", positions)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CountryRegistry is immutable")
+
+    def __len__(self) -> int:
+        return len(self._columns["iso3"])
+
+    def __repr__(self) -> str:
+        return f"CountryRegistry(countries={len(self)})"
+
+    @staticmethod
+    def _check_fields(*fields: str) -> None:
+        for field in fields:
+            if field not in COUNTRY_FIELDS:
+                raise ValueError(
+                    f"Unknown country field {field!r}, "
+                    f"expected one of {', '.join(COUNTRY_FIELDS)}"
+                )
+
+    def get(self, value: Hashable, from_: str = "iso3", to: str = "adm0") -> Any:
+        """Convert a single code.
+
+        Args:
+            value: Code to look up, e.g. ``"ETH"`` or ``79``
+            from_ (str, optional): Field of ``value``. Defaults to ``"iso3"``.
+            to (str, optional): Field to return. Defaults to ``"adm0"``.
+
+        Returns:
+            str | int | None: The matching code, or None if not found
+
+        Raises:
+            ValueError: If ``from_`` or ``to`` is not a registry field
+        """
+        self._check_fields(from_, to)
+        pos = self._lookup[from_].get(_normalize(from_, value))
+        if pos is None:
+            return None
+        result = self._columns[to][pos]
+        if pd.isna(result):
+            return None
+        # Plain Python scalars, as the generated client's StrictInt params reject
+        # NumPy integers
+        return result.item() if isinstance(result, np.generic) else result
+
+    def convert(
+        self, values: pd.Series, from_: str = "adm0", to: str = "iso3"
+    ) -> pd.Series:
+        """Convert a whole Series of codes in one vectorized pass.
+
+        Unknown or missing codes become ``<NA>``. Integer targets are returned as
+        ``Int64`` and text targets as ``string``.
+
+        Args:
+            values (pandas.Series): Codes to convert
+            from_ (str, optional): Field of ``values``. Defaults to ``"adm0"``.
+            to (str, optional): Field to return. Defaults to ``"iso3"``.
+
+        Returns:
+            pandas.Series: Converted codes, aligned with ``values``
+
+        Raises:
+            ValueError: If ``from_`` or ``to`` is not a registry field
+        """
+        self._check_fields(from_, to)
+        if not isinstance(values, pd.Series):
+            values = pd.Series(values)
+
+        if from_ in _INTEGER_FIELDS:
+            keys = pd.to_numeric(values, errors="coerce")
+        elif from_ == "name":
+            keys = values.astype("string").str.casefold()
+        else:
+            keys = values.astype("string").str.upper()
+
+        hits = self._indexes[from_].get_indexer(keys)
+        positions = np.where(hits >= 0, self._positions[from_][hits], -1)
+        result = self._columns[to].take(positions, allow_fill=True)
+        return pd.Series(result, index=values.index, name=values.name)
+
+    def mapping(self, from_: str = "iso3", to: str = "adm0") -> Dict[Any, Any]:
+        """Return a plain ``{from_: to}`` dict, skipping countries without either."""
+        self._check_fields(from_, to)
+        source, target = self._columns[from_], self._columns[to]
+        return {
+            s: t
+            for s, t in zip(source.tolist(), target.tolist())
+            if not pd.isna(s) and not pd.isna(t)
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the registry as a DataFrame with one column per field."""
+        return pd.DataFrame({field: column for field, column in self._columns.items()})
+
+
+@lru_cache(maxsize=None)
+def get_country_registry(path: Optional[str] = None) -> CountryRegistry:
+    """Return the country registry, built once from ``country_list.json``.
+
+    Args:
+        path (str, optional): Alternative country list file. Defaults to the list
+            shipped with the package.
+
+    Returns:
+        CountryRegistry: Shared registry instance
+
+    Raises:
+        FileNotFoundError: If the country list file does not exist
+    """
+    json_path = Path(path) if path else Path(__file__).parent / "country_list.json"
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            return CountryRegistry(json.load(f))
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Country list file not found at {json_path}") from e
@@ -0,0 +1,339 @@
+from typing import Dict, Optional, Sequence
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+MARKET_COLUMNS = ("marketID",)
+SERIES_COLUMNS = ("commodityID", "commodityUnitID", "priceTypeID", "currencyID")
+# Descriptive columns kept in the label tables when present
+MARKET_LABELS = ("marketName", "adm1Code", "adm1Name", "adm2Code", "adm2Name")
+SERIES_LABELS = (
+    "commodityName",
+    "commodityUnitName",
+    "priceTypeName",
+    "currencyName",
+)
+
+AXES = ("market", "series", "month")
+
+_REDUCERS = {
+    "mean": np.nanmean,
+    "median": np.nanmedian,
+    "min": np.nanmin,
+    "max": np.nanmax,
+    "std": np.nanstd,
+    "sum": np.nansum,
+}
+
+
+def _encode(df: pd.DataFrame, keys: Sequence[str], labels: Sequence[str]):
+    """Integer-encode the ``keys`` of every row, with one label row per code."""
+    columns = list(keys) + [c for c in labels if c in df]
+    if not len(df):
+        return np.zeros(0, dtype=np.intp), df[columns].reset_index(drop=True)
+    # Combine per-column codes into one integer per key, sorted like the keys
+    factorized = [pd.factorize(df[key], sort=True) for key in keys]
+    combined = np.ravel_multi_index(
+        [codes for codes, _ in factorized], [len(uniques) for _, uniques in factorized]
+    )
+    _, first, codes = np.unique(combined, return_index=True, return_inverse=True)
+    return codes.ravel(), df[columns].iloc[first].reset_index(drop=True)
+
+
+def _month_numbers(dates) -> np.ndarray:
+    dates = pd.to_datetime(dates, errors="coerce")
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy("float64")
+
+
+def _key_index(table: pd.DataFrame, keys: Sequence[str]) -> pd.Index:
+    if len(keys) == 1:
+        return pd.Index(table[keys[0]])
+    return pd.MultiIndex.from_frame(table[list(keys)])
+
+
+class PriceCube:
+    """Dense market x series x month price array with dictionary-encoded labels.
+
+    A *series* is a commodity in a unit, price type and currency
+    (``SERIES_COLUMNS``). Prices are held in a float array of shape
+    ``(markets, series, months)``, NaN where nothing was reported; several prices
+    in one month are averaged. The ``markets`` and ``series`` tables map array
+    positions to IDs and names, and ``months`` to monthly periods, so selection,
+    rolling windows and aggregation are plain array operations.
+
+    Build cubes with :meth:`from_prices`.
+
+    Attributes:
+        values (numpy.ndarray): Prices, shape ``(markets, series, months)``
+        markets (pandas.DataFrame): Label row of every market position
+        series (pandas.DataFrame): Label row of every series position
+        months (pandas.PeriodIndex): Month of every time position
+        market_keys (list): Columns of ``markets`` identifying a market
+        series_keys (list): Columns of ``series`` identifying a series
+
+    Examples:
+        >>> prices = client.get_prices("KEN", "2020-01-01")
+        >>> cube = PriceCube.from_prices(prices)
+        >>> cube.values.shape
+        (212, 96, 72)
+        >>> maize = cube.sel(commodities=[51], start="2023-01")
+        >>> national = maize.aggregate("market", "median")
+        >>> smoothed = cube.rolling_mean(3)
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        markets: pd.DataFrame,
+        series: pd.DataFrame,
+        months: pd.PeriodIndex,
+        market_keys: Optional[Sequence[str]] = None,
+        series_keys: Optional[Sequence[str]] = None,
+    ):
+        if values.shape != (len(markets), len(series), len(months)):
+            raise ValueError(
+                f"values of shape {values.shape} do not match "
+                f"{len(markets)} markets, {len(series)} series and {len(months)} months"
+            )
+        self.values = values
+        self.markets = markets
+        self.series = series
+        self.months = months
+        self.market_keys = list(market_keys or markets.columns[:1])
+        self.series_keys = list(series_keys or series.columns[:1])
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: pd.DataFrame,
+        market_columns: Sequence[str] = MARKET_COLUMNS,
+        series_columns: Sequence[str] = SERIES_COLUMNS,
+        date_column: str = "commodityPriceDate",
+        price_column: str = "commodityPrice",
+        dtype=np.float64,
+    ) -> "PriceCube":
+        """Build a cube from long price rows, e.g. from ``get_prices``.
+
+        Rows missing a key, date or price are skipped. Months without prices
+        between the first and last month are kept, as NaN.
+
+        Args:
+            prices (pandas.DataFrame): Long price rows
+            market_columns (Sequence[str], optional): Columns identifying a
+                market. Defaults to ``("marketID",)``.
+            series_columns (Sequence[str], optional): Columns identifying a price
+                series. Defaults to ``SERIES_COLUMNS``.
+            date_column (str, optional): Price date column. Defaults to
+                "commodityPriceDate".
+            price_column (str, optional): Price column. Defaults to
+                "commodityPrice".
+            dtype (numpy.dtype, optional): Value type, e.g. ``np.float32`` to halve
+                memory. Defaults to ``np.float64``.
+
+        Returns:
+            PriceCube: The cube
+        """
+        price = pd.to_numeric(prices[price_column], errors="coerce").to_numpy(float)
+        month = _month_numbers(prices[date_column])
+        keys = list(market_columns) + list(series_columns)
+        usable = (
+            ~np.isnan(price)
+            & ~np.isnan(month)
+            & prices[keys].notna().all(axis=1).to_numpy()
+        )
+        prices = prices[usable]
+        price, month = price[usable], month[usable]
+
+        market_codes, markets = _encode(prices, market_columns, MARKET_LABELS)
+        series_codes, series = _encode(prices, series_columns, SERIES_LABELS)
+        first = int(month.min()) if len(month) else 0
+        n_months = int(month.max()) - first + 1 if len(month) else 0
+        month_codes = month.astype(np.int64) - first
+        months = pd.period_range(
+            pd.Period(year=first // 12, month=first % 12 + 1, freq="M"),
+            periods=n_months,
+            freq="M",
+        )
+
+        shape = (len(markets), len(series), n_months)
+        cells = np.ravel_multi_index((market_codes, series_codes, month_codes), shape)
+        size = int(np.prod(shape))
+        sums = np.bincount(cells, weights=price, minlength=size)
+        counts = np.bincount(cells, minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.where(counts > 0, sums / counts, np.nan)
+        return cls(
+            values.astype(dtype).reshape(shape),
+            markets,
+            series,
+            months,
+            market_keys=market_columns,
+            series_keys=series_columns,
+        )
+
+    def __repr__(self) -> str:
+        months = (
+            f"{self.months[0]}..{self.months[-1]}" if len(self.months) else "no months"
+        )
+        return (
+            f"PriceCube(markets={len(self.markets)}, series={len(self.series)}, "
+            f"months={len(self.months)} [{months}], "
+            f"filled={self.fill_ratio:.1%})"
+        )
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def fill_ratio(self) -> float:
+        """Share of cells holding a price."""
+        if not self.values.size:
+            return 0.0
+        return float(np.count_nonzero(~np.isnan(self.values)) / self.values.size)
+
+    def _replace(self, values: np.ndarray, **labels) -> "PriceCube":
+        return PriceCube(
+            values,
+            labels.get("markets", self.markets),
+            labels.get("series", self.series),
+            labels.get("months", self.months),
+            market_keys=self.market_keys,
+            series_keys=self.series_keys,
+        )
+
+    def sel(
+        self,
+        markets: Optional[Sequence] = None,
+        commodities: Optional[Sequence] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> "PriceCube":
+        """Select markets, commodities and a month range.
+
+        Args:
+            markets (Sequence, optional): Values of the first market column, e.g.
+                market IDs. Defaults to all markets.
+            commodities (Sequence, optional): Values of the first series column,
+                e.g. commodity IDs. Defaults to all series.
+            start (str, optional): First month, e.g. "2023-01". Defaults to the
+                first month of the cube.
+            end (str, optional): Last month, included. Defaults to the last month.
+
+        Returns:
+            PriceCube: A cube over the selection, sharing no memory with this one
+        """
+        market_rows = slice(None)
+        series_rows = slice(None)
+        if markets is not None:
+            market_rows = np.flatnonzero(self.markets.iloc[:, 0].isin(markets))
+        if commodities is not None:
+            series_rows = np.flatnonzero(self.series.iloc[:, 0].isin(commodities))
+        month_mask = np.ones(len(self.months), dtype=bool)
+        if start is not None:
+            month_mask &= self.months >= pd.Period(start, freq="M")
+        if end is not None:
+            month_mask &= self.months <= pd.Period(end, freq="M")
+        month_rows = np.flatnonzero(month_mask)
+
+        values = self.values[market_rows][:, series_rows][:, :, month_rows]
+        return self._replace(
+            np.array(values),
+            markets=self.markets.iloc[market_rows].reset_index(drop=True),
+            series=self.series.iloc[series_rows].reset_index(drop=True),
+            months=self.months[month_rows],
+        )
+
+    def rolling_mean(
+        self, window: int, min_periods: Optional[int] = None
+    ) -> "PriceCube":
+        """Trailing mean over ``window`` months, ignoring missing months.
+
+        Args:
+            window (int): Window length in months
+            min_periods (int, optional): Minimum number of prices in the window.
+                Defaults to ``window``.
+
+        Returns:
+            PriceCube: Cube of rolling means
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        min_periods = window if min_periods is None else min_periods
+        present = ~np.isnan(self.values)
+        sums = np.cumsum(np.where(present, self.values, 0.0), axis=2)
+        counts = np.cumsum(present, axis=2)
+        sums[:, :, window:] = sums[:, :, window:] - sums[:, :, :-window]
+        counts[:, :, window:] = counts[:, :, window:] - counts[:, :, :-window]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts >= max(min_periods, 1), sums / counts, np.nan)
+        return self._replace(means.astype(self.values.dtype))
+
+    def pct_change(self, periods: int = 1) -> "PriceCube":
+        """Relative change over ``periods`` months, e.g. 1 (month on month) or 12.
+
+        Returns:
+            PriceCube: Cube of changes, NaN where either price is missing
+        """
+        if periods < 1:
+            raise ValueError("periods must be at least 1")
+        changes = np.full_like(self.values, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            changes[:, :, periods:] = (
+                self.values[:, :, periods:] / self.values[:, :, :-periods] - 1
+            )
+        return self._replace(changes)
+
+    def aggregate(self, over: str, how: str = "mean") -> pd.DataFrame:
+        """Reduce one axis, ignoring missing prices.
+
+        Args:
+            over (str): Axis to reduce: "market", "series" or "month"
+            how (str, optional): "mean", "median", "min", "max", "std", "sum" or
+                "count". Defaults to "mean".
+
+        Returns:
+            pandas.DataFrame: The two remaining axes, rows first. Reducing markets
+            gives series x months, series gives markets x months, and months gives
+            markets x series. Rows and columns are labelled with the key columns
+            (a MultiIndex for several) or the month.
+        """
+        if over not in AXES:
+            raise ValueError(f"over must be one of {AXES}, got {over!r}")
+        if how != "count" and how not in _REDUCERS:
+            raise ValueError(f"Unknown aggregation {how!r}")
+        axis = AXES.index(over)
+        if how == "count":
+            result = np.count_nonzero(~np.isnan(self.values), axis=axis)
+        else:
+            with warnings.catch_warnings():
+                # All-NaN slices are expected and give NaN
+                warnings.simplefilter("ignore", RuntimeWarning)
+                result = _REDUCERS[how](self.values, axis=axis)
+            if how == "sum":
+                filled = ~np.isnan(self.values).all(axis=axis)
+                result = np.where(filled, result, np.nan)
+
+        labels: Dict[str, pd.Index] = {
+            "market": _key_index(self.markets, self.market_keys),
+            "series": _key_index(self.series, self.series_keys),
+            "month": self.months,
+        }
+        rows, columns = (labels[a] for a in AXES if a != over)
+        return pd.DataFrame(result, index=rows, columns=columns)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the filled cells as long rows with the label columns and month."""
+        market, series, month = np.nonzero(~np.isnan(self.values))
+        df = pd.concat(
+            [
+                self.markets.iloc[market].reset_index(drop=True),
+                self.series.iloc[series].reset_index(drop=True),
+            ],
+            axis=1,
+        )
+        df["month"] = self.months[month]
+        df["price"] = self.values[market, series, month]
+        return df
@@ -0,0 +1,361 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+USD = "USD"
+
+
+def prepare_rates(
+    rates: pd.DataFrame,
+    official: Optional[bool] = None,
+    currency_column: str = "name",
+    date_column: str = "date",
+    value_column: str = "value",
+    official_column: str = "isOfficial",
+) -> pd.DataFrame:
+    """Clean and sort an exchange-rate frame for as-of joins.
+
+    Returns a frame with ``currency``, ``date`` (datetime64), ``rate`` (float, units
+    of currency per USD) and ``official`` columns, sorted by date, without rows
+    missing a key or a positive rate. When both an official and an unofficial
+    rate exist for the same currency and date, the official one is kept.
+
+    Args:
+        rates (pandas.DataFrame): Rates, e.g. from ``get_exchange_rates``
+        official (bool, optional): Keep only official (True) or unofficial (False)
+            rates. Defaults to None (both).
+        currency_column (str, optional): Currency code column. Defaults to "name".
+        date_column (str, optional): Rate date column. Defaults to "date".
+        value_column (str, optional): Rate column. Defaults to "value".
+        official_column (str, optional): Official flag column. Defaults to
+            "isOfficial"; ignored when missing.
+
+    Returns:
+        pandas.DataFrame: Sorted rates
+    """
+    series = _clean_rates(
+        rates, currency_column, date_column, value_column, official_column
+    )
+    return _latest_per_date(series, official)
+
+
+def _to_datetime64(values) -> np.ndarray:
+    return pd.to_datetime(pd.Series(values), errors="coerce").to_numpy("datetime64[ns]")
+
+
+def _clean_rates(
+    rates: pd.DataFrame,
+    currency_column: str,
+    date_column: str,
+    value_column: str,
+    official_column: str,
+) -> pd.DataFrame:
+    """Rates as ``currency``/``date``/``rate``/``official`` columns, usable rows only."""
+    if official_column in rates:
+        is_official = (
+            rates[official_column].astype("boolean").fillna(False).to_numpy(bool)
+        )
+    else:
+        is_official = np.zeros(len(rates), dtype=bool)
+    series = pd.DataFrame(
+        {
+            "currency": rates[currency_column].astype("string").str.upper().to_numpy(),
+            "date": _to_datetime64(rates[date_column]),
+            "rate": pd.to_numeric(rates[value_column], errors="coerce").to_numpy(float),
+            "official": is_official,
+        }
+    )
+    usable = series[["currency", "date"]].notna().all(axis=1) & (series["rate"] > 0)
+    return series[usable]
+
+
+def _latest_per_date(series: pd.DataFrame, official: Optional[bool]) -> pd.DataFrame:
+    if official is not None:
+        series = series[series["official"] == official]
+    series = series.sort_values(["date", "currency", "official"], kind="stable")
+    series = series.drop_duplicates(["currency", "date"], keep="last")
+    return series.reset_index(drop=True)
+
+
+def _sorted_unique(dates: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Sort a rate series by date, keeping the last value given for each date."""
+    if len(dates) > 1 and not (dates[1:] > dates[:-1]).all():
+        order = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+        last = np.append(dates[1:] != dates[:-1], True)
+        dates, values = dates[last], values[last]
+    return dates, values
+
+
+class ExchangeRateIndex:
+    """Sorted exchange-rate series answering as-of lookups by binary search.
+
+    Rates are kept per currency and rate type (official or not) as sorted
+    ``datetime64`` date and float rate arrays. A lookup returns, for each
+    ``(currency, date)`` pair, the latest rate dated on or before the date, with
+    one ``searchsorted`` call per currency. Newer pages, or revised rates, can be
+    appended without rebuilding the index; a rate given again for an existing
+    date replaces the old one.
+
+    Args:
+        rates (pandas.DataFrame, optional): Rates, e.g. from ``get_exchange_rates``.
+            Defaults to None (empty index).
+        currency_column (str, optional): Currency code column. Defaults to "name".
+        date_column (str, optional): Rate date column. Defaults to "date".
+        value_column (str, optional): Rate column, units of currency per USD.
+            Defaults to "value".
+        official_column (str, optional): Official flag column. Defaults to
+            "isOfficial"; rates are unofficial when it is missing.
+
+    Examples:
+        >>> index = ExchangeRateIndex(client.get_exchange_rates("ETH"))
+        >>> index.rate("ETB", "2024-06-15")
+        56.9
+        >>> rates, dates = index.lookup(prices["currencyName"], prices["commodityPriceDate"])
+        >>> index.append(newer_rates)
+    """
+
+    def __init__(
+        self,
+        rates: Optional[pd.DataFrame] = None,
+        currency_column: str = "name",
+        date_column: str = "date",
+        value_column: str = "value",
+        official_column: str = "isOfficial",
+    ):
+        self._columns = (currency_column, date_column, value_column, official_column)
+        self._series: Dict[Tuple[str, bool], Tuple[np.ndarray, np.ndarray]] = {}
+        if rates is not None:
+            self.append(rates)
+
+    def __len__(self) -> int:
+        return sum(len(dates) for dates, _ in self._series.values())
+
+    def __repr__(self) -> str:
+        return f"ExchangeRateIndex(currencies={self.currencies}, rates={len(self)})"
+
+    @property
+    def currencies(self) -> List[str]:
+        return sorted({currency for currency, _ in self._series})
+
+    def append(self, rates: Union[pd.DataFrame, "ExchangeRateIndex"]) -> None:
+        """Add rates, e.g. a newer page, or the series of another index.
+
+        Series only get re-sorted when the new rates are not all later than the
+        existing ones.
+        """
+        if isinstance(rates, ExchangeRateIndex):
+            new = rates._series.items()
+        else:
+            clean = _clean_rates(rates, *self._columns)
+            new = (
+                (key, (group["date"].to_numpy(), group["rate"].to_numpy()))
+                for key, group in clean.groupby(["currency", "official"], sort=False)
+            )
+        for key, (dates, values) in new:
+            old = self._series.get(key)
+            if old is not None:
+                dates = np.concatenate((old[0], dates))
+                values = np.concatenate((old[1], values))
+            self._series[key] = _sorted_unique(dates, values)
+
+    def lookup(
+        self,
+        currencies,
+        dates,
+        official: Optional[bool] = None,
+        tolerance: Optional[Union[str, pd.Timedelta]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the latest rate on or before each date.
+
+        Args:
+            currencies (array-like): Currency code of every query
+            dates (array-like): Date of every query
+            official (bool, optional): Use only official (True) or unofficial
+                (False) rates. Defaults to None, the latest of both, official
+                first on the same date.
+            tolerance (str | pandas.Timedelta, optional): Maximum age of the
+                matched rate. Defaults to None (any preceding rate).
+
+        Returns:
+            tuple: ``(rates, rate_dates)`` arrays, NaN and NaT where no rate matches
+        """
+        currencies = pd.Series(currencies, dtype="string").str.upper().to_numpy()
+        dates = _to_datetime64(dates)
+        rates = np.full(len(dates), np.nan)
+        rate_dates = np.full(len(dates), np.datetime64("NaT"), dtype="datetime64[ns]")
+        codes, uniques = pd.factorize(currencies)
+        codes[np.isnat(dates)] = -1
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        kinds = (True, False) if official is None else (official,)
+
+        for code, currency in enumerate(uniques):
+            rows = order[bounds[code] : bounds[code + 1]]
+            for kind in kinds:
+                series = self._series.get((currency, kind))
+                if series is None or not len(rows):
+                    continue
+                positions = np.searchsorted(series[0], dates[rows], side="right") - 1
+                found = positions >= 0
+                hit_rows, positions = rows[found], positions[found]
+                # Official rates come first and win ties
+                newer = np.isnat(rate_dates[hit_rows]) | (
+                    series[0][positions] > rate_dates[hit_rows]
+                )
+                rates[hit_rows[newer]] = series[1][positions[newer]]
+                rate_dates[hit_rows[newer]] = series[0][positions[newer]]
+
+        if tolerance is not None:
+            stale = dates - rate_dates > pd.Timedelta(tolerance).to_timedelta64()
+            rates[stale] = np.nan
+            rate_dates[stale] = np.datetime64("NaT")
+        return rates, rate_dates
+
+    def rate(
+        self,
+        currency: str,
+        date,
+        official: Optional[bool] = None,
+        tolerance: Optional[Union[str, pd.Timedelta]] = None,
+    ) -> float:
+        """Return the latest rate of ``currency`` on or before ``date``, or NaN."""
+        date = pd.Timestamp(date).to_datetime64().astype("datetime64[ns]")
+        if np.isnat(date):
+            return np.nan
+        best_date, best_rate = None, np.nan
+        for kind in (True, False) if official is None else (official,):
+            series = self._series.get((str(currency).upper(), kind))
+            if series is None:
+                continue
+            position = np.searchsorted(series[0], date, side="right") - 1
+            if position >= 0 and (best_date is None or series[0][position] > best_date):
+                best_date, best_rate = series[0][position], series[1][position]
+        if (
+            best_date is not None
+            and tolerance is not None
+            and date - best_date > pd.Timedelta(tolerance).to_timedelta64()
+        ):
+            return np.nan
+        return float(best_rate)
+
+    def to_frame(self, official: Optional[bool] = None) -> pd.DataFrame:
+        """Return the rates as a frame shaped like :func:`prepare_rates` output."""
+        frames = [
+            pd.DataFrame(
+                {"currency": currency, "date": dates, "rate": values, "official": kind}
+            )
+            for (currency, kind), (dates, values) in self._series.items()
+        ]
+        if not frames:
+            frames = [
+                pd.DataFrame(
+                    {
+                        "currency": pd.Series(dtype=str),
+                        "date": pd.Series(dtype="datetime64[ns]"),
+                        "rate": pd.Series(dtype=float),
+                        "official": pd.Series(dtype=bool),
+                    }
+                )
+            ]
+        series = pd.concat(frames, ignore_index=True)
+        return _latest_per_date(series, official)
+
+
+def _merge_asof_rates(
+    currency: pd.Series,
+    dates: np.ndarray,
+    rates: pd.DataFrame,
+    tolerance: Optional[Union[str, pd.Timedelta]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    keys = pd.DataFrame(
+        {"currency": currency.to_numpy(), "date": dates, "row": np.arange(len(dates))}
+    )
+    keys = keys[keys["date"].notna() & keys["currency"].notna()]
+    # merge_asof needs both sides sorted on the date; rates already are
+    keys = keys.sort_values("date", kind="stable")
+    matched = pd.merge_asof(
+        keys,
+        rates[["currency", "date", "rate"]].rename(columns={"date": "rate_date"}),
+        left_on="date",
+        right_on="rate_date",
+        by="currency",
+        tolerance=pd.Timedelta(tolerance) if tolerance is not None else None,
+        direction="backward",
+    )
+
+    rate = np.full(len(dates), np.nan)
+    rate_date = np.full(len(dates), np.datetime64("NaT"), dtype="datetime64[ns]")
+    rows = matched["row"].to_numpy()
+    rate[rows] = matched["rate"].to_numpy(float)
+    rate_date[rows] = matched["rate_date"].to_numpy("datetime64[ns]")
+    return rate, rate_date
+
+
+def convert_to_usd(
+    prices: pd.DataFrame,
+    rates: Union[pd.DataFrame, ExchangeRateIndex],
+    tolerance: Optional[Union[str, pd.Timedelta]] = None,
+    official: Optional[bool] = None,
+    price_column: str = "commodityPrice",
+    currency_column: str = "currencyName",
+    date_column: str = "commodityPriceDate",
+) -> pd.DataFrame:
+    """Convert local-currency prices to USD with an as-of join on the rate date.
+
+    Each price is matched to the latest rate of its currency dated on or before
+    the price date, for the whole frame at once: by ``merge_asof`` for a rate
+    frame, or by binary search for an :class:`ExchangeRateIndex`. Adds ``exchangeRate``,
+    ``exchangeRateDate`` and ``usdPrice`` to a copy of ``prices``, in the original
+    row order. Prices already in USD get a rate of 1. Prices without a rate
+    within ``tolerance`` are kept with NaN values.
+
+    Args:
+        prices (pandas.DataFrame): Prices, e.g. from ``get_prices``
+        rates (pandas.DataFrame | ExchangeRateIndex): Rates prepared by
+            :func:`prepare_rates`, or an index
+        tolerance (str | pandas.Timedelta, optional): Maximum age of the matched
+            rate, e.g. ``"45D"``. Defaults to None (any preceding rate).
+        official (bool, optional): Use only official (True) or unofficial (False)
+            rates. Defaults to None (both, official first on the same date).
+        price_column (str, optional): Price column. Defaults to "commodityPrice".
+        currency_column (str, optional): Price currency column. Defaults to
+            "currencyName".
+        date_column (str, optional): Price date column. Defaults to
+            "commodityPriceDate".
+
+    Returns:
+        pandas.DataFrame: Prices with the USD columns
+
+    Examples:
+        >>> rates = prepare_rates(client.get_exchange_rates("KEN"))
+        >>> usd = convert_to_usd(prices, rates, tolerance="45D")
+    """
+    currency = prices[currency_column].astype("string").str.upper()
+    if isinstance(rates, ExchangeRateIndex):
+        rate, rate_date = rates.lookup(
+            currency, prices[date_column], official=official, tolerance=tolerance
+        )
+    else:
+        if official is not None:
+            rates = rates[rates["official"] == official]
+        rate, rate_date = _merge_asof_rates(
+            currency, _to_datetime64(prices[date_column]), rates, tolerance
+        )
+    rate[(currency == USD).fillna(False).to_numpy(bool)] = 1.0
+
+    df = prices.copy()
+    df["exchangeRate"] = rate
+    df["exchangeRateDate"] = rate_date
+    df["usdPrice"] = (
+        pd.to_numeric(prices[price_column], errors="coerce").to_numpy(float) / rate
+    )
+    missing = int(np.isnan(rate).sum())
+    if missing:
+        logger.debug("%d of %d prices have no exchange rate", missing, len(df))
+    return df
@@ -1,15 +1,20 @@
-from .commodityApi import CommodityApi
-from .currencyApi import CurrencyApi
-from .economicDataApi import EconomicDataApi
-from .globalOutlookApi import GlobalOutlookApi
-from .householdApi import HouseholdApi
-from .hungerHotpotApi import HungerHotspotApi
-from .incubationApi import IncubationApi
-from .ipcChApi import IpcchApi
-from .marketPricesApi import MarketPricesApi
-from .marketsApi import MarketsApi
-from .rpmeApi import RpmeApi
-from .surveysApi import MfiSurveysApi
+import importlib
+
+# Endpoint mixin -> module defining it, imported on first access
+_LAZY_ATTRIBUTES = {
+    "CommodityApi": "commodityApi",
+    "CurrencyApi": "currencyApi",
+    "EconomicDataApi": "economicDataApi",
+    "GlobalOutlookApi": "globalOutlookApi",
+    "HouseholdApi": "householdApi",
+    "HungerHotspotApi": "hungerHotpotApi",
+    "IncubationApi": "incubationApi",
+    "IpcchApi": "ipcChApi",
+    "MarketPricesApi": "marketPricesApi",
+    "MarketsApi": "marketsApi",
+    "RpmeApi": "rpmeApi",
+    "MfiSurveysApi": "surveysApi",
+}
 
 __all__ = [
     "HouseholdApi",
@@ -25,3 +30,16 @@ __all__ = [
     "RpmeApi",
     "MfiSurveysApi",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
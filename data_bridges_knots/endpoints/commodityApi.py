@@ -3,18 +3,16 @@ from typing import Optional
 import logging
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
+from data_bridges_knots.helpers import (
+    frame_library,
+    get_frame_countries,
+    to_frame_library,
+    to_pandas_frame,
 )
+from data_bridges_knots.units import UnitConversionIndex, normalize_units
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +25,7 @@ class CommodityApi:
         commodity_id: Optional[int] = 0,
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieves the detailed list of commodities available in the DataBridges platform.
@@ -37,6 +36,8 @@ class CommodityApi:
             commodity_id (int, optional): The exact ID of a commodity. Defaults to 0.
             page (int, optional): Page number for paged results. Defaults to 1.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Examples:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
@@ -57,28 +58,22 @@ class CommodityApi:
             env = self.env
 
             try:
-                api_response = api_instance.commodities_list_get(
+                items = self._fetch_pages(
+                    api_instance.commodities_list_get,
                     country_code=country_iso3,
                     commodity_name=commodity_name,
                     commodity_id=commodity_id,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
-                logger.info("Successfully retrieved commodities list")
 
-                # Convert the response to a DataFrame
-                if hasattr(api_response, "items"):
-                    df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                else:
-                    df = pd.DataFrame([api_response.to_dict()])
-
-                df = df.replace({np.nan: None})
-                return df
+                return self._to_frame("commodities_list_get", items)
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling CommoditiesApi->commodities_list_get: {e}"
+                    "Exception when calling CommoditiesApi->commodities_list_get: %s", e
                 )
                 raise
 
@@ -90,6 +85,7 @@ class CommodityApi:
         to_unit_id: Optional[int] = 0,
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieves conversion factors to Kilogram or Litres for each convertible unit of measure.
@@ -101,6 +97,8 @@ class CommodityApi:
             to_unit_id (int, optional): The exact ID of the converted unit of measure of the price of a commodity. Defaults to 0.
             page (int, optional): Page number for paged results. Defaults to 1.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Examples:
         >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
@@ -117,27 +115,108 @@ class CommodityApi:
             env = self.env
 
             try:
-                api_response = api_instance.commodity_units_conversion_list_get(
+                items = self._fetch_pages(
+                    api_instance.commodity_units_conversion_list_get,
                     country_code=country_iso3,
                     commodity_id=commodity_id,
                     from_unit_id=from_unit_id,
                     to_unit_id=to_unit_id,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
-                logger.info("Successfully retrieved commodity units conversion list")
 
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("commodity_units_conversion_list_get", items)
                 return df
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling CommodityUnitsApi->commodity_units_conversion_list_get: {e}"
+                    "Exception when calling CommodityUnitsApi->commodity_units_conversion_list_get: %s",
+                    e,
                 )
                 raise
 
+    def get_unit_conversion_index(
+        self, country_iso3: Optional[str] = None, refresh: bool = False
+    ) -> UnitConversionIndex:
+        """
+        Returns a lookup index over the unit conversion factors of a country.
+
+        The conversion table is fetched with ``get_commodity_units_conversion_list``
+        (all pages) once per country and cached on the client.
+
+        Args:
+            country_iso3 (str, optional): The code to identify the country. Defaults
+                to None, the conversions of all countries.
+            refresh (bool, optional): Rebuild the index from a fresh conversion list.
+                Defaults to False.
+
+        Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> index = client.get_unit_conversion_index("KEN")
+
+        Returns:
+            UnitConversionIndex: Index of conversion factors
+        """
+        key = country_iso3.upper() if country_iso3 else None
+        index = self.unit_conversion_indexes.get(key)
+        if index is None or refresh:
+            conversions = self.get_commodity_units_conversion_list(
+                country_iso3=key, all_pages=True
+            )
+            conversions = to_pandas_frame(conversions)
+            index = self.unit_conversion_indexes[key] = UnitConversionIndex(conversions)
+        return index
+
+    def normalize_units(
+        self,
+        prices_df: pd.DataFrame,
+        country_iso3: Optional[str] = None,
+        to_unit_id: Optional[int] = None,
+        price_column: str = "commodityPrice",
+    ) -> pd.DataFrame:
+        """
+        Converts prices to kilogram or litre prices, or to another unit.
+
+        Factors come from the cached index of ``get_unit_conversion_index`` and are
+        applied to the whole frame at once. Adds ``conversionFactor``,
+        ``normalizedUnitID``, ``normalizedPrice`` and ``unitConverted`` columns;
+        prices without a conversion are kept and flagged with ``unitConverted``
+        False.
+
+        Args:
+            prices_df (pandas.DataFrame | polars.DataFrame | pyarrow.Table): Prices,
+                e.g. from ``get_prices``
+            country_iso3 (str, optional): Country whose conversions are used.
+                Defaults to the single ``countryISO3`` of the prices, or to the
+                conversions of all countries.
+            to_unit_id (int, optional): Unit to convert to. Defaults to None, the
+                kilogram or litre unit of each conversion.
+            price_column (str, optional): Price column. Defaults to
+                "commodityPrice".
+
+        Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> prices = client.get_prices("KEN", "2025-01-01")
+        >>> per_kg = client.normalize_units(prices)
+
+        Returns:
+            pandas.DataFrame | polars.DataFrame | pyarrow.Table: Prices with the
+                normalized columns, in the library of ``prices_df``
+        """
+        library = frame_library(prices_df)
+        prices_df = to_pandas_frame(prices_df)
+        if country_iso3 is None:
+            countries = get_frame_countries(prices_df)
+            if len(countries) == 1:
+                country_iso3 = countries[0]
+        index = self.get_unit_conversion_index(country_iso3)
+        df = normalize_units(
+            prices_df, index, to_unit_id=to_unit_id, price_column=price_column
+        )
+        return to_frame_library(df, library)
+
     def get_commodity_units_list(
         self,
         country_iso3: Optional[str] = None,
@@ -145,6 +224,7 @@ class CommodityApi:
         commodity_unit_id: Optional[int] = 0,
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieves the detailed list of the unit of measure available in DataBridges platform.
@@ -155,6 +235,8 @@ class CommodityApi:
             commodity_unit_id (int, optional): The exact ID of a commodity unit. Defaults to 0.
             page (int, optional): Page number for paged results. Defaults to 1.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Examples:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
@@ -173,23 +255,24 @@ class CommodityApi:
             env = self.env
 
             try:
-                api_response = api_instance.commodity_units_list_get(
+                items = self._fetch_pages(
+                    api_instance.commodity_units_list_get,
                     country_code=country_iso3,
                     commodity_unit_name=commodity_unit_name,
                     commodity_unit_id=commodity_unit_id,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
-                logger.info("Successfully retrieved commodity units list")
 
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("commodity_units_list_get", items)
                 return df
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling CommodityUnitsApi->commodity_units_list_get: {e}"
+                    "Exception when calling CommodityUnitsApi->commodity_units_list_get: %s",
+                    e,
                 )
                 raise
 
@@ -200,6 +283,7 @@ class CommodityApi:
         category_name: Optional[str] = None,
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         # Enter a context with an instance of the API client
         # Enter a context with an instance of the API client
@@ -210,20 +294,18 @@ class CommodityApi:
 
             try:
                 # Provides the list of categories.
-                api_response = api_instance.commodities_categories_list_get(
+                items = self._fetch_pages(
+                    api_instance.commodities_categories_list_get,
                     country_code=country_iso3,
                     category_name=category_name,
                     category_id=category_id,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
 
-                logger.info(
-                    "The response of CommoditiesApi->commodities_categories_list_get:\n"
-                )
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("commodities_categories_list_get", items)
                 return df
             except Exception as e:
                 logger.error(
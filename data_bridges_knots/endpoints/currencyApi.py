@@ -1,34 +1,33 @@
-from typing import Optional
+from typing import Optional, Union
 
 import logging
-import time
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
+from data_bridges_knots.currency import ExchangeRateIndex, convert_to_usd
+from data_bridges_knots.helpers import (
+    frame_library,
+    get_frame_countries,
+    to_frame_library,
+    to_pandas_frame,
 )
+from data_bridges_knots.pagination import warn_page_size_ignored
 
 logger = logging.getLogger(__name__)
 
 
 class CurrencyApi:
     def get_exchange_rates(
-        self, country_iso3: str, page_size: int = 1000
+        self, country_iso3: str, page_size: Optional[int] = None
     ) -> pd.DataFrame:
         """Retrieves exchange rates for a given country from the Data Bridges API.
 
         Args:
             country_iso3 (str): The ISO3 country code
-            page_size (int, optional): Number of items per page. Defaults to 1000
+            page_size (int, optional): Deprecated and ignored, the page length is
+                read from the first response. Defaults to None.
 
         Returns:
             pd.DataFrame: DataFrame containing exchange rate data with columns:
@@ -47,41 +46,118 @@ class CurrencyApi:
         Raises:
             ApiException: If there's an error calling the Exchange rates API
         """
+        if page_size is not None:
+            warn_page_size_ignored("get_exchange_rates")
 
-        responses = []
-        total_items = 20
-        max_item = 0
-        page = 0
-        while total_items > max_item:
-            page += 1
-            with data_bridges_client.ApiClient(
-                self._setup_configuration_and_authentication(self.config)
-            ) as api_client:
-                api_instance = data_bridges_client.CurrencyApi(api_client)
-                env = self.env
-
-                try:
-                    api_exchange_rates = (
-                        api_instance.currency_usd_indirect_quotation_get(
-                            country_iso3=country_iso3, format="json", page=page, env=env
-                        )
-                    )
-                    responses.extend(
-                        item.to_dict() for item in api_exchange_rates.items
-                    )
-                    total_items = api_exchange_rates.total_items
-                    logger.info("Fetching page %s", page)
-                    max_item = page * page_size
-                    time.sleep(1)
-                except ApiException as e:
-                    logger.error(
-                        "Exception when calling Exchange rates data-> : %s\n",
-                        e,
-                    )
-                    raise
-        df = pd.DataFrame(responses)
-        df = df.replace({np.nan: None})
-        return df
+        with data_bridges_client.ApiClient(self.configuration) as api_client:
+            api_instance = data_bridges_client.CurrencyApi(api_client)
+
+            try:
+                items = self._fetch_pages(
+                    api_instance.currency_usd_indirect_quotation_get,
+                    all_pages=True,
+                    country_iso3=country_iso3,
+                    format="json",
+                    env=self.env,
+                )
+            except ApiException as e:
+                logger.error(
+                    "Exception when calling Exchange rates data-> : %s\n",
+                    e,
+                )
+                raise
+
+        return self._to_frame("currency_usd_indirect_quotation_get", items)
+
+    def get_exchange_rate_index(
+        self, country_iso3: str, refresh: bool = False
+    ) -> ExchangeRateIndex:
+        """Returns an index of the exchange rates of a country, cached on the client.
+
+        The rates are fetched once with ``get_exchange_rates`` and kept as sorted
+        series per currency and rate type, answering "rate at date X" questions by
+        binary search. Newer rates can be added with ``index.append``.
+
+        Args:
+            country_iso3 (str): The ISO3 country code
+            refresh (bool, optional): Fetch the rates again. Defaults to False.
+
+        Returns:
+            ExchangeRateIndex: Index of the country's rates
+
+        Examples:
+            >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+            >>> index = client.get_exchange_rate_index("ETH")
+            >>> index.rate("ETB", "2024-06-15", official=True)
+        """
+        key = country_iso3.upper()
+        index = self.exchange_rate_indexes.get(key)
+        if index is None or refresh:
+            index = self.exchange_rate_indexes[key] = ExchangeRateIndex(
+                to_pandas_frame(self.get_exchange_rates(key))
+            )
+        return index
+
+    def convert_to_usd(
+        self,
+        prices_df: pd.DataFrame,
+        country_iso3: Optional[str] = None,
+        tolerance: Optional[Union[str, pd.Timedelta]] = None,
+        official: Optional[bool] = None,
+        price_column: str = "commodityPrice",
+    ) -> pd.DataFrame:
+        """Converts local-currency prices to USD using the latest preceding rate.
+
+        Every price is joined to the most recent exchange rate of its currency dated
+        on or before the price date, for the whole frame at once. Rates come from
+        the cached index of ``get_exchange_rate_index``, so repeated conversions do
+        not fetch them again. Adds ``exchangeRate``, ``exchangeRateDate`` and
+        ``usdPrice`` columns.
+
+        Args:
+            prices_df (pd.DataFrame | polars.DataFrame | pyarrow.Table): Prices,
+                e.g. from ``get_prices``
+            country_iso3 (str, optional): Country whose rates are used. Defaults to
+                the countries in the ``countryISO3`` column of the prices.
+            tolerance (str | pd.Timedelta, optional): Maximum age of the matched
+                rate, e.g. ``"45D"``. Older rates leave the price unconverted.
+                Defaults to None (any preceding rate).
+            official (bool, optional): Use only official (True) or unofficial
+                (False) rates. Defaults to None (both, official first).
+            price_column (str, optional): Price column. Defaults to
+                "commodityPrice".
+
+        Returns:
+            pd.DataFrame | polars.DataFrame | pyarrow.Table: Prices with the USD
+                columns, in the library of ``prices_df``
+
+        Examples:
+            >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+            >>> prices = client.get_prices("ETH", "2025-01-01")
+            >>> usd = client.convert_to_usd(prices, tolerance="45D")
+
+        Raises:
+            ValueError: If no country is given and the prices have none
+        """
+        library = frame_library(prices_df)
+        prices_df = to_pandas_frame(prices_df)
+        countries = [country_iso3] if country_iso3 else get_frame_countries(prices_df)
+        if not countries:
+            raise ValueError("country_iso3 is required when prices have no countryISO3")
+        if len(countries) == 1:
+            index = self.get_exchange_rate_index(countries[0])
+        else:
+            index = ExchangeRateIndex()
+            for country in countries:
+                index.append(self.get_exchange_rate_index(country))
+        df = convert_to_usd(
+            prices_df,
+            index,
+            tolerance=tolerance,
+            official=official,
+            price_column=price_column,
+        )
+        return to_frame_library(df, library)
 
     def get_currency_list(
         self,
@@ -90,6 +166,7 @@ class CurrencyApi:
         currency_id: Optional[str] = 0,
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Returns the list of currencies available in the internal VAM database, with Currency 3-letter code, matching with ISO 4217.
@@ -100,6 +177,8 @@ class CurrencyApi:
             currency_id (int, optional): Unique code to identify the currency in internal VAM currencies. Defaults to 0.
             page (int, optional): Page number for paged results. Defaults to 1.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Examples:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
@@ -118,23 +197,23 @@ class CurrencyApi:
             env = self.env
 
             try:
-                api_response = api_instance.currency_list_get(
+                items = self._fetch_pages(
+                    api_instance.currency_list_get,
                     country_code=country_iso3,
                     currency_name=currency_name,
                     currency_id=currency_id,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
-                logger.info("Successfully retrieved currency list")
 
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("currency_list_get", items)
                 return df
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling CurrencyApi->currency_list_get: {e}"
+                    "Exception when calling CurrencyApi->currency_list_get: %s", e
                 )
                 raise
 
@@ -144,6 +223,7 @@ class CurrencyApi:
         currency_name: Optional[str] = "",
         page: Optional[int] = 1,
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Returns the value of the Exchange rates from Trading Economics, for official rates, and DataViz for unofficial rates.
@@ -153,6 +233,8 @@ class CurrencyApi:
             currency_name (str, optional): The ISO3 code for the currency, based on ISO4217. Defaults to ''.
             page (int, optional): Page number for paged results. Defaults to 1.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Examples:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
@@ -169,21 +251,22 @@ class CurrencyApi:
             env = self.env
 
             try:
-                api_response = api_instance.currency_usd_indirect_quotation_get(
+                items = self._fetch_pages(
+                    api_instance.currency_usd_indirect_quotation_get,
                     country_iso3=country_iso3,
                     currency_name=currency_name,
                     page=page,
+                    all_pages=all_pages,
                     format=format,
                     env=env,
                 )
-                logger.info("Successfully retrieved USD indirect quotation data")
 
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("currency_usd_indirect_quotation_get", items)
                 return df
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling CurrencyApi->currency_usd_indirect_quotation_get: {e}"
+                    "Exception when calling CurrencyApi->currency_usd_indirect_quotation_get: %s",
+                    e,
                 )
                 raise
@@ -3,18 +3,8 @@ from typing import Optional
 import logging
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +15,7 @@ class EconomicDataApi:
         indicator_name: Optional[str] = "",
         country_iso3: Optional[str] = "",
         format: Optional[str] = "json",
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Returns the lists of indicators for which Vulnerability Analysis and Mapping - Economic and Market Analysis Unit has redistribution licensing from Trading Economics.
@@ -34,6 +25,8 @@ class EconomicDataApi:
             indicator_name (str, optional): Unique indicator name. Defaults to ''.
             country_iso3 (str, optional): The code to identify the country. Must be a ISO-3166 Alpha 3 code. Defaults to ''.
             format (str, optional): Output format: 'json' or 'csv'. Defaults to 'json'.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Returns:
             pandas.DataFrame: A DataFrame containing the retrieved economic indicator data.
@@ -44,18 +37,16 @@ class EconomicDataApi:
 
             try:
                 # Returns the lists of indicators.
-                api_response = api_instance.economic_data_indicator_list_get(
+                items = self._fetch_pages(
+                    api_instance.economic_data_indicator_list_get,
                     page=page,
+                    all_pages=all_pages,
                     indicator_name=indicator_name,
                     iso3=country_iso3,
                     format=format,
                     env=self.env,
                 )
-                logger.info(
-                    "The response of EconomicDataApi->economic_data_indicator_list_get:\n"
-                )
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("economic_data_indicator_list_get", items)
                 return df
             except Exception as e:
                 logger.error(
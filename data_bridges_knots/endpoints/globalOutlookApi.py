@@ -5,15 +5,6 @@ import logging
 import data_bridges_client
 import pandas as pd
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -65,24 +56,25 @@ class GlobalOutlookApi:
 
             try:
                 if data_type == "country_latest":
-                    api_response = api_instance.global_outlook_country_latest_get(
-                        env=env
+                    api_response = self._call_api(
+                        api_instance.global_outlook_country_latest_get, env=env
                     )
                 elif data_type == "global_latest":
-                    api_response = api_instance.global_outlook_global_latest_get(
-                        env=env
+                    api_response = self._call_api(
+                        api_instance.global_outlook_global_latest_get, env=env
                     )
 
                 elif data_type == "regional_latest":
-                    api_response = api_instance.global_outlook_regional_latest_get(
-                        env=env
+                    api_response = self._call_api(
+                        api_instance.global_outlook_regional_latest_get, env=env
                     )
                 else:
                     raise ValueError(f"Invalid data_type: {data_type}")
-                logger.info(
-                    f"Successfully retrieved Global Outlook data for type: {data_type}"
+                return self._to_frame(
+                    f"global_outlook_{data_type}_get",
+                    api_response.items,
+                    replace_nan=False,
                 )
-                return pd.DataFrame([item.to_dict() for item in api_response.items])
 
             except Exception as e:
                 logger.error(
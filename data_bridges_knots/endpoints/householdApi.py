@@ -1,23 +1,16 @@
 from typing import Optional
 
+import hashlib
 import logging
-import time
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
+from data_bridges_knots.bundle import compile_label_bundle
+from data_bridges_knots.cache import CachedForm
 from data_bridges_knots.helpers import get_adm0_code
-
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
+from data_bridges_knots.labels import to_dict
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +46,9 @@ class HouseholdApi:
                 Defaults to ``True``.
 
         Returns:
-            pandas.DataFrame: Survey data as a DataFrame.
+            pandas.DataFrame: Survey data as a DataFrame. With a client
+            ``dataset_store``, a survey is fetched once and memory-mapped from the
+            store by later calls.
 
         Raises:
             KeyError: If ``access_type`` is invalid.
@@ -69,79 +64,58 @@ class HouseholdApi:
             >>> df = client.get_household_survey(3094, "official")
         """
 
-        responses = []
-        total_items = 1
-        max_item = 0
-        page = 0
-
-        while total_items > max_item:
-            page += 1
+        # Select appropriate API call based on access_type
+        endpoint = {
+            "full": "household_full_data_get",
+            "draft": "household_draft_internal_base_data_get",
+            "official": "household_official_use_base_data_get",
+            "public": "household_public_base_data_get",
+        }[access_type]
+
+        args = ()
+        options = {}
+        if access_type in ("full", "draft"):
+            args = (self.data_bridges_api_key,)
+        if access_type == "full":
+            options["apply_mapping"] = kwargs.get("apply_mapping", False)
+            options["full_data"] = kwargs.get("full_data", True)
+
+        def fetch():
             with data_bridges_client.ApiClient(self.configuration) as api_client:
-                api_instance = data_bridges_client.IncubationApi(api_client)
-                env = self.env
-
+                api_call = getattr(
+                    data_bridges_client.IncubationApi(api_client), endpoint
+                )
                 try:
-                    logger.info(f"Calling get_household_survey for survey {survey_id}")
-                    # Select appropriate API call based on access_type
-                    api_call = {
-                        "full": api_instance.household_full_data_get,
-                        "draft": api_instance.household_draft_internal_base_data_get,
-                        "official": api_instance.household_official_use_base_data_get,
-                        "public": api_instance.household_public_base_data_get,
-                    }.get(access_type)
-
-                    if access_type == "full":
-                        apply_mapping = kwargs.get("apply_mapping", False)
-                        full_data = kwargs.get("full_data", True)
-                        try:
-                            api_survey = api_call(
-                                self.data_bridges_api_key,
-                                survey_id=survey_id,
-                                page=page,
-                                page_size=page_size,
-                                env=env,
-                                apply_mapping=apply_mapping,
-                                full_data=full_data,
-                            )
-                        except ApiException as e:
-                            logger.error(
-                                f"API key required when calling Household data-> '{access_type}': {e}"
-                            )
-                            raise
-                    elif access_type == "draft":
-                        try:
-                            api_survey = api_call(
-                                self.data_bridges_api_key,
-                                survey_id=survey_id,
-                                page=page,
-                                page_size=page_size,
-                                env=env,
-                            )
-                        except ApiException as e:
-                            logger.error(
-                                f"API key required when calling Household data-> '{access_type}': {e}"
-                            )
-                            raise
+                    return self._fetch_pages(
+                        api_call,
+                        *args,
+                        all_pages=True,
+                        survey_id=survey_id,
+                        page_size=page_size,
+                        env=self.env,
+                        **options,
+                    )
+                except ApiException as e:
+                    if args:
+                        logger.error(
+                            "API key required when calling Household data-> '%s': %s",
+                            access_type,
+                            e,
+                        )
                     else:
-                        api_survey = api_call(
-                            survey_id=survey_id, page=page, page_size=page_size, env=env
+                        logger.error(
+                            "Exception when calling Household data-> %s: %s",
+                            access_type,
+                            e,
                         )
-
-                    logger.info(f"Fetching page {page}")
-                    logger.info(f"Items: {len(api_survey.items)}")
-                    responses.extend(api_survey.items)
-                    total_items = api_survey.total_items
-                    max_item = len(api_survey.items) + max_item
-                    time.sleep(1)
-
-                except ApiException as e:
-                    logger.error(
-                        f"Exception when calling Household data-> {access_type}{e}"
-                    )
                     raise
 
-            df = pd.DataFrame(responses)
-        return df
+        # The page size does not change the result. The key's access rights can,
+        # so a hash of the key is part of the store key, never the key itself
+        params = {"survey_id": survey_id, **options}
+        if args:
+            params["api_key"] = hashlib.sha256(args[0].encode()).hexdigest()
+        return self._stored_frame(endpoint, params, fetch, replace_nan=False)
 
     def get_household_surveys_list(
         self,
@@ -150,6 +124,7 @@ class HouseholdApi:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         survey_id: Optional[int] = None,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """Retrieves a list of household surveys for a country with their metadata.
 
@@ -159,6 +134,8 @@ class HouseholdApi:
             start_date (str, optional): Start date filter in ISO format (YYYY-MM-DD)
             end_date (str, optional): End date filter in ISO format (YYYY-MM-DD)
             survey_id (int, optional): Specific survey ID to retrieve
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Returns:
             pd.DataFrame: DataFrame containing survey metadata with columns:
@@ -192,21 +169,21 @@ class HouseholdApi:
             env = self.env
 
             try:
-                api_response = api_instance.household_surveys_get(
+                items = self._fetch_pages(
+                    api_instance.household_surveys_get,
                     adm0_code=adm0code,
                     page=page,
+                    all_pages=all_pages,
                     start_date=start_date,
                     end_date=end_date,
                     survey_id=survey_id,
                     env=env,
                 )
-                logger.info("Successfully retrieved household surveys")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("household_surveys_get", items)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling IncubationApi->household_surveys_get: {e}"
+                    "Exception when calling IncubationApi->household_surveys_get: %s", e
                 )
                 raise
 
@@ -238,24 +215,38 @@ class HouseholdApi:
             env = self.env
 
             try:
-                api_response = api_instance.xls_forms_definition_get(
-                    xls_form_id=xls_form_id, env=env
+                api_response = self._call_api(
+                    api_instance.xls_forms_definition_get,
+                    xls_form_id=xls_form_id,
+                    env=env,
                 )
-                logger.info(
-                    f"Successfully retrieved XLS Form definition for ID: {xls_form_id}"
+                self.xlsform = self._to_frame(
+                    "xls_forms_definition_get", api_response, replace_nan=False
                 )
-                self.xlsform = pd.DataFrame([item.to_dict() for item in api_response])
+                self.xlsform_cache.put(xls_form_id, env, self.xlsform)
                 return self.xlsform
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling IncubationApi->xls_forms_definition_get: {e}"
+                    "Exception when calling IncubationApi->xls_forms_definition_get: %s",
+                    e,
                 )
                 raise
 
+    def _get_cached_form(self, xls_form_id: int) -> CachedForm:
+        """Return the cached XLSForm for ``xls_form_id``, fetching it on a miss."""
+        entry = self.xlsform_cache.get(xls_form_id, self.env)
+        if entry is None:
+            self.get_household_xlsform_definition(xls_form_id)
+            entry = self.xlsform_cache.get(xls_form_id, self.env)
+        return entry
+
     def get_household_questionnaire(self, xls_form_id: int) -> pd.DataFrame:
         """Extracts the questionnaire structure from an XLS Form definition.
 
+        Form definitions are cached per ``xls_form_id`` and environment, so only the
+        first call for a given form hits the API.
+
         Args:
             xls_form_id (int): The ID of the questionnaire form to process
 
@@ -267,9 +258,10 @@ class HouseholdApi:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
             >>> questionnaire = client.get_household_questionnaire(2075)
         """
-        if self.xlsform is None:
-            self.xlsform = self.get_household_xlsform_definition(xls_form_id)
-        return pd.DataFrame(list(self.xlsform.fields)[0])
+        entry = self._get_cached_form(xls_form_id)
+        if entry.questionnaire is None:
+            entry.questionnaire = pd.DataFrame(list(entry.xlsform.fields)[0])
+        return entry.questionnaire.copy()
 
     def get_choice_list(self, xls_form_id: int) -> pd.DataFrame:
         """Extracts choice lists from a questionnaire form definition.
@@ -287,10 +279,41 @@ class HouseholdApi:
             >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
             >>> choices = client.get_choice_list(123)
         """
-        questionnaire = self.get_household_questionnaire(xls_form_id)
+        entry = self._get_cached_form(xls_form_id)
+        if entry.choices is None:
+            if entry.questionnaire is None:
+                entry.questionnaire = pd.DataFrame(list(entry.xlsform.fields)[0])
+
+            index, rows = [], []
+            for idx, choice_list in entry.questionnaire["choiceList"].items():
+                choice_list = to_dict(choice_list)
+                if not isinstance(choice_list, dict) or not choice_list.get("name"):
+                    continue
+                for choice in choice_list.get("choices") or []:
+                    index.append(idx)
+                    rows.append((choice_list["name"], choice["name"], choice["label"]))
+            entry.choices = pd.DataFrame(
+                rows, index=index, columns=["name", "value", "label"]
+            )
+        return entry.choices.copy()
+
+    def compile_label_bundle(self, xls_form_id: int, path: str) -> str:
+        """Compiles the labels of a questionnaire into a label bundle on disk.
+
+        Worker processes can then open the bundle with ``LabelBundle.load(path)``
+        instead of fetching and parsing the XLS Form again.
 
-        choiceList = pd.json_normalize(questionnaire["choiceList"]).dropna()
-        choices = choiceList.explode("choices")
-        choices["value"] = choices["choices"].apply(lambda x: x["name"])
-        choices["label"] = choices["choices"].apply(lambda x: x["label"])
-        return choices[["name", "value", "label"]]
+        Args:
+            xls_form_id (int): The ID of the questionnaire form to compile
+            path (str): Directory to write the bundle to
+
+        Returns:
+            str: The bundle directory
+
+        Examples:
+            >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+            >>> path = client.compile_label_bundle(2075, "labels/2075")
+            >>> bundle = LabelBundle.load(path)
+        """
+        questionnaire = self.get_household_questionnaire(xls_form_id)
+        return str(compile_label_bundle(questionnaire, path, xls_form_id=xls_form_id))
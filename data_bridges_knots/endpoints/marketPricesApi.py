@@ -1,22 +1,13 @@
 from typing import Optional
 
 import logging
-import time
 from datetime import date
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
+from data_bridges_knots.pagination import warn_page_size_ignored
 
 logger = logging.getLogger(__name__)
 
@@ -27,27 +18,38 @@ class MarketPricesApi:
         country_iso3: str,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        page_size: int = 1000,
+        page_size: Optional[int] = None,
         market_id: int = 0,
         commodity_id: int = 0,
         currency_id: int = 0,
         price_flag: str = "",
         latest_value_only: bool = False,
+        compact: bool = False,
     ) -> pd.DataFrame:
         """Fetches market price data for a given country within a specified date range.
 
+        With a client ``dataset_store``, a result is fetched once and memory-mapped
+        from the store by later calls with the same filters. Dates default to
+        today, so calls without dates are stored per day.
+
         Args:
             country_iso3 (str): The ISO 3-letter country code
             start_date (str, optional): Start date in ISO format (e.g., '2022-01-01').
                 If None, defaults to today's date.
             end_date (str, optional): End date in ISO format (e.g., '2022-01-01').
                 If None, defaults to today's date.
-            page_size (int, optional): Number of items per page. Defaults to 1000.
+            page_size (int, optional): Deprecated and ignored, the page length is
+                read from the first response. Defaults to None.
             market_id (int, optional): Unique ID of a Market. Defaults to 0.
             commodity_id (int, optional): The exact ID of a Commodity. Defaults to 0.
             currency_id (int, optional): The exact ID of a currency. Defaults to 0.
             price_flag (str, optional): Type of price data: [actual|aggregate|estimated|forecasted]. Defaults to ''.
             latest_value_only (bool, optional): Whether to return only latest values. Defaults to False.
+            compact (bool, optional): Return typed columns instead of objects with
+                None for missing values: nullable integers, datetime64 dates and
+                categorical repeated strings, see
+                :func:`~data_bridges_knots.helpers.compact_frame`. Uses a
+                fraction of the memory on large pulls. Defaults to False.
 
         Returns:
             pd.DataFrame: DataFrame containing market price data
@@ -64,7 +66,11 @@ class MarketPricesApi:
             ...     commodity_id=456,
             ...     price_flag="actual"
             ... )
+            >>> # Typed, memory-efficient columns
+            >>> df_prices = client.get_prices("KEN", "2020-01-01", compact=True)
         """
+        if page_size is not None:
+            warn_page_size_ignored("get_prices")
         if start_date:
             # Format the date according to RFC 3339 standard
             start_date = date.fromisoformat(start_date).strftime(
@@ -79,37 +85,29 @@ class MarketPricesApi:
         else:
             end_date = date.today().strftime("%Y-%m-%dT%H:%M:%S+01:00")
 
-        responses = []
-        total_items = 20
-        max_item = 0
-        page = 0
-        while total_items > max_item:
-            page += 1
-            with data_bridges_client.ApiClient(
-                self._setup_configuration_and_authentication(self.config)
-            ) as api_client:
+        params = {
+            "country_code": country_iso3,
+            "market_id": market_id,
+            "commodity_id": commodity_id,
+            "currency_id": currency_id,
+            "price_flag": price_flag,
+            "start_date": start_date,
+            "end_date": end_date,
+            "latest_value_only": latest_value_only,
+        }
+
+        def fetch():
+            with data_bridges_client.ApiClient(self.configuration) as api_client:
                 api_instance = data_bridges_client.MarketPricesApi(api_client)
-                env = self.env
 
                 try:
-                    api_prices = api_instance.market_prices_price_monthly_get(
-                        country_code=country_iso3,
-                        market_id=market_id,
-                        commodity_id=commodity_id,
-                        currency_id=currency_id,
-                        price_flag=price_flag,
+                    return self._fetch_pages(
+                        api_instance.market_prices_price_monthly_get,
+                        all_pages=True,
                         format="json",
-                        page=page,
-                        env=env,
-                        start_date=start_date,
-                        end_date=end_date,
-                        latest_value_only=latest_value_only,
+                        env=self.env,
+                        **params,
                     )
-                    responses.extend(item.to_dict() for item in api_prices.items)
-                    total_items = api_prices.total_items
-                    logger.info("Fetching page %s/n", page)
-                    max_item = page * page_size
-                    time.sleep(1)
                 except ApiException as e:
                     logger.error(
                         "Exception when calling Market price data->market_prices_price_monthly_get: %s\n",
@@ -117,6 +115,6 @@ class MarketPricesApi:
                     )
                     raise
 
-        df = pd.DataFrame(responses)
-        df = df.replace({np.nan: None})
-        return df
+        return self._stored_frame(
+            "market_prices_price_monthly_get", params, fetch, compact=compact
+        )
@@ -3,19 +3,14 @@ from typing import Optional
 import logging
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
-from data_bridges_knots.helpers import get_adm0_code
-
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
+from data_bridges_knots.helpers import get_adm0_code, to_pandas_frame
+from data_bridges_knots.spatial import (
+    MarketIndex,
+    geojson_to_frame,
+    write_geoparquet,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,10 +31,11 @@ class MarketsApi:
 
             try:
                 # Provide a list of geo referenced markets in a specific country
-                api_response = api_instance.markets_geo_json_list_get(
-                    adm0code=adm0code, env=self.env
+                api_response = self._call_api(
+                    api_instance.markets_geo_json_list_get,
+                    adm0code=adm0code,
+                    env=self.env,
                 )
-                logger.info("The response of MarketsApi->markets_geo_json_list_get:\n")
 
                 geojson_dict = api_response.model_dump()
 
@@ -51,14 +47,55 @@ class MarketsApi:
                 )
                 raise
 
+    def get_market_geojson_table(
+        self, country_iso3: Optional[str] = None, geoparquet_path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Returns the geo-referenced markets of a country as a columnar table.
+
+        Parses the ``get_market_geojson_list`` FeatureCollection into one row per
+        market, with the feature properties as columns and the point coordinates
+        as float64 ``longitude`` and ``latitude`` columns.
+
+        Args:
+            country_iso3 (str): The ISO3 code to identify the country.
+            geoparquet_path (str, optional): Also write the table to this
+                GeoParquet file (requires pyarrow). Defaults to None.
+
+        Returns:
+            pd.DataFrame | polars.DataFrame: One row per market, in the client's
+                backend
+
+        Examples:
+            >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+            >>> markets = client.get_market_geojson_table("KEN")
+            >>> markets.plot.scatter(x="longitude", y="latitude")
+            >>> # Save for GIS tools
+            >>> client.get_market_geojson_table("KEN", "ken_markets.parquet")
+
+        Raises:
+            ValueError: If country_iso3 is missing
+            ImportError: If geoparquet_path is given and pyarrow is not installed
+        """
+        df = geojson_to_frame(
+            self.get_market_geojson_list(country_iso3), backend=self.backend
+        )
+        if geoparquet_path is not None:
+            write_geoparquet(df, geoparquet_path)
+        return df
+
     def get_markets_list(
-        self, country_iso3: Optional[str] = None, page: Optional[int] = 1
+        self,
+        country_iso3: Optional[str] = None,
+        page: Optional[int] = 1,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """Retrieves a complete list of markets in a country.
 
         Args:
             country_iso3 (str, optional): The ISO3 code to identify the country. Defaults to None.
             page (int, optional): Page number for paginated results. Defaults to 1.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Returns:
             pd.DataFrame: DataFrame containing market information with columns:
@@ -88,11 +125,15 @@ class MarketsApi:
 
             try:
                 # Get a complete list of markets in a country
-                api_response = api_instance.markets_list_get(
-                    country_code=country_iso3, page=page, format=format, env=env
+                items = self._fetch_pages(
+                    api_instance.markets_list_get,
+                    country_code=country_iso3,
+                    page=page,
+                    all_pages=all_pages,
+                    format=format,
+                    env=env,
                 )
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("markets_list_get", items)
                 return df
             except Exception as e:
                 logger.error(
@@ -132,10 +173,12 @@ class MarketsApi:
 
             try:
                 # Get a complete list of markets in a country
-                api_response = api_instance.markets_markets_as_csv_get(
-                    adm0code=adm0code, local_names=local_names, env=self.env
+                api_response = self._call_api(
+                    api_instance.markets_markets_as_csv_get,
+                    adm0code=adm0code,
+                    local_names=local_names,
+                    env=self.env,
                 )
-                logger.info("The response of MarketsApi->markets_markets_as_csv_get:\n")
                 return api_response
             except Exception as e:
                 logger.error(
@@ -144,11 +187,54 @@ class MarketsApi:
                 )
                 raise
 
+    def get_market_index(
+        self, country_iso3: Optional[str] = None, refresh: bool = False
+    ) -> MarketIndex:
+        """Returns a local spatial index of the markets of a country.
+
+        The index is built from ``get_markets_list`` once per country and cached on
+        the client, so nearest-market and radius queries for any number of
+        locations need no further API call.
+
+        Args:
+            country_iso3 (str): The ISO3 code to identify the country.
+            refresh (bool, optional): Rebuild the index from a fresh market list.
+                Defaults to False.
+
+        Returns:
+            MarketIndex: Index answering ``nearest`` and ``within`` queries for
+                arrays of coordinates
+
+        Examples:
+            >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+            >>> index = client.get_market_index("AFG")
+            >>> # Closest market of every household
+            >>> closest = index.nearest(households["lat"], households["lng"])
+            >>> # All markets within 15 km, like get_nearby_markets
+            >>> nearby = index.within(34.515, 69.208, radius_km=15)
+
+        Raises:
+            ValueError: If country_iso3 is missing
+            ApiException: If there's an error accessing the Markets API
+        """
+        if country_iso3 is None:
+            raise ValueError("country_iso3 parameter is required")
+        key = country_iso3.upper()
+        index = self.market_indexes.get(key)
+        if index is None or refresh:
+            markets = to_pandas_frame(self.get_markets_list(key, all_pages=True))
+            index = self.market_indexes[key] = MarketIndex(markets)
+            logger.debug("Built spatial index of %d markets for %s", len(index), key)
+        return index
+
     def get_nearby_markets(
         self, country_iso3: str = None, lat: float = None, lng: float = None
     ) -> pd.DataFrame:
         """Finds markets near a given location within a 15km distance.
 
+        Each call queries the API for a single location. To match many locations,
+        or use another radius, query the local index of ``get_market_index``.
+
         Args:
             country_iso3 (str): Country administrative code. Defaults to None.
             lat (float): Latitude of the search point. Defaults to None.
@@ -180,15 +266,18 @@ class MarketsApi:
             env = self.env
 
             try:
-                api_response = api_instance.markets_nearby_markets_get(
-                    adm0code=adm0code, lat=lat, lng=lng, env=env
+                api_response = self._call_api(
+                    api_instance.markets_nearby_markets_get,
+                    adm0code=adm0code,
+                    lat=lat,
+                    lng=lng,
+                    env=env,
                 )
-                logger.info("Successfully retrieved nearby markets")
-                df = pd.DataFrame([item.to_dict() for item in api_response])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("markets_nearby_markets_get", api_response)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling MarketsApi->markets_nearby_markets_get: {e}"
+                    "Exception when calling MarketsApi->markets_nearby_markets_get: %s",
+                    e,
                 )
                 raise
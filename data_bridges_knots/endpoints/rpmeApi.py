@@ -3,39 +3,39 @@ from typing import Optional
 import logging
 
 import data_bridges_client
-import numpy as np
-import pandas as pd
 from data_bridges_client.rest import ApiException
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
-
 logger = logging.getLogger(__name__)
 
 
 # TODO: Get the scope and test these functions
 class RpmeApi:
-    def get_rpme_base_data(self, survey_id=None, page: Optional[int] = 1, page_size=20):
+    def get_rpme_base_data(
+        self,
+        survey_id=None,
+        page: Optional[int] = 1,
+        page_size=20,
+        all_pages: bool = False,
+    ):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_base_data_get(
-                    survey_id=survey_id, page=page, page_size=page_size, env=env
+                items = self._fetch_pages(
+                    api_instance.rpme_base_data_get,
+                    survey_id=survey_id,
+                    page=page,
+                    all_pages=all_pages,
+                    page_size=page_size,
+                    env=env,
                 )
-                logger.info("Successfully retrieved RPME base data")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("rpme_base_data_get", items)
                 return df
             except ApiException as e:
-                logger.error(f"Exception when calling RpmeApi->rpme_base_data_get: {e}")
+                logger.error(
+                    "Exception when calling RpmeApi->rpme_base_data_get: %s", e
+                )
                 raise
 
     # TODO: Get the scope and test these functions
@@ -45,25 +45,28 @@ class RpmeApi:
         format: Optional[str] = "json",
         page: Optional[int] = 1,
         page_size=20,
+        all_pages: bool = False,
     ):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_full_data_get(
+                items = self._fetch_pages(
+                    api_instance.rpme_full_data_get,
                     survey_id=survey_id,
                     format=format,
                     page=page,
+                    all_pages=all_pages,
                     page_size=page_size,
                     env=env,
                 )
-                logger.info("Successfully retrieved RPME full data")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("rpme_full_data_get", items)
                 return df
             except ApiException as e:
-                logger.error(f"Exception when calling RpmeApi->rpme_full_data_get: {e}")
+                logger.error(
+                    "Exception when calling RpmeApi->rpme_full_data_get: %s", e
+                )
                 raise
 
     # TODO: Get the scope and test these functions
@@ -75,14 +78,17 @@ class RpmeApi:
         shop_id=None,
         market_id=None,
         adm0_code_dots="",
+        all_pages: bool = False,
     ):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_output_values_get(
+                items = self._fetch_pages(
+                    api_instance.rpme_output_values_get,
                     page=page,
+                    all_pages=all_pages,
                     adm0_code=adm0_code,
                     survey_id=survey_id,
                     shop_id=shop_id,
@@ -90,76 +96,91 @@ class RpmeApi:
                     adm0_code_dots=adm0_code_dots,
                     env=env,
                 )
-                logger.info("Successfully retrieved RPME output values")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("rpme_output_values_get", items)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling RpmeApi->rpme_output_values_get: {e}"
+                    "Exception when calling RpmeApi->rpme_output_values_get: %s", e
                 )
                 raise
 
     # TODO: Get the scope and test these functions
     def get_rpme_surveys(
-        self, adm0_code=0, page: Optional[int] = 1, start_date=None, end_date=None
+        self,
+        adm0_code=0,
+        page: Optional[int] = 1,
+        start_date=None,
+        end_date=None,
+        all_pages: bool = False,
     ):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_surveys_get(
+                items = self._fetch_pages(
+                    api_instance.rpme_surveys_get,
                     adm0_code=adm0_code,
                     page=page,
+                    all_pages=all_pages,
                     start_date=start_date,
                     end_date=end_date,
                     env=env,
                 )
-                logger.info("Successfully retrieved RPME surveys")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("rpme_surveys_get", items)
                 return df
             except ApiException as e:
-                logger.error(f"Exception when calling RpmeApi->rpme_surveys_get: {e}")
+                logger.error("Exception when calling RpmeApi->rpme_surveys_get: %s", e)
                 raise
 
     # TODO: Get the scope and test these functions
-    def get_rpme_variables(self, page: Optional[int] = 1):
+    def get_rpme_variables(self, page: Optional[int] = 1, all_pages: bool = False):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_variables_get(page=page, env=env)
-                logger.info("Successfully retrieved RPME variables")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                items = self._fetch_pages(
+                    api_instance.rpme_variables_get,
+                    page=page,
+                    all_pages=all_pages,
+                    env=env,
+                )
+                df = self._to_frame("rpme_variables_get", items)
                 return df
             except ApiException as e:
-                logger.error(f"Exception when calling RpmeApi->rpme_variables_get: {e}")
+                logger.error(
+                    "Exception when calling RpmeApi->rpme_variables_get: %s", e
+                )
                 raise
 
     # TODO: Get the scope and test these functions
     def get_rpme_xls_forms(
-        self, adm0_code=0, page: Optional[int] = 1, start_date=None, end_date=None
+        self,
+        adm0_code=0,
+        page: Optional[int] = 1,
+        start_date=None,
+        end_date=None,
+        all_pages: bool = False,
     ):
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.RpmeApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.rpme_xls_forms_get(
+                items = self._fetch_pages(
+                    api_instance.rpme_xls_forms_get,
                     adm0_code=adm0_code,
                     page=page,
+                    all_pages=all_pages,
                     start_date=start_date,
                     end_date=end_date,
                     env=env,
                 )
-                logger.info("Successfully retrieved RPME XLS forms")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("rpme_xls_forms_get", items)
                 return df
             except ApiException as e:
-                logger.error(f"Exception when calling RpmeApi->rpme_xls_forms_get: {e}")
+                logger.error(
+                    "Exception when calling RpmeApi->rpme_xls_forms_get: %s", e
+                )
                 raise
@@ -3,19 +3,9 @@ from typing import Optional
 import logging
 
 import data_bridges_client
-import numpy as np
 import pandas as pd
 from data_bridges_client.rest import ApiException
 
-logname = "data_bridges_api_calls.log"
-logging.basicConfig(
-    filename=logname,
-    filemode="a",
-    format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
-
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +15,7 @@ class MfiSurveysApi:
         survey_id: Optional[int] = None,
         page: Optional[int] = 1,
         page_size: int = 20,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieve Market Functionality Index (MFI) base survey data.
@@ -36,6 +27,8 @@ class MfiSurveysApi:
                 results may include multiple surveys depending on API behavior.
             page (int, optional): Page number for paginated results. Defaults to ``1``.
             page_size (int, optional): Number of records per page. Defaults to ``20``.
+            all_pages (bool, optional): Fetch every page concurrently, ignoring
+                ``page``. Defaults to False.
 
         Returns:
             pandas.DataFrame: DataFrame containing MFI base survey data.
@@ -55,20 +48,31 @@ class MfiSurveysApi:
             env = self.env
 
             try:
-                api_response = api_instance.m_fi_surveys_base_data_get(
-                    survey_id=survey_id, page=page, page_size=page_size, env=env
+                items = self._fetch_pages(
+                    api_instance.m_fi_surveys_base_data_get,
+                    survey_id=survey_id,
+                    page=page,
+                    all_pages=all_pages,
+                    page_size=page_size,
+                    env=env,
+                )
+                return self._to_frame(
+                    "m_fi_surveys_base_data_get", items, replace_nan=False
                 )
-                logger.info("Successfully retrieved MFI surveys base data")
-                return pd.DataFrame(api_response.items)
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling SurveysApi->m_fi_surveys_base_data_get: {e}"
+                    "Exception when calling SurveysApi->m_fi_surveys_base_data_get: %s",
+                    e,
                 )
                 raise
 
     def get_mfi_surveys_full_data(
-        self, survey_id=None, page: Optional[int] = 1, page_size=20
+        self,
+        survey_id=None,
+        page: Optional[int] = 1,
+        page_size=20,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Get a full dataset that includes all the fields included in the survey in addition to the core Market Functionality Index (MFI) fields by Survey ID.
@@ -77,24 +81,32 @@ class MfiSurveysApi:
             api_instance = data_bridges_client.SurveysApi(api_client)
             env = self.env
             try:
-                api_response = api_instance.m_fi_surveys_full_data_get(
+                items = self._fetch_pages(
+                    api_instance.m_fi_surveys_full_data_get,
                     survey_id=survey_id,
                     format="json",
                     page=page,
+                    all_pages=all_pages,
                     page_size=page_size,
                     env=env,
                 )
-                logger.info("Successfully retrieved MFI surveys full data")
-                df = pd.DataFrame(api_response.items)
-                return df
+                return self._to_frame(
+                    "m_fi_surveys_full_data_get", items, replace_nan=False
+                )
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling SurveysApi->m_fi_surveys_full_data_get: {e}"
+                    "Exception when calling SurveysApi->m_fi_surveys_full_data_get: %s",
+                    e,
                 )
                 raise
 
     def get_mfi_surveys(
-        self, adm0_code=0, page: Optional[int] = 1, start_date=None, end_date=None
+        self,
+        adm0_code=0,
+        page: Optional[int] = 1,
+        start_date=None,
+        end_date=None,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Retrieve Survey IDs, their corresponding XLS Form IDs, and Base XLS Form of all MFI surveys conducted in a country.
@@ -104,20 +116,20 @@ class MfiSurveysApi:
             env = self.env
 
             try:
-                api_response = api_instance.m_fi_surveys_get(
+                items = self._fetch_pages(
+                    api_instance.m_fi_surveys_get,
                     adm0_code=adm0_code,
                     page=page,
+                    all_pages=all_pages,
                     start_date=start_date,
                     end_date=end_date,
                     env=env,
                 )
-                logger.info("Successfully retrieved MFI surveys list")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("m_fi_surveys_get", items)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling SurveysApi->m_fi_surveys_get: {e}"
+                    "Exception when calling SurveysApi->m_fi_surveys_get: %s", e
                 )
                 raise
 
@@ -132,6 +144,7 @@ class MfiSurveysApi:
         adm0_codes=None,
         market_id=None,
         survey_type=None,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         """
         Get MFI processed data in long format.
@@ -141,9 +154,11 @@ class MfiSurveysApi:
             env = self.env
 
             try:
-                api_response = api_instance.m_fi_surveys_processed_data_get(
+                items = self._fetch_pages(
+                    api_instance.m_fi_surveys_processed_data_get,
                     survey_id=survey_id,
                     page=page,
+                    all_pages=all_pages,
                     page_size=page_size,
                     format=format,
                     start_date=start_date,
@@ -153,38 +168,42 @@ class MfiSurveysApi:
                     survey_type=survey_type,
                     env=env,
                 )
-                logger.info("Successfully retrieved MFI surveys processed data")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("m_fi_surveys_processed_data_get", items)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling SurveysApi->m_fi_surveys_processed_data_get: {e}"
+                    "Exception when calling SurveysApi->m_fi_surveys_processed_data_get: %s",
+                    e,
                 )
                 raise
 
     def get_mfi_xls_forms(
-        self, adm0_code=0, page: Optional[int] = 1, start_date=None, end_date=None
+        self,
+        adm0_code=0,
+        page: Optional[int] = 1,
+        start_date=None,
+        end_date=None,
+        all_pages: bool = False,
     ) -> pd.DataFrame:
         with data_bridges_client.ApiClient(self.configuration) as api_client:
             api_instance = data_bridges_client.XlsFormsApi(api_client)
             env = self.env
 
             try:
-                api_response = api_instance.m_fi_xls_forms_get(
+                items = self._fetch_pages(
+                    api_instance.m_fi_xls_forms_get,
                     adm0_code=adm0_code,
                     page=page,
+                    all_pages=all_pages,
                     start_date=start_date,
                     end_date=end_date,
                     env=env,
                 )
-                logger.info("Successfully retrieved MFI XLS forms")
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("m_fi_xls_forms_get", items)
                 return df
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling XlsFormsApi->m_fi_xls_forms_get: {e}"
+                    "Exception when calling XlsFormsApi->m_fi_xls_forms_get: %s", e
                 )
                 raise
 
@@ -219,18 +238,17 @@ class MfiSurveysApi:
             env = self.env
 
             try:
-                api_response = api_instance.m_fi_xls_forms_get(
+                api_response = self._call_api(
+                    api_instance.m_fi_xls_forms_get,
                     adm0_code=adm0_code,
                     page=page,
                     start_date=start_date,
                     end_date=end_date,
                     env=env,
                 )
-                logger.info("Successfully retrieved detailed MFI XLS forms")
 
                 # Convert response items to DataFrame
-                df = pd.DataFrame([item.to_dict() for item in api_response.items])
-                df = df.replace({np.nan: None})
+                df = self._to_frame("m_fi_xls_forms_get", api_response.items)
 
                 # Add total items count as DataFrame attribute
                 df.total_items = api_response.total_items
@@ -239,6 +257,6 @@ class MfiSurveysApi:
 
             except ApiException as e:
                 logger.error(
-                    f"Exception when calling XlsFormsApi->m_fi_xls_forms_get: {e}"
+                    "Exception when calling XlsFormsApi->m_fi_xls_forms_get: %s", e
                 )
                 raise
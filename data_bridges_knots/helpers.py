@@ -1,10 +1,16 @@
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import json
-from pathlib import Path
+import re
+from functools import partial
 
-# Cache return value from _load_country_codes() into global variable
-codes_mapping = None
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.countries import get_country_registry
+
+# Strings starting like an ISO 8601 date are parsed as dates by compact_frame
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
 
 
 def _load_country_codes() -> Dict[str, int]:
@@ -18,23 +24,7 @@ def _load_country_codes() -> Dict[str, int]:
         >>> isinstance(codes, dict)
         True
     """
-    global codes_mapping
-    if codes_mapping is None:
-        try:
-            json_path = Path(__file__).parent / "country_list.json"
-            with open(json_path, "r", encoding="utf-8") as f:
-                country_list = json.load(f)
-
-            codes_mapping = {
-                country["iso3Alpha3"]: country["adm0Code"]
-                for country in country_list
-                if country.get("adm0Code") is not None
-                and country.get("iso3Alpha3") is not None
-            }
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Country list file not found at {json_path}")
-
-    return codes_mapping
+    return get_country_registry().mapping("iso3", "adm0")
 
 
 def get_adm0_code(country_iso3: str) -> Optional[int]:
@@ -57,5 +47,297 @@ def get_adm0_code(country_iso3: str) -> Optional[int]:
     if not isinstance(country_iso3, str):
         raise TypeError("iso3 must be a string")
 
-    codes = _load_country_codes()
-    return codes.get(country_iso3.upper())
+    return get_country_registry().get(country_iso3, "iso3", "adm0")
+
+
+def get_frame_countries(df: pd.DataFrame, column: str = "countryISO3") -> List[str]:
+    """Return the distinct ISO3 codes of a frame returned by the API.
+
+    Args:
+        df (pandas.DataFrame): Frame with a country column, e.g. from ``get_prices``
+        column (str, optional): ISO3 column. Defaults to "countryISO3".
+
+    Returns:
+        List[str]: Upper-case ISO3 codes in order of appearance, empty when the
+            column is missing
+    """
+    if column not in df:
+        return []
+    return list(df[column].dropna().astype(str).str.upper().unique())
+
+
+def _compact_column(column: pd.Series, category_ratio: float) -> pd.Series:
+    kind = pd.api.types.infer_dtype(column, skipna=True)
+    if kind == "integer":
+        integers = column.astype("Int64")
+        info = np.iinfo(np.int32)
+        if integers.isna().all() or (
+            info.min <= integers.min() and integers.max() <= info.max
+        ):
+            return integers.astype("Int32")
+        return integers
+    if kind in ("floating", "mixed-integer-float", "decimal"):
+        return pd.to_numeric(column, errors="coerce").astype("float64")
+    if kind == "boolean":
+        return column.astype("boolean")
+    if kind in ("datetime", "datetime64", "date"):
+        dates = pd.to_datetime(column, errors="coerce")
+        # Mixed time zones cannot share one column
+        return dates if dates.dtype != object else column
+    if kind != "string":
+        return column
+
+    codes, uniques = pd.factorize(column, sort=True)
+    if len(uniques) and _ISO_DATE.match(uniques[0]):
+        dates = pd.to_datetime(column, errors="coerce", format="ISO8601")
+        if dates.dtype != object and dates.notna().sum() == (codes >= 0).sum():
+            return dates
+    if len(uniques) <= category_ratio * len(column):
+        return pd.Series(
+            pd.Categorical.from_codes(codes, uniques),
+            index=column.index,
+            name=column.name,
+        )
+    # "string" rather than "str", which on pandas 2 turns None into "None"
+    return column.astype("string")
+
+
+def compact_frame(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """Return a copy of an API frame with compact, typed columns.
+
+    Frames built from API responses hold IDs, flags and dates as Python objects,
+    and the same names once per row. This converts object, string and nullable
+    ``Int64`` columns by the values they hold:
+
+    - integers to nullable ``Int32``, or ``Int64`` when out of range;
+    - other numbers to ``float64``, missing values as NaN;
+    - booleans to nullable ``boolean``;
+    - dates and ISO 8601 date strings to ``datetime64``;
+    - strings with at most ``category_ratio`` distinct values per row to
+      ``category``, other strings to nullable ``string``.
+
+    Missing values become ``<NA>``, ``NaN`` or ``NaT`` instead of None. Columns
+    already typed, and columns of mixed or nested values, are kept as they are.
+
+    Args:
+        df (pandas.DataFrame): Frame to convert, e.g. from ``get_prices``
+        category_ratio (float, optional): Highest ratio of distinct values to rows
+            for a string column to become categorical. Defaults to 0.5.
+
+    Returns:
+        pandas.DataFrame: Converted copy of ``df``
+
+    Examples:
+        >>> df = compact_frame(client.get_prices("KEN", "2020-01-01"))
+        >>> df["commodityName"].dtype
+        CategoricalDtype(...)
+    """
+    df = df.copy()
+    for name, column in df.items():
+        if (
+            column.dtype == object
+            or column.dtype == "Int64"
+            or pd.api.types.is_string_dtype(column.dtype)
+        ):
+            df[name] = _compact_column(column, category_ratio)
+    return df
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "Arrow output requires pyarrow. Install it with "
+            "pip install 'data-bridges-knots[arrow]'"
+        ) from e
+    return pa
+
+
+def is_arrow_table(df) -> bool:
+    """Return True if ``df`` is a pyarrow Table, without importing pyarrow."""
+    return (
+        type(df).__module__.split(".")[0] == "pyarrow" and type(df).__name__ == "Table"
+    )
+
+
+# Field metadata key marking a column of JSON-encoded values
+JSON_FIELD_KEY = b"data_bridges_knots.json"
+
+
+def records_to_arrow(records: List[dict], mixed: str = "text"):
+    """Build a pyarrow Table from API records, one column per key.
+
+    Column types are inferred by Arrow, with None and NaN stored as nulls.
+    Columns mixing incompatible values, e.g. numbers and text, are stored as
+    strings.
+
+    Args:
+        records (List[dict]): Records, e.g. ``to_dict()`` of response items
+        mixed (str, optional): How mixed columns are stored: "text", the string
+            of each value, or "json", the JSON encoding of each value with the
+            field marked by ``JSON_FIELD_KEY``, so that
+            :func:`json_column_values` restores numbers, text and nested values.
+            Defaults to "text".
+
+    Returns:
+        pyarrow.Table: Table with the keys of all records as columns, in order of
+            first appearance
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    pa = _import_pyarrow()
+    keys = dict.fromkeys(key for record in records for key in record)
+    arrays, fields = [], []
+    for key in keys:
+        array, encoded = _arrow_array([record.get(key) for record in records], mixed)
+        metadata = {JSON_FIELD_KEY: b"1"} if encoded and mixed == "json" else None
+        arrays.append(array)
+        fields.append(pa.field(key, array.type, metadata=metadata))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _is_missing(value: Any) -> bool:
+    """True for None, NaN, NaT and pd.NA; False for lists and other containers."""
+    return pd.api.types.is_scalar(value) and pd.isna(value)
+
+
+def _arrow_array(values: list, mixed: str = "text"):
+    """Arrow array of ``values``, and whether they were encoded as strings."""
+    pa = _import_pyarrow()
+    try:
+        return pa.array(values, from_pandas=True), False
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        encode = partial(json.dumps, default=str) if mixed == "json" else str
+        strings = [None if _is_missing(v) else encode(v) for v in values]
+        return pa.array(strings, pa.string()), True
+
+
+def json_columns(table) -> List[str]:
+    """Return the columns of ``table`` stored with ``mixed="json"``."""
+    return [
+        field.name for field in table.schema if JSON_FIELD_KEY in (field.metadata or {})
+    ]
+
+
+def json_column_values(table, name: str) -> list:
+    """Return the decoded values of a column stored with ``mixed="json"``."""
+    return [
+        None if value is None else json.loads(value)
+        for value in table.column(name).to_pylist()
+    ]
+
+
+def json_columns_as_text(table):
+    """Replace the JSON columns of ``table`` by the strings that
+    ``records_to_arrow(records)`` would have stored for them."""
+    for name in json_columns(table):
+        array, _ = _arrow_array(json_column_values(table, name))
+        table = table.set_column(table.schema.get_field_index(name), name, array)
+    return table
+
+
+def _import_polars():
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "The polars backend requires polars. Install it with "
+            "pip install 'data-bridges-knots[polars]'"
+        ) from e
+    return pl
+
+
+def is_polars_frame(df) -> bool:
+    """Return True if ``df`` is a polars DataFrame, without importing polars."""
+    return type(df).__module__.split(".")[0] == "polars"
+
+
+def records_to_polars(records: List[dict]):
+    """Build a polars DataFrame from API records, one column per key.
+
+    Column types are inferred from all records. Columns mixing incompatible
+    values, e.g. numbers and lists, are stored as strings.
+
+    Args:
+        records (List[dict]): Records, e.g. ``to_dict()`` of response items
+
+    Returns:
+        polars.DataFrame: Frame with the keys of all records as columns
+
+    Raises:
+        ImportError: If polars is not installed
+    """
+    pl = _import_polars()
+    if not records:
+        return pl.DataFrame()
+    try:
+        return pl.from_dicts(records, infer_schema_length=None)
+    except (pl.exceptions.PolarsError, TypeError, ValueError):
+        pass
+
+    keys = dict.fromkeys(key for record in records for key in record)
+    columns = []
+    for key in keys:
+        values = [record.get(key) for record in records]
+        try:
+            columns.append(pl.Series(key, values))
+        except (pl.exceptions.PolarsError, TypeError, ValueError):
+            strings = [None if v is None else str(v) for v in values]
+            columns.append(pl.Series(key, strings, dtype=pl.String))
+    return pl.DataFrame(columns)
+
+
+def to_pandas_frame(df) -> pd.DataFrame:
+    """Return ``df`` as a pandas DataFrame, converting polars frames and Arrow
+    tables."""
+    return df.to_pandas() if is_polars_frame(df) or is_arrow_table(df) else df
+
+
+def to_polars_frame(df):
+    """Return ``df`` as a polars DataFrame, converting pandas frames.
+
+    Raises:
+        ImportError: If polars is not installed
+    """
+    return df if is_polars_frame(df) else _import_polars().from_pandas(df)
+
+
+def to_arrow_table(df):
+    """Return ``df`` as a pyarrow Table.
+
+    polars frames share their buffers with the table. pandas frames are
+    converted without their index, with columns mixing incompatible values,
+    e.g. labels and unlabelled codes, stored as strings.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if is_arrow_table(df):
+        return df
+    if is_polars_frame(df):
+        return df.to_arrow()
+    pa = _import_pyarrow()
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.table({name: _arrow_array(df[name].tolist())[0] for name in df})
+
+
+def frame_library(df) -> str:
+    """Return the library of a frame: "pandas", "polars" or "arrow"."""
+    if is_polars_frame(df):
+        return "polars"
+    if is_arrow_table(df):
+        return "arrow"
+    return "pandas"
+
+
+def to_frame_library(df: pd.DataFrame, library: str):
+    """Convert a pandas DataFrame to the library given by :func:`frame_library`."""
+    if library == "polars":
+        return to_polars_frame(df)
+    if library == "arrow":
+        return to_arrow_table(df)
+    return df
@@ -0,0 +1,85 @@
+from typing import Optional, Union
+
+import logging
+from pathlib import Path
+
+from data_bridges_knots.helpers import _import_pyarrow, to_arrow_table
+
+logger = logging.getLogger(__name__)
+
+# Buffer compressions of the Arrow IPC format; None keeps files memory-mappable
+COMPRESSIONS = (None, "lz4", "zstd")
+
+
+def write_ipc(
+    data,
+    path: Union[str, Path],
+    compression: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> None:
+    """Write a table to an Arrow IPC file (Feather version 2).
+
+    Arrow tables, e.g. from a client with ``backend="arrow"``, and polars frames
+    are written from their own buffers; pandas frames are converted first.
+    Uncompressed files can be memory-mapped by any Arrow implementation, e.g.
+    :func:`read_ipc` or R's ``arrow::read_ipc_file(path, mmap = TRUE)``, so the
+    columns are read without a copy and pages are loaded only when accessed.
+
+    Args:
+        data (pyarrow.Table | polars.DataFrame | pandas.DataFrame): Table to write
+        path (str | Path): Output file, e.g. ``survey.arrow`` or ``survey.feather``
+        compression (str, optional): "lz4" or "zstd" for smaller files that must
+            be decompressed into memory when read. Defaults to None.
+        chunk_size (int, optional): Maximum rows per record batch. Defaults to
+            None, the batches of the table.
+
+    Raises:
+        ValueError: If compression is not one of ``COMPRESSIONS``
+        ImportError: If pyarrow is not installed
+
+    Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml", backend="arrow")
+        >>> write_ipc(client.get_household_survey(3094, "official"), "survey.arrow")
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"compression must be one of {COMPRESSIONS}, got {compression!r}"
+        )
+    pa = _import_pyarrow()
+    table = to_arrow_table(data)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(str(path), table.schema, options=options) as writer:
+        writer.write_table(table, max_chunksize=chunk_size)
+    logger.debug(
+        "Wrote %d rows and %d columns to %s", table.num_rows, table.num_columns, path
+    )
+
+
+def read_ipc(path: Union[str, Path], memory_map: bool = True):
+    """Read an Arrow IPC (Feather version 2) file into a pyarrow Table.
+
+    With ``memory_map``, the columns of an uncompressed file point into the
+    mapped file instead of being read into memory, so opening a file of any size
+    is immediate and the operating system loads pages as they are used.
+    Compressed buffers are always decompressed into memory.
+
+    Args:
+        path (str | Path): File written by :func:`write_ipc` or any Arrow library
+        memory_map (bool, optional): Map the file instead of reading it.
+            Defaults to True.
+
+    Returns:
+        pyarrow.Table: Table of the file
+
+    Raises:
+        ImportError: If pyarrow is not installed
+
+    Examples:
+        >>> survey = read_ipc("survey.arrow")
+        >>> survey.to_pandas(types_mapper=pd.ArrowDtype)
+    """
+    pa = _import_pyarrow()
+    source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    # The table's buffers keep the mapping alive after the file is closed
+    with source:
+        return pa.ipc.open_file(source).read_all()
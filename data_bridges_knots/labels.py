@@ -5,6 +5,14 @@ import json
 
 import pandas as pd
 
+from data_bridges_knots.helpers import (
+    _import_polars,
+    _is_missing,
+    is_arrow_table,
+    is_polars_frame,
+    to_arrow_table,
+)
+
 
 def to_dict(x):
     if isinstance(x, str):
@@ -22,11 +30,12 @@ def get_variable_labels(
     Build a mapping between variable name and variable labels from a DataBridges XLSForm and return it in
     the desired format.
 
-    Empty labels default to the corresponding name. For duplicate names, the
-    latest occurrence overrides earlier values.
+    Empty and missing labels default to the corresponding name. For duplicate
+    names, the latest occurrence overrides earlier values.
 
     Args:
-        xlsform_df (pandas.DataFrame): DataFrame with at least ``"name"`` and ``"label"`` columns.
+        xlsform_df (pandas.DataFrame | polars.DataFrame): DataFrame with at least ``"name"`` and ``"label"`` columns.
+            A polars frame is processed with polars expressions.
         format (str, optional): Output format. Defaults to ``"dict"``.
 
             One of:
@@ -51,11 +60,14 @@ def get_variable_labels(
         0      n1    L1
         1      n2    L2
     """
+    if is_polars_frame(xlsform_df):
+        return _get_variable_labels_polars(xlsform_df, format)
+
     labels_dict = {}
 
     for _, row in xlsform_df.iterrows():
         name = str(row["name"])
-        label = str(row["label"])
+        label = "" if _is_missing(row["label"]) else str(row["label"])
         if name in labels_dict and len(name) > 0:
             labels_dict[name] = label
         elif label == "":
@@ -79,8 +91,9 @@ def get_choice_labels(
     and return it as a dictionary, JSON string, or DataFrame.
 
     Args:
-        xlsform_df (pandas.DataFrame): Input DataFrame containing at least the columns
-            ``"name"`` and ``"choiceList"``.
+        xlsform_df (pandas.DataFrame | polars.DataFrame): Input DataFrame containing at least the columns
+            ``"name"`` and ``"choiceList"``. With a polars frame, ``format="df"``
+            returns a polars frame.
         format (str, optional): Output format. Defaults to ``"dict"``.
 
             One of:
@@ -110,6 +123,8 @@ def get_choice_labels(
         >>> print(get_choice_labels(df, format="json"))
         >>> get_choice_labels(df, format="df")
     """
+    if is_polars_frame(xlsform_df):
+        return _get_choice_labels_polars(xlsform_df, format)
 
     def cast_to_dict_or_nan(x):
         if isinstance(x, dict):
@@ -157,8 +172,12 @@ def map_value_labels(survey_df: pd.DataFrame, xlsform_df: pd.DataFrame) -> pd.Da
 
 
     Args:
-      survey_df (pandas.DataFrame): The survey data with coded values.
-      xlsform_df (pandas.DataFrame): DataFrame containing ``"name"`` and
+      survey_df (pandas.DataFrame | polars.DataFrame): The survey data with coded values.
+        A polars frame is labelled with polars expressions, matching codes on
+        their string form like :meth:`LabelBundle.map_value_labels`; labelled
+        columns become strings. A pyarrow Table is labelled through pandas and
+        returned as a Table.
+      xlsform_df (pandas.DataFrame | polars.DataFrame): DataFrame containing ``"name"`` and
         ``"choiceList"``. Each ``choiceList`` entry includes a ``"choices"`` list
         of dicts with keys ``"name"`` (code) and ``"label"`` (display text).
 
@@ -180,10 +199,15 @@ def map_value_labels(survey_df: pd.DataFrame, xlsform_df: pd.DataFrame) -> pd.Da
       >>> map_value_labels(survey, xls)
 
     Returns:
-      pandas.DataFrame: A copy of ``survey_df`` where columns present in the
-      XLSForm mapping have codes replaced by labels.
+      pandas.DataFrame | polars.DataFrame | pyarrow.Table: A copy of ``survey_df``
+      where columns present in the XLSForm mapping have codes replaced by labels.
     """
 
+    if is_polars_frame(survey_df):
+        return _map_value_labels_polars(survey_df, xlsform_df)
+    if is_arrow_table(survey_df):
+        return to_arrow_table(map_value_labels(survey_df.to_pandas(), xlsform_df))
+
     survey_data = survey_df.convert_dtypes()
     choiceList = pd.json_normalize(xlsform_df["choiceList"])
     choiceList = choiceList.rename(columns={"name": "choice_name"})
@@ -211,6 +235,101 @@ def map_value_labels(survey_df: pd.DataFrame, xlsform_df: pd.DataFrame) -> pd.Da
     return survey_data_value_labels
 
 
+def _labels_output(mapping: dict, format: str, columns, pl):
+    if format == "json":
+        return json.dumps(mapping, indent=4)
+    if format == "df":
+        names, values = list(mapping), list(mapping.values())
+        if values and isinstance(values[0], dict):
+            values = pl.Series(columns[1], values, dtype=pl.Object)
+        return pl.DataFrame({columns[0]: names, columns[1]: values})
+    return mapping
+
+
+def _get_variable_labels_polars(xlsform_df, format: str):
+    """Polars version of :func:`get_variable_labels`."""
+    pl = _import_polars()
+    name = pl.col("name")
+    label = pl.col("label")
+    labels = (
+        xlsform_df.select(
+            name.cast(pl.String).fill_null("None"),
+            label.cast(pl.String).fill_null(""),
+        )
+        .with_columns(
+            # Repeated names take their latest label, even when empty
+            value=pl.when(~name.is_first_distinct() & (name != ""))
+            .then(label)
+            .when(label == "")
+            .then(name)
+            .otherwise(label)
+        )
+        .group_by("name", maintain_order=True)
+        .agg(pl.col("value").last())
+    )
+    mapping = dict(zip(labels["name"].to_list(), labels["value"].to_list()))
+    return _labels_output(mapping, format, ("colName", "label"), pl)
+
+
+def _choice_rows(xlsform_df, pl):
+    """One row per choice: question ``name``, choice ``value`` and ``label``."""
+    choice_list = xlsform_df["choiceList"]
+    if choice_list.dtype == pl.String or choice_list.dtype == pl.Object:
+        parsed = [to_dict(x) for x in choice_list.to_list()]
+        parsed = [x if isinstance(x, dict) else None for x in parsed]
+        choice_list = pl.Series("choiceList", parsed, strict=False)
+    if not isinstance(choice_list.dtype, pl.Struct) or "choices" not in [
+        field.name for field in choice_list.dtype.fields
+    ]:
+        return pl.DataFrame(
+            schema={"name": pl.String, "value": pl.String, "label": pl.String}
+        )
+    choices = pl.col("choices")
+    return (
+        pl.DataFrame(
+            [xlsform_df["name"], choice_list.struct.field("choices").alias("choices")]
+        )
+        .drop_nulls()
+        .explode("choices")
+        .drop_nulls("choices")
+        .select(
+            "name",
+            choices.struct.field("name").alias("value"),
+            choices.struct.field("label").alias("label"),
+        )
+    )
+
+
+def _choice_mapping(choices) -> dict:
+    categories_dict = {}
+    for name, value, label in choices.iter_rows():
+        categories_dict.setdefault(name, {})[value] = label
+    return categories_dict
+
+
+def _get_choice_labels_polars(xlsform_df, format: str):
+    """Polars version of :func:`get_choice_labels`."""
+    pl = _import_polars()
+    mapping = _choice_mapping(_choice_rows(xlsform_df, pl))
+    return _labels_output(mapping, format, ("name", "choiceLabels"), pl)
+
+
+def _map_value_labels_polars(survey_df, xlsform_df):
+    """Polars version of :func:`map_value_labels`."""
+    pl = _import_polars()
+    if is_polars_frame(xlsform_df):
+        categories_dict = _get_choice_labels_polars(xlsform_df, "dict")
+    else:
+        categories_dict = get_choice_labels(xlsform_df.copy(), "dict")
+    return survey_df.with_columns(
+        pl.col(col)
+        .cast(pl.String)
+        .replace({str(code): label for code, label in categories_dict[col].items()})
+        for col in survey_df.columns
+        if col in categories_dict
+    )
+
+
 def as_numeric(df, col_list):
     for col in col_list:
         try:
@@ -1,50 +1,355 @@
-import stata_setup
+from typing import Dict, Hashable, List, Mapping, NamedTuple, Optional, Tuple, Union
 
+import re
+from pathlib import Path
 
-def load_stata(df, stata_path="C:/Program Files/Stata18", stata_version="se"):
-    stata_setup.config(stata_path, stata_version)
-    from sfi import Data
-    from sfi import Datetime as dt
-    from sfi import SFIToolkit
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.labels import get_choice_labels, get_variable_labels
+
+# Stata limits for .dta format 118/119
+STATA_MAX_NAME_LENGTH = 32
+STATA_MAX_LABEL_LENGTH = 80
+STATA_MAX_STR_LENGTH = 2045
+
+_INVALID_NAME_CHARS = re.compile(r"[^A-Za-z0-9_]")
+
+
+def _stata_varnames(columns) -> Dict[Hashable, str]:
+    """Map column names to unique, valid Stata variable names."""
+    names: Dict[Hashable, str] = {}
+    used = set()
+    for col in columns:
+        name = _INVALID_NAME_CHARS.sub("_", str(col)) or "_"
+        if name[0].isdigit():
+            name = f"_{name}"
+        name = name[:STATA_MAX_NAME_LENGTH]
+        candidate, i = name, 1
+        while candidate in used:
+            suffix = f"_{i}"
+            candidate = name[: STATA_MAX_NAME_LENGTH - len(suffix)] + suffix
+            i += 1
+        used.add(candidate)
+        names[col] = candidate
+    return names
+
+
+def _encode_choices(
+    series: pd.Series, choices: Mapping[str, str]
+) -> Optional[Tuple[pd.Series, Dict[int, str]]]:
+    """Encode a coded column as integers with Stata value labels.
+
+    Numeric choice codes are kept as they are. Other codes are replaced by their
+    1-based position in the choice list. Returns None if some non-missing values
+    are not choice codes, in which case the column is written unlabelled.
+    """
+    codes = [str(code) for code in choices]
+    labels = [str(label)[:32000] for label in choices.values()]
+
+    numeric_codes = pd.to_numeric(pd.Series(codes), errors="coerce")
+    if numeric_codes.notna().all() and (numeric_codes % 1 == 0).all():
+        values = pd.to_numeric(series, errors="coerce")
+        if values[series.notna()].isna().any() or (values.dropna() % 1 != 0).any():
+            return None
+        value_labels = dict(zip(numeric_codes.astype("int64").tolist(), labels))
+        return values, value_labels
+
+    positions = pd.Index(codes).get_indexer(series.astype("string"))
+    present = series.notna().to_numpy()
+    if (positions[present] < 0).any():
+        return None
+    values = pd.Series(
+        np.where(present, positions + 1, np.nan), index=series.index, dtype="float64"
+    )
+    return values, dict(zip(range(1, len(codes) + 1), labels))
+
+
+def _prepare_dta_frame(
+    df: pd.DataFrame, value_labels: Mapping[Hashable, Mapping]
+) -> Tuple[pd.DataFrame, Dict[Hashable, str], Dict[Hashable, Dict], list]:
+    """Convert a DataFrame to column types ``DataFrame.to_stata`` can write."""
+    columns: Dict[Hashable, pd.Series] = {}
+    convert_dates: Dict[Hashable, str] = {}
+    labels: Dict[Hashable, Dict] = {}
+    strl = []
+
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if col in value_labels and value_labels[col]:
+            encoded = _encode_choices(series, value_labels[col])
+            if encoded is not None:
+                columns[col], labels[col] = encoded
+                continue
+
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_localize(None)
+            dtype = series.dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            has_time = (series.dropna() != series.dropna().dt.normalize()).any()
+            convert_dates[col] = "tc" if has_time else "td"
+        elif pd.api.types.is_bool_dtype(dtype):
+            series = series.astype("float64" if series.isna().any() else "int8")
+        elif pd.api.types.is_numeric_dtype(dtype):
+            if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+                series = series.astype("float64")
+        else:
+            series = series.astype("string").fillna("").astype(object)
+            if series.str.len().max() > STATA_MAX_STR_LENGTH:
+                strl.append(col)
+        columns[col] = series
+
+    return pd.DataFrame(columns, index=df.index), convert_dates, labels, strl
+
+
+def write_dta(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    xlsform_df: Optional[pd.DataFrame] = None,
+    variable_labels: Optional[Mapping[Hashable, str]] = None,
+    value_labels: Optional[Mapping[Hashable, Mapping]] = None,
+    data_label: Optional[str] = None,
+    version: Optional[int] = None,
+) -> Path:
+    """
+    Write a DataFrame to a Stata ``.dta`` file with variable and value labels.
+
+    The file is written directly by pandas, so Stata does not need to be installed.
+    When ``xlsform_df`` is given, variable labels come from
+    :func:`~data_bridges_knots.labels.get_variable_labels` and value labels from
+    :func:`~data_bridges_knots.labels.get_choice_labels`. Explicit
+    ``variable_labels`` and ``value_labels`` take precedence over the XLSForm.
+
+    Coded columns with numeric choice codes keep their codes; columns with text
+    codes are stored as integers 1..n in choice-list order. Columns containing
+    values that are not choice codes are written unlabelled. Column names are made
+    valid Stata names and labels are truncated to 80 characters.
+
+    Args:
+        df (pandas.DataFrame): Survey data to export
+        path (str | Path): Destination ``.dta`` file
+        xlsform_df (pandas.DataFrame, optional): Questionnaire with ``"name"``,
+            ``"label"`` and ``"choiceList"`` columns
+        variable_labels (dict, optional): Column name to variable label
+        value_labels (dict, optional): Column name to ``{code: label}`` mapping
+        data_label (str, optional): Dataset label stored in the file
+        version (int, optional): ``.dta`` format version. Defaults to None, which
+            writes format 118 (or 119 for more than 32,767 variables).
+
+    Returns:
+        Path: The written file
+
+    Examples:
+        >>> survey = client.get_household_survey(3094, "official")
+        >>> questionnaire = client.get_household_questionnaire(2075)
+        >>> write_dta(survey, "survey_3094.dta", xlsform_df=questionnaire)
+    """
+    var_labels: Dict[Hashable, str] = {}
+    val_labels: Dict[Hashable, Mapping] = {}
+    if xlsform_df is not None:
+        var_labels.update(get_variable_labels(xlsform_df, format="dict"))
+        val_labels.update(get_choice_labels(xlsform_df.copy(), format="dict"))
+    var_labels.update(variable_labels or {})
+    val_labels.update(value_labels or {})
+
+    data, convert_dates, labels, strl = _prepare_dta_frame(df, val_labels)
+
+    names = _stata_varnames(data.columns)
+    data.columns = [names[col] for col in data.columns]
 
+    path = Path(path)
+    data.to_stata(
+        path,
+        write_index=False,
+        convert_dates={names[col]: fmt for col, fmt in convert_dates.items()},
+        variable_labels={
+            names[col]: str(label)[:STATA_MAX_LABEL_LENGTH]
+            for col, label in var_labels.items()
+            if col in names
+        },
+        value_labels={names[col]: value for col, value in labels.items()},
+        convert_strl=[names[col] for col in strl],
+        data_label=data_label[:STATA_MAX_LABEL_LENGTH] if data_label else None,
+        version=version,
+    )
+    return path
+
+
+# Stata storage types and the integer ranges they can hold without overflow
+_STATA_INT_TYPES = (
+    ("byte", -127, 100),
+    ("int", -32767, 32740),
+    ("long", -2147483647, 2147483620),
+)
+_STATA_EPOCH_NS = np.datetime64("1960-01-01", "ns").astype("int64")
+_NS_PER_DAY = 86_400 * 10**9
+_NS_PER_MS = 10**6
+
+
+class StataColumn(NamedTuple):
+    """A DataFrame column converted for transfer to Stata.
+
+    ``values`` is a float64 array for numeric storage types and an object array of
+    str for ``"str"``/``"strL"``. Missing numeric values are NaN.
+    """
+
+    name: Hashable
+    storage: str
+    values: np.ndarray
+    str_length: int = 0
+    format: Optional[str] = None
+    value_labels: Optional[Dict[int, str]] = None
+
+
+def _integer_storage(values: np.ndarray) -> str:
+    finite = values[~np.isnan(values)]
+    if finite.size == 0:
+        return "byte"
+    lo, hi = finite.min(), finite.max()
+    for storage, min_value, max_value in _STATA_INT_TYPES:
+        if lo >= min_value and hi <= max_value:
+            return storage
+    return "double"
+
+
+def prepare_stata_columns(df: pd.DataFrame) -> List[StataColumn]:
+    """
+    Convert every column of ``df`` to a Stata storage type and a bulk value array.
+
+    Conversions are vectorized: datetimes become Stata day numbers (``%td``) or
+    milliseconds (``%tc``) through NumPy arithmetic, categoricals become labelled
+    integer codes, integers get the smallest Stata type that holds their range, and
+    strings are sized from their longest UTF-8 encoded value (``strL`` beyond 2045
+    bytes).
+
+    Args:
+        df (pandas.DataFrame): Data to convert
+
+    Returns:
+        list[StataColumn]: One converted column per column of ``df``
+    """
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        dtype = series.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy().astype("float64") + 1
+            codes[codes == 0] = np.nan
+            labels = {
+                i: str(label)[:32000]
+                for i, label in enumerate(series.cat.categories, start=1)
+            }
+            columns.append(
+                StataColumn(name, _integer_storage(codes), codes, value_labels=labels)
+            )
+            continue
+
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_localize(None)
+            dtype = series.dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            ns = series.to_numpy(dtype="datetime64[ns]").astype("int64")
+            missing = series.isna().to_numpy()
+            offset = ns - _STATA_EPOCH_NS
+            if (offset[~missing] % _NS_PER_DAY).any():
+                values, storage, fmt = offset / _NS_PER_MS, "double", "%tc"
+            else:
+                values, storage, fmt = offset // _NS_PER_DAY, "long", "%tdCCYY-NN-DD"
+            values = values.astype("float64")
+            values[missing] = np.nan
+            columns.append(StataColumn(name, storage, values, format=fmt))
+        elif pd.api.types.is_bool_dtype(dtype):
+            values = series.astype("float64").to_numpy()
+            columns.append(StataColumn(name, "byte", values))
+        elif pd.api.types.is_integer_dtype(dtype):
+            values = series.astype("float64").to_numpy()
+            columns.append(StataColumn(name, _integer_storage(values), values))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            storage = "float" if dtype == np.float32 else "double"
+            values = series.astype("float64").to_numpy()
+            columns.append(StataColumn(name, storage, values))
+        else:
+            strings = series.astype("string").fillna("")
+            length = int(strings.str.encode("utf-8").str.len().max() or 0)
+            storage = "strL" if length > STATA_MAX_STR_LENGTH else "str"
+            values = strings.to_numpy(dtype=object)
+            columns.append(
+                StataColumn(name, storage, values, str_length=max(length, 1))
+            )
+    return columns
+
+
+def load_stata(
+    df,
+    stata_path="C:/Program Files/Stata18",
+    stata_version="se",
+    variable_labels=None,
+    batch_size=64,
+):
     """
-    Loads a Pandas DataFrame into a Stata data file format.
+    Loads a Pandas DataFrame into the running Stata session through pystata.
+
+    Columns are converted in bulk by :func:`prepare_stata_columns` and stored in
+    batches of ``batch_size`` variables. To write a ``.dta`` file without Stata,
+    use :func:`write_dta`.
 
     Args:
-        df (pandas.DataFrame): The DataFrame to be loaded into Stata format.
+        df (pandas.DataFrame): The DataFrame to be loaded into Stata.
+        stata_path (str, optional): Stata installation directory.
+        stata_version (str, optional): Stata edition ("be", "se" or "mp").
+        variable_labels (dict, optional): Column name to variable label.
+        batch_size (int, optional): Number of variables stored per call. Defaults
+            to 64.
 
     Returns:
         pandas.DataFrame: The original DataFrame.
     """
-    colnames = df.columns
+    import stata_setup
+
+    stata_setup.config(stata_path, stata_version)
+    from sfi import Data, Missing, SFIToolkit, ValueLabel
+
+    variable_labels = variable_labels or {}
+    missing = Missing.getValue()
+    columns = prepare_stata_columns(df)
     Data.setObsTotal(len(df))
-    for i in range(len(colnames)):
-        dtype = df.dtypes[i].name
+
+    numeric, strings = [], []
+    for column in columns:
         # make a valid Stata variable name
-        varname = SFIToolkit.makeVarName(colnames[i], retainCase=True)
-        # varname = colnames[i]
-        varval = df.iloc[:, i].values.tolist()  # Use .iloc to access values by position
-        if dtype == "int64":
-            Data.addVarInt(varname)
-            Data.store(varname, None, varval)
-        elif dtype == "float64":
-            Data.addVarDouble(varname)
-            Data.store(varname, None, varval)
-        elif dtype == "bool":
-            Data.addVarByte(varname)
-            Data.store(varname, None, varval)
-        elif dtype == "datetime64[ns]":
-            Data.addVarFloat(varname)
-            price_dt_py = [
-                dt.getSIF(j, "%tdCCYY-NN-DD") for j in df.iloc[:, i]
-            ]  # Use .iloc
-            Data.store(varname, None, price_dt_py)
-            Data.setVarFormat(varname, "%tdCCYY-NN-DD")
+        varname = SFIToolkit.makeVarName(str(column.name), retainCase=True)
+        if column.storage == "strL":
+            Data.addVarStrL(varname)
+        elif column.storage == "str":
+            Data.addVarStr(varname, column.str_length)
         else:
-            # all other types store as a string
-            Data.addVarStr(varname, 1)
-            s = [str(i) for i in varval]
-            Data.store(varname, None, s)
+            getattr(Data, f"addVar{column.storage.capitalize()}")(varname)
+
+        if column.format:
+            Data.setVarFormat(varname, column.format)
+        if column.name in variable_labels:
+            Data.setVarLabel(varname, str(variable_labels[column.name])[:80])
+        if column.value_labels:
+            ValueLabel.createLabel(varname)
+            for value, label in column.value_labels.items():
+                ValueLabel.setLabelValue(varname, value, label)
+            ValueLabel.setVarValueLabel(varname, varname)
+
+        if column.storage in ("str", "strL"):
+            strings.append((varname, column.values))
+        else:
+            values = np.where(np.isnan(column.values), missing, column.values)
+            numeric.append((varname, values))
+
+    for batch_columns in (numeric, strings):
+        for start in range(0, len(batch_columns), batch_size):
+            batch = batch_columns[start : start + batch_size]
+            varnames = [varname for varname, _ in batch]
+            rows = np.column_stack([values for _, values in batch]).tolist()
+            Data.store(varnames, None, rows)
     return df
 
 
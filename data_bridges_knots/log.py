@@ -0,0 +1,108 @@
+from typing import Optional
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+PACKAGE_LOGGER = "data_bridges_knots"
+DEFAULT_LOG_FILE = "data_bridges_api_calls.log"
+LOG_FORMAT = "%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Structured fields attached to per-request records through ``extra``
+REQUEST_FIELDS = ("endpoint", "page", "latency", "rows")
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[logging.Handler] = None
+_file_handler: Optional[logging.Handler] = None
+
+
+class RequestFieldsFormatter(logging.Formatter):
+    """Formatter appending the structured request fields present on a record.
+
+    Examples:
+        >>> logger.info("Request completed", extra={"endpoint": "x", "page": 2})
+        2025-01-01 10:00:00,1 data_bridges_knots.client INFO Request completed endpoint=x page=2
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = [
+            f"{field}={getattr(record, field)}"
+            for field in REQUEST_FIELDS
+            if getattr(record, field, None) is not None
+        ]
+        return " ".join([message, *fields]) if fields else message
+
+
+def enable_logging(
+    filename: Optional[str] = DEFAULT_LOG_FILE,
+    level: int = logging.INFO,
+    handler: Optional[logging.Handler] = None,
+    use_queue: bool = True,
+) -> logging.Logger:
+    """Send the package logs to a file or handler.
+
+    The package logger has no handlers by default. This attaches one, formatted with
+    the structured request fields (endpoint, page, latency, rows). With
+    ``use_queue=True`` records are handed to a ``QueueListener`` thread so file
+    I/O happens off the request thread.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        filename (str, optional): Log file, appended to. Ignored when ``handler`` is
+            given. Defaults to ``"data_bridges_api_calls.log"``.
+        level (int, optional): Logging level. Defaults to ``logging.INFO``.
+        handler (logging.Handler, optional): Handler to use instead of a file.
+        use_queue (bool, optional): Write through a background queue listener.
+            Defaults to True.
+
+    Returns:
+        logging.Logger: The package logger
+
+    Examples:
+        >>> from data_bridges_knots import enable_logging
+        >>> enable_logging()  # writes to data_bridges_api_calls.log
+        >>> enable_logging(handler=logging.StreamHandler(), level=logging.DEBUG)
+    """
+    global _listener, _handler, _file_handler
+    disable_logging()
+
+    if handler is None:
+        handler = _file_handler = logging.FileHandler(
+            filename, mode="a", encoding="utf-8"
+        )
+    if handler.formatter is None:
+        handler.setFormatter(RequestFieldsFormatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    logger.setLevel(level)
+    if use_queue:
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        _handler = QueueHandler(log_queue)
+    else:
+        _handler = handler
+    logger.addHandler(_handler)
+    return logger
+
+
+def disable_logging() -> None:
+    """Remove the handler added by :func:`enable_logging`, flushing queued records."""
+    global _listener, _handler, _file_handler
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    if _handler is not None:
+        logger.removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _file_handler is not None:
+        _file_handler.close()
+        _file_handler = None
+
+
+atexit.register(disable_logging)
@@ -0,0 +1,237 @@
+from typing import Dict, List, Optional, Sequence
+
+import bisect
+import threading
+from collections import defaultdict
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds (seconds) of the conversion-time histogram buckets
+DEFAULT_CONVERSION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram, cumulative like Prometheus histograms.
+
+    Args:
+        buckets (Sequence[float]): Increasing bucket upper bounds. A ``+Inf`` bucket
+            is always added.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def as_dict(self) -> Dict[str, object]:
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(bounds, self.cumulative())),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class EndpointMetrics:
+    """Counters and histograms of a single endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "retries",
+        "bytes_received",
+        "rows_parsed",
+        "latency",
+        "conversion",
+    )
+
+    def __init__(
+        self, latency_buckets: Sequence[float], conversion_buckets: Sequence[float]
+    ):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.rows_parsed = 0
+        self.latency = Histogram(latency_buckets)
+        self.conversion = Histogram(conversion_buckets)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "rows_parsed": self.rows_parsed,
+            "latency_seconds": self.latency.as_dict(),
+            "conversion_seconds": self.conversion.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """Per-endpoint request metrics of a :class:`DataBridgesKnots` client.
+
+    Records request and retry counts, request latency, bytes received, rows parsed
+    and the time spent converting responses to DataFrames, for each generated-client
+    endpoint (e.g. ``"market_prices_price_monthly_get"``), plus token refresh time.
+    Readable as a dict with :meth:`as_dict` or in Prometheus text format with
+    :meth:`to_prometheus`. Safe to update from several threads.
+
+    Args:
+        latency_buckets (Sequence[float], optional): Request latency histogram
+            buckets, in seconds.
+        conversion_buckets (Sequence[float], optional): Conversion time histogram
+            buckets, in seconds.
+
+    Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> df = client.get_prices("KEN", "2025-01-01")
+        >>> client.metrics.as_dict()["endpoints"]["market_prices_price_monthly_get"]["requests"]
+        12
+        >>> print(client.metrics.to_prometheus())
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        conversion_buckets: Sequence[float] = DEFAULT_CONVERSION_BUCKETS,
+    ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.conversion_buckets = tuple(conversion_buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._endpoints: Dict[str, EndpointMetrics] = defaultdict(
+                lambda: EndpointMetrics(self.latency_buckets, self.conversion_buckets)
+            )
+            self.token_refresh = Histogram(self.latency_buckets)
+
+    def record_request(
+        self,
+        endpoint: str,
+        latency: float,
+        bytes_received: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """Record one request to ``endpoint`` that took ``latency`` seconds."""
+        with self._lock:
+            metrics = self._endpoints[endpoint]
+            metrics.requests += 1
+            metrics.latency.observe(latency)
+            if bytes_received:
+                metrics.bytes_received += bytes_received
+            if error:
+                metrics.errors += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record that a request to ``endpoint`` is being retried."""
+        with self._lock:
+            self._endpoints[endpoint].retries += 1
+
+    def record_conversion(self, endpoint: str, seconds: float, rows: int) -> None:
+        """Record the conversion of a response of ``endpoint`` into ``rows`` rows."""
+        with self._lock:
+            metrics = self._endpoints[endpoint]
+            metrics.conversion.observe(seconds)
+            metrics.rows_parsed += rows
+
+    def record_token_refresh(self, seconds: float) -> None:
+        """Record the time taken to refresh the API token."""
+        with self._lock:
+            self.token_refresh.observe(seconds)
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return a snapshot of all metrics as plain dicts."""
+        with self._lock:
+            return {
+                "endpoints": {
+                    name: metrics.as_dict()
+                    for name, metrics in sorted(self._endpoints.items())
+                },
+                "token_refresh_seconds": self.token_refresh.as_dict(),
+            }
+
+    def to_prometheus(self, prefix: str = "databridges") -> str:
+        """Return all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to "databridges".
+
+        Returns:
+            str: Metrics text, ready to serve on a ``/metrics`` endpoint
+        """
+        lines: List[str] = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            counters = (
+                ("requests_total", "requests", "Requests sent to the API."),
+                ("errors_total", "errors", "Requests that raised an error."),
+                ("retries_total", "retries", "Requests retried after an error."),
+                ("bytes_received_total", "bytes_received", "Response bytes received."),
+                ("rows_parsed_total", "rows_parsed", "Rows converted to DataFrames."),
+            )
+            for name, attr, help_text in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for endpoint, metrics in endpoints:
+                    lines.append(
+                        f'{prefix}_{name}{{endpoint="{endpoint}"}} '
+                        f"{getattr(metrics, attr)}"
+                    )
+
+            histograms = (
+                ("request_latency_seconds", "latency", "Request latency."),
+                (
+                    "conversion_seconds",
+                    "conversion",
+                    "Time converting responses to DataFrames.",
+                ),
+            )
+            for name, attr, help_text in histograms:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} histogram")
+                for endpoint, metrics in endpoints:
+                    lines.extend(
+                        _histogram_lines(
+                            f"{prefix}_{name}",
+                            getattr(metrics, attr),
+                            f'endpoint="{endpoint}"',
+                        )
+                    )
+
+            name = f"{prefix}_token_refresh_seconds"
+            lines.append(f"# HELP {name} Time refreshing the API token.")
+            lines.append(f"# TYPE {name} histogram")
+            lines.extend(_histogram_lines(name, self.token_refresh))
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+    sep = "," if labels else ""
+    bounds = [repr(float(b)) for b in histogram.buckets] + ["+Inf"]
+    lines = [
+        f'{name}_bucket{{{labels}{sep}le="{bound}"}} {count}'
+        for bound, count in zip(bounds, histogram.cumulative())
+    ]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
@@ -0,0 +1,90 @@
+from typing import Optional
+
+import math
+import threading
+import time
+import warnings
+
+
+def warn_page_size_ignored(method: str) -> None:
+    """Warn that ``page_size`` is passed to a method that reads the page length
+    from the first response."""
+    warnings.warn(
+        f"{method}(page_size=...) is ignored and will be removed; the page length "
+        "is read from the first response",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by all requests of a client.
+
+    Every request takes a token before it is sent, so concurrent page fetches
+    together never exceed ``requests_per_second`` on average, with at most
+    ``burst`` requests sent back to back.
+
+    Args:
+        requests_per_second (float, optional): Sustained request rate. None
+            disables the limit. Defaults to 1.0.
+        burst (int, optional): Number of requests that may be sent without
+            waiting. Defaults to 1.
+
+    Examples:
+        >>> limiter = RateLimiter(requests_per_second=2, burst=4)
+        >>> limiter.acquire()  # returns immediately while tokens are left
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = 1.0, burst: int = 1):
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive or None")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimiter(requests_per_second={self.requests_per_second}, "
+            f"burst={self.burst})"
+        )
+
+    def acquire(self) -> float:
+        """Wait until a request may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if self.requests_per_second is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.requests_per_second,
+            )
+            self._updated = now
+            # Reserve a token now, possibly going into debt, and sleep off the debt
+            self._tokens -= 1
+            wait = -self._tokens / self.requests_per_second if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def page_count(total_items: int, page_length: int) -> int:
+    """Return the number of pages needed for ``total_items`` rows.
+
+    Args:
+        total_items (int): ``total_items`` reported by the API
+        page_length (int): Rows per page, as returned on the first page
+
+    Returns:
+        int: Number of pages, at least 1
+    """
+    if page_length <= 0 or total_items <= page_length:
+        return 1
+    return math.ceil(total_items / page_length)
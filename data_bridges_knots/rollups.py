@@ -0,0 +1,231 @@
+from typing import Dict, Mapping, Optional, Sequence
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.cube import SERIES_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVELS = {"national": ("adm0Code",)}
+STATISTICS = ("mean", "median", "markets")
+
+
+class PriceRollups:
+    """Materialized monthly price aggregates, updated incrementally.
+
+    Keeps the mean and median price, and the number of reporting markets, of every
+    series (commodity, unit, price type and currency) per month for each
+    aggregation level, e.g. national and admin 1. Each market contributes one
+    value per month, the mean of its prices that month.
+
+    :meth:`update` takes new price rows, or revisions of rows already seen (same
+    market, series and date), and recomputes only the groups of the levels that
+    those rows fall in. :meth:`get` returns the stored aggregates without
+    computing anything.
+
+    Args:
+        levels (Mapping[str, Sequence[str]], optional): Level name to the columns
+            identifying an area at that level. Defaults to
+            ``{"national": ("adm0Code",)}``.
+        market_areas (pandas.DataFrame, optional): Area columns per market, joined
+            onto incoming prices on ``market_column``, for levels whose columns
+            price rows lack (e.g. admin 1 from ``get_markets_list``).
+        market_column (str, optional): Market ID column. Defaults to "marketID".
+        series_columns (Sequence[str], optional): Columns identifying a price
+            series. Defaults to ``SERIES_COLUMNS``.
+        date_column (str, optional): Price date column. Defaults to
+            "commodityPriceDate".
+        price_column (str, optional): Price column. Defaults to "commodityPrice".
+
+    Examples:
+        >>> markets = client.get_markets_list("KEN", all_pages=True)
+        >>> rollups = PriceRollups(
+        ...     levels={"national": ["adm0Code"], "admin1": ["adm0Code", "adm1Code"]},
+        ...     market_areas=markets.rename(columns={"marketId": "marketID"}),
+        ... )
+        >>> rollups.update(client.get_prices("KEN", "2020-01-01"))
+        >>> # After each sync, only the touched groups are recomputed
+        >>> rollups.update(client.get_prices("KEN", "2025-06-01"))
+        >>> rollups.get("admin1", commodity_id=51, start="2025-01")
+    """
+
+    def __init__(
+        self,
+        levels: Mapping[str, Sequence[str]] = DEFAULT_LEVELS,
+        market_areas: Optional[pd.DataFrame] = None,
+        market_column: str = "marketID",
+        series_columns: Sequence[str] = SERIES_COLUMNS,
+        date_column: str = "commodityPriceDate",
+        price_column: str = "commodityPrice",
+    ):
+        if not levels:
+            raise ValueError("At least one level is required")
+        self.levels = {name: list(columns) for name, columns in levels.items()}
+        self.market_column = market_column
+        self.series_columns = list(series_columns)
+        self.date_column = date_column
+        self.price_column = price_column
+        self._area_columns = list(
+            dict.fromkeys(c for columns in self.levels.values() for c in columns)
+        )
+        self._market_areas = None
+        if market_areas is not None:
+            joined = [c for c in self._area_columns if c in market_areas]
+            self._market_areas = market_areas.drop_duplicates(market_column).set_index(
+                market_column
+            )[joined]
+
+        self._key = [market_column] + self.series_columns + ["date"]
+        self._observations = pd.DataFrame(
+            columns=self._key + ["month", "price"] + self._area_columns
+        ).set_index(self._key)
+        self._rollups: Dict[str, pd.DataFrame] = {
+            name: self._empty_rollup(name) for name in self.levels
+        }
+
+    def __repr__(self) -> str:
+        groups = ", ".join(f"{name}={len(df)}" for name, df in self._rollups.items())
+        return f"PriceRollups(observations={len(self._observations)}, {groups})"
+
+    def _group_columns(self, level: str) -> list:
+        return self.levels[level] + self.series_columns + ["month"]
+
+    def _empty_rollup(self, level: str) -> pd.DataFrame:
+        index = pd.MultiIndex.from_arrays(
+            [[] for _ in self._group_columns(level)], names=self._group_columns(level)
+        )
+        # Typed like _aggregate's output, so concatenating keeps integer counts
+        dtypes = {"mean": "float64", "median": "float64", "markets": "Int64"}
+        return pd.DataFrame(
+            {name: pd.Series(dtype=dtypes[name]) for name in STATISTICS}, index=index
+        )
+
+    def _prepare(self, prices: pd.DataFrame) -> pd.DataFrame:
+        rows = prices[
+            [self.market_column]
+            + self.series_columns
+            + [c for c in self._area_columns if c in prices]
+        ].copy()
+        dates = pd.to_datetime(prices[self.date_column], errors="coerce").to_numpy(
+            "datetime64[ns]"
+        )
+        rows["date"] = dates
+        rows["month"] = dates.astype("datetime64[M]").astype("datetime64[ns]")
+        rows["price"] = pd.to_numeric(prices[self.price_column], errors="coerce")
+        if self._market_areas is not None:
+            for column in self._market_areas.columns:
+                if column not in rows:
+                    rows[column] = rows[self.market_column].map(
+                        self._market_areas[column]
+                    )
+        missing = [c for c in self._area_columns if c not in rows]
+        if missing:
+            raise ValueError(
+                f"Prices lack the level columns {missing}; pass market_areas"
+            )
+        rows = rows.dropna(subset=self._key + ["price"])
+        # Within one update, the last row given for a key wins
+        rows = rows.drop_duplicates(self._key, keep="last")
+        return rows.set_index(self._key)
+
+    def update(self, prices: pd.DataFrame) -> Dict[str, int]:
+        """Add or revise price rows and refresh the affected aggregates.
+
+        Args:
+            prices (pandas.DataFrame): New or revised rows, e.g. from ``get_prices``
+
+        Returns:
+            dict: Number of groups recomputed per level
+        """
+        new = self._prepare(prices)
+        if new.empty:
+            return {name: 0 for name in self.levels}
+
+        positions = self._observations.index.get_indexer(new.index)
+        revised = positions >= 0
+        if revised.any():
+            for column in new.columns:
+                self._observations.iloc[
+                    positions[revised], self._observations.columns.get_loc(column)
+                ] = new[column].to_numpy()[revised]
+        if not len(self._observations):
+            self._observations = new
+        elif (~revised).any():
+            self._observations = pd.concat([self._observations, new[~revised]])
+        logger.debug(
+            "Rollup update: %d new and %d revised prices",
+            (~revised).sum(),
+            revised.sum(),
+        )
+
+        # Only months with new rows can hold touched groups; narrowing to them
+        # first keeps the group matching below off the full history
+        months = self._observations["month"].to_numpy("datetime64[ns]")
+        observations = self._observations[
+            np.isin(months, new["month"].unique())
+        ].reset_index()
+        new = new.reset_index()
+        recomputed = {}
+        for level in self.levels:
+            groups = self._group_columns(level)
+            touched = pd.MultiIndex.from_frame(new[groups]).unique()
+            in_touched = pd.MultiIndex.from_frame(observations[groups]).isin(touched)
+            rollup = self._aggregate(observations[in_touched], level)
+            kept = self._rollups[level]
+            kept = kept[~kept.index.isin(touched)]
+            self._rollups[level] = pd.concat([kept, rollup]).sort_index()
+            recomputed[level] = len(touched)
+        return recomputed
+
+    def _aggregate(self, observations: pd.DataFrame, level: str) -> pd.DataFrame:
+        cell = [self.market_column] + self._group_columns(level)
+        cells = observations.groupby(cell, sort=False)["price"].mean().astype(float)
+        grouped = cells.groupby(level=self._group_columns(level), sort=False)
+        return pd.DataFrame(
+            {
+                "mean": grouped.mean(),
+                "median": grouped.median(),
+                "markets": grouped.size().astype("Int64"),
+            }
+        )
+
+    def get(
+        self,
+        level: str,
+        commodity_id: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Return the stored aggregates of a level.
+
+        Args:
+            level (str): Level name, e.g. "national"
+            commodity_id (int, optional): Keep one commodity (first series
+                column). Defaults to all.
+            start (str, optional): First month, e.g. "2024-01". Defaults to all.
+            end (str, optional): Last month, included. Defaults to all.
+
+        Returns:
+            pandas.DataFrame: ``mean``, ``median`` and ``markets`` indexed by the
+            level columns, series columns and month
+        """
+        if level not in self._rollups:
+            raise KeyError(
+                f"Unknown level {level!r}, expected one of {list(self.levels)}"
+            )
+        rollup = self._rollups[level]
+        if commodity_id is not None:
+            values = rollup.index.get_level_values(self.series_columns[0])
+            rollup = rollup[values == commodity_id]
+        if start is not None or end is not None:
+            months = rollup.index.get_level_values("month")
+            mask = np.ones(len(rollup), dtype=bool)
+            if start is not None:
+                mask &= months >= pd.Timestamp(start)
+            if end is not None:
+                mask &= months <= pd.Timestamp(end)
+            rollup = rollup[mask]
+        return rollup
@@ -0,0 +1,416 @@
+from typing import Any, Optional, Sequence, Tuple, Union
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_bridges_knots.helpers import (
+    _import_polars,
+    _import_pyarrow,
+    records_to_arrow,
+    records_to_polars,
+    to_arrow_table,
+)
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+GEOPARQUET_VERSION = "1.1.0"
+
+# Column names tried, case-insensitively, when none are given
+LATITUDE_COLUMNS = ("latitude", "marketLatitude", "lat")
+LONGITUDE_COLUMNS = ("longitude", "marketLongitude", "lng", "lon")
+
+# Query x market dot products computed per chunk, bounding memory to ~32 MB
+_CHUNK_ELEMENTS = 2**22
+
+ArrayLike = Union[float, Sequence[float], np.ndarray, pd.Series]
+
+
+def _find_column(df: pd.DataFrame, candidates: Sequence[str]) -> str:
+    lowered = {str(c).lower(): c for c in df.columns}
+    for name in candidates:
+        if name.lower() in lowered:
+            return lowered[name.lower()]
+    raise ValueError(
+        f"None of the columns {list(candidates)} found in markets, "
+        "pass lat_column and lng_column"
+    )
+
+
+def _unit_vectors(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    lat = np.radians(lat)
+    lng = np.radians(lng)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def haversine_km(
+    lat1: ArrayLike, lng1: ArrayLike, lat2: ArrayLike, lng2: ArrayLike
+) -> np.ndarray:
+    """Great-circle distance in kilometers between broadcastable coordinate arrays."""
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(a, dtype=float)) for a in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _point(feature: dict) -> Tuple[Any, Any]:
+    geometry = feature.get("geometry") or {}
+    coordinates = geometry.get("coordinates") or ()
+    if geometry.get("type") != "Point" or len(coordinates) < 2:
+        return (None, None)
+    return (coordinates[0], coordinates[1])
+
+
+def geojson_to_frame(geojson: dict, backend: str = "pandas") -> pd.DataFrame:
+    """Parse a GeoJSON FeatureCollection of points into a columnar DataFrame.
+
+    Every feature property becomes a column, and point coordinates become the
+    float64 ``longitude`` and ``latitude`` columns (NaN for features without a
+    point geometry). Properties and coordinates are each extracted in a single
+    pass over the features and converted column-wise by pandas and NumPy.
+
+    Args:
+        geojson (dict): FeatureCollection, e.g. from ``get_market_geojson_list``
+        backend (str, optional): "pandas", "polars" to build a polars frame or
+            "arrow" to build a pyarrow Table. Defaults to "pandas".
+
+    Returns:
+        pandas.DataFrame | polars.DataFrame | pyarrow.Table: One row per feature
+
+    Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> markets = geojson_to_frame(client.get_market_geojson_list("KEN"))
+        >>> markets[["longitude", "latitude"]].to_numpy()
+    """
+    features = geojson.get("features") or []
+    properties = [feature.get("properties") or {} for feature in features]
+    coordinates = np.array([_point(feature) for feature in features], dtype=float)
+    coordinates = coordinates.reshape(len(features), 2)
+    if backend == "polars":
+        pl = _import_polars()
+        return records_to_polars(properties).with_columns(
+            pl.Series("longitude", coordinates[:, 0]),
+            pl.Series("latitude", coordinates[:, 1]),
+        )
+    if backend == "arrow":
+        table = records_to_arrow(properties)
+        columns = dict(zip(table.column_names, table.columns))
+        columns["longitude"] = coordinates[:, 0]
+        columns["latitude"] = coordinates[:, 1]
+        return _import_pyarrow().table(columns)
+    frame = pd.DataFrame.from_records(properties, nrows=len(features))
+    frame["longitude"] = coordinates[:, 0]
+    frame["latitude"] = coordinates[:, 1]
+    return frame
+
+
+def _point_wkb(lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Encode points as little-endian WKB, 21 bytes per point, without a loop."""
+    wkb = np.empty(
+        len(lng), dtype=[("order", "u1"), ("type", "<u4"), ("x", "<f8"), ("y", "<f8")]
+    )
+    wkb["order"] = 1
+    wkb["type"] = 1
+    wkb["x"] = lng
+    wkb["y"] = lat
+    return wkb
+
+
+def write_geoparquet(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    lat_column: str = "latitude",
+    lng_column: str = "longitude",
+) -> None:
+    """Write a DataFrame of points to a GeoParquet file.
+
+    A WKB ``geometry`` column is built from the coordinate columns (null where a
+    coordinate is missing) and described in the ``geo`` file metadata, so the
+    file opens as a point layer in GeoPandas, QGIS or DuckDB. The coordinates are
+    assumed to be WGS84 longitudes and latitudes.
+
+    Args:
+        df (pandas.DataFrame | polars.DataFrame | pyarrow.Table): Table with
+            coordinate columns, e.g. from :func:`geojson_to_frame`
+        path (str | Path): Output ``.parquet`` file
+        lat_column (str, optional): Latitude column. Defaults to "latitude".
+        lng_column (str, optional): Longitude column. Defaults to "longitude".
+
+    Raises:
+        ImportError: If pyarrow is not installed
+
+    Examples:
+        >>> markets = client.get_market_geojson_table("KEN")
+        >>> write_geoparquet(markets, "ken_markets.parquet")
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Writing GeoParquet requires pyarrow. Install it with "
+            "pip install 'data-bridges-knots[arrow]'"
+        ) from e
+
+    # Arrow tables, and the Arrow columns of polars frames, are used as they are
+    table = to_arrow_table(df)
+    lat = pd.to_numeric(table.column(lat_column).to_pandas(), errors="coerce").to_numpy(
+        float
+    )
+    lng = pd.to_numeric(table.column(lng_column).to_pandas(), errors="coerce").to_numpy(
+        float
+    )
+    located = np.isfinite(lat) & np.isfinite(lng)
+    wkb = _point_wkb(lng, lat)
+    offsets = np.arange(table.num_rows + 1, dtype=np.int32) * wkb.itemsize
+    validity = np.packbits(located, bitorder="little")
+    geometry = pa.Array.from_buffers(
+        pa.binary(),
+        table.num_rows,
+        [pa.py_buffer(validity), pa.py_buffer(offsets), pa.py_buffer(wkb.tobytes())],
+        null_count=int((~located).sum()),
+    )
+
+    table = table.append_column("geometry", geometry)
+    bbox = (
+        [lng[located].min(), lat[located].min(), lng[located].max(), lat[located].max()]
+        if located.any()
+        else []
+    )
+    geo = {
+        "version": GEOPARQUET_VERSION,
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": ["Point"],
+                "bbox": [float(v) for v in bbox],
+            }
+        },
+    }
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"geo"] = json.dumps(geo).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+class MarketIndex:
+    """In-memory spatial index of market locations.
+
+    Answers k-nearest and radius queries for whole arrays of coordinates at once,
+    replacing one ``get_nearby_markets`` call per location. Markets and queries
+    are mapped to unit vectors, candidates are ranked from chunked matrix
+    products (the cosine of the angular distance), and the returned distances
+    are exact haversine distances.
+
+    Markets without coordinates are left out of the index. Queries with a
+    missing coordinate match nothing.
+
+    Args:
+        markets (pandas.DataFrame): Markets, e.g. from ``get_markets_list``
+        lat_column (str, optional): Latitude column. Defaults to the first of
+            ``LATITUDE_COLUMNS`` found.
+        lng_column (str, optional): Longitude column. Defaults to the first of
+            ``LONGITUDE_COLUMNS`` found.
+
+    Raises:
+        ValueError: If the coordinate columns cannot be found
+
+    Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> index = client.get_market_index("KEN")
+        >>> nearest = index.nearest(households["lat"], households["lng"])
+        >>> households["market_id"] = nearest["marketId"].to_numpy()
+        >>> in_reach = index.within(households["lat"], households["lng"], radius_km=15)
+    """
+
+    def __init__(
+        self,
+        markets: pd.DataFrame,
+        lat_column: Optional[str] = None,
+        lng_column: Optional[str] = None,
+    ):
+        lat_column = lat_column or _find_column(markets, LATITUDE_COLUMNS)
+        lng_column = lng_column or _find_column(markets, LONGITUDE_COLUMNS)
+        lat = pd.to_numeric(markets[lat_column], errors="coerce").to_numpy(float)
+        lng = pd.to_numeric(markets[lng_column], errors="coerce").to_numpy(float)
+        located = np.isfinite(lat) & np.isfinite(lng)
+        if not located.all():
+            logger.debug(
+                "Leaving %d markets without coordinates out of the index",
+                (~located).sum(),
+            )
+
+        self.markets = markets.loc[located].reset_index(drop=True)
+        self.lat = lat[located]
+        self.lng = lng[located]
+        self._vectors = _unit_vectors(self.lat, self.lng)
+
+    @classmethod
+    def from_geojson(cls, geojson: dict) -> "MarketIndex":
+        """Build an index from ``get_market_geojson_list`` output.
+
+        Feature properties become the market columns; point coordinates are read
+        from the feature geometry. See :func:`geojson_to_frame`.
+        """
+        return cls(
+            geojson_to_frame(geojson), lat_column="latitude", lng_column="longitude"
+        )
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def __repr__(self) -> str:
+        return f"MarketIndex(markets={len(self)})"
+
+    def _queries(self, lat: ArrayLike, lng: ArrayLike) -> Tuple[np.ndarray, ...]:
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lng = np.atleast_1d(np.asarray(lng, dtype=float))
+        if lat.shape != lng.shape or lat.ndim != 1:
+            raise ValueError("lat and lng must be scalars or 1-D arrays of one length")
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+        return lat, lng, valid, _unit_vectors(lat[valid], lng[valid])
+
+    def _chunks(self, n_queries: int):
+        step = max(1, _CHUNK_ELEMENTS // max(len(self), 1))
+        for start in range(0, n_queries, step):
+            yield slice(start, min(start + step, n_queries))
+
+    def query(
+        self, lat: ArrayLike, lng: ArrayLike, k: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the ``k`` nearest markets of every query point.
+
+        Args:
+            lat (float | array-like): Query latitudes
+            lng (float | array-like): Query longitudes
+            k (int, optional): Number of neighbours. Defaults to 1.
+
+        Returns:
+            tuple: ``(distances, positions)``, two ``(n_queries, k)`` arrays sorted
+            by distance. Positions index rows of :attr:`markets`. Missing
+            neighbours (invalid queries, or ``k`` above the number of markets) have
+            distance NaN and position -1.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        lat, lng, valid, vectors = self._queries(lat, lng)
+        distances = np.full((len(lat), k), np.nan)
+        positions = np.full((len(lat), k), -1, dtype=np.intp)
+        kk = min(k, len(self))
+        if kk == 0 or len(valid) == 0:
+            return distances, positions
+
+        for chunk in self._chunks(len(valid)):
+            dots = vectors[chunk] @ self._vectors.T
+            if kk == 1:
+                nearest = dots.argmax(axis=1)[:, None]
+            elif kk < len(self):
+                nearest = np.argpartition(-dots, kk - 1, axis=1)[:, :kk]
+            else:
+                nearest = np.broadcast_to(np.arange(kk), dots.shape)
+            order = np.argsort(-np.take_along_axis(dots, nearest, axis=1), axis=1)
+            nearest = np.take_along_axis(nearest, order, axis=1)
+            rows = valid[chunk]
+            positions[rows, :kk] = nearest
+            distances[rows, :kk] = haversine_km(
+                lat[rows, None], lng[rows, None], self.lat[nearest], self.lng[nearest]
+            )
+        return distances, positions
+
+    def query_radius(
+        self, lat: ArrayLike, lng: ArrayLike, radius_km: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find every market within ``radius_km`` of every query point.
+
+        Args:
+            lat (float | array-like): Query latitudes
+            lng (float | array-like): Query longitudes
+            radius_km (float): Search radius in kilometers
+
+        Returns:
+            tuple: ``(query_positions, market_positions, distances)``, flat arrays
+            with one entry per match, ordered by query then distance
+        """
+        if radius_km < 0:
+            raise ValueError("radius_km must not be negative")
+        lat, lng, valid, vectors = self._queries(lat, lng)
+        # Small margin so rounding in the dot products never drops a boundary match
+        threshold = np.cos(min(radius_km / EARTH_RADIUS_KM, np.pi)) - 1e-12
+        query_parts, market_parts, distance_parts = [], [], []
+        if len(self):
+            for chunk in self._chunks(len(valid)):
+                dots = vectors[chunk] @ self._vectors.T
+                rows, markets = np.nonzero(dots >= threshold)
+                rows = valid[chunk][rows]
+                distances = haversine_km(
+                    lat[rows], lng[rows], self.lat[markets], self.lng[markets]
+                )
+                keep = distances <= radius_km
+                query_parts.append(rows[keep])
+                market_parts.append(markets[keep])
+                distance_parts.append(distances[keep])
+
+        if not query_parts:
+            empty = np.array([], dtype=np.intp)
+            return empty, empty.copy(), np.array([], dtype=float)
+        queries = np.concatenate(query_parts)
+        markets = np.concatenate(market_parts)
+        distances = np.concatenate(distance_parts)
+        order = np.lexsort((distances, queries))
+        return queries[order], markets[order], distances[order]
+
+    def _frame(
+        self, queries: np.ndarray, positions: np.ndarray, distances: np.ndarray
+    ) -> pd.DataFrame:
+        found = positions >= 0
+        markets = self.markets.reindex(np.where(found, positions, -1)).reset_index(
+            drop=True
+        )
+        markets.insert(0, "query_index", queries)
+        markets.insert(1, "distance_km", distances)
+        return markets
+
+    def nearest(self, lat: ArrayLike, lng: ArrayLike, k: int = 1) -> pd.DataFrame:
+        """Return the ``k`` nearest markets of every query point as a DataFrame.
+
+        Args:
+            lat (float | array-like): Query latitudes
+            lng (float | array-like): Query longitudes
+            k (int, optional): Number of neighbours. Defaults to 1.
+
+        Returns:
+            pandas.DataFrame: ``n_queries * k`` rows ordered by query then distance,
+            with ``query_index`` (position of the query point), ``distance_km`` and
+            the market columns. With ``k=1`` rows align with the query points.
+            Missing neighbours have NaN distance and market columns.
+        """
+        distances, positions = self.query(lat, lng, k)
+        queries = np.repeat(np.arange(len(positions)), positions.shape[1])
+        return self._frame(queries, positions.ravel(), distances.ravel())
+
+    def within(
+        self, lat: ArrayLike, lng: ArrayLike, radius_km: float = 15.0
+    ) -> pd.DataFrame:
+        """Return every market within ``radius_km`` of every query point.
+
+        Args:
+            lat (float | array-like): Query latitudes
+            lng (float | array-like): Query longitudes
+            radius_km (float, optional): Search radius in kilometers. Defaults to
+                15, the radius of ``get_nearby_markets``.
+
+        Returns:
+            pandas.DataFrame: One row per match ordered by query then distance,
+            with ``query_index``, ``distance_km`` and the market columns
+        """
+        queries, positions, distances = self.query_radius(lat, lng, radius_km)
+        return self._frame(queries, positions, distances)
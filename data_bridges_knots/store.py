@@ -0,0 +1,192 @@
+from typing import Any, Dict, Mapping, Optional, Union
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from data_bridges_knots.helpers import _import_pyarrow, to_arrow_table
+from data_bridges_knots.ipc import read_ipc, write_ipc
+
+logger = logging.getLogger(__name__)
+
+# Schema metadata key holding the catalog entry of a stored file
+METADATA_KEY = b"data_bridges_knots.store"
+
+CATALOG_COLUMNS = ("endpoint", "params", "rows", "columns", "bytes", "created", "path")
+
+
+def _canonical_params(params: Mapping[str, Any]) -> str:
+    return json.dumps(dict(params), sort_keys=True, default=str)
+
+
+class DatasetStore:
+    """Local store of endpoint results as memory-mapped Arrow IPC files.
+
+    Each result is one uncompressed Arrow IPC file in ``root``, named after the
+    endpoint and a hash of its parameters. :meth:`get` memory-maps the file, so
+    processes reading the same result share one copy in the operating system's
+    page cache instead of each holding their own.
+
+    The catalog is the files themselves: every file carries its endpoint,
+    parameters and row count in its schema metadata, and :meth:`catalog` reads
+    only the schemas. Files are written to a temporary name and renamed into
+    place, so processes can write and read the same store without locks; a
+    reader never sees a partial file, and tables already mapped stay valid when
+    a result is replaced.
+
+    Files are not encrypted. Keep the store in a directory only the intended
+    users can read when it holds ``"full"`` or ``"draft"`` survey data.
+
+    Args:
+        root (str | Path): Store directory, created on first write
+        max_age (str | pandas.Timedelta, optional): Results older than this are
+            treated as missing and fetched again, e.g. ``"1D"``. Defaults to None
+            (kept until removed).
+
+    Examples:
+        >>> store = DatasetStore("/data/databridges", max_age="12h")
+        >>> client = DataBridgesKnots(config, dataset_store=store, backend="arrow")
+        >>> # The first process downloads, the others map the stored file
+        >>> prices = client.get_prices("KEN", "2020-01-01", "2025-12-31")
+        >>> store.catalog()[["endpoint", "params", "rows"]]
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_age: Optional[Union[str, pd.Timedelta]] = None,
+    ):
+        self.root = Path(root)
+        self.max_age = pd.Timedelta(max_age) if max_age is not None else None
+
+    def __len__(self) -> int:
+        return len(list(self.root.glob("*.arrow"))) if self.root.exists() else 0
+
+    def __repr__(self) -> str:
+        return f"DatasetStore(root='{self.root}', entries={len(self)})"
+
+    def path(self, endpoint: str, params: Mapping[str, Any]) -> Path:
+        """Return the file holding the result of ``endpoint`` called with
+        ``params``."""
+        digest = hashlib.sha256(
+            f"{endpoint}\n{_canonical_params(params)}".encode()
+        ).hexdigest()
+        return self.root / f"{endpoint}_{digest[:24]}.arrow"
+
+    def get(self, endpoint: str, params: Mapping[str, Any]):
+        """Return a stored result, memory-mapped.
+
+        Args:
+            endpoint (str): Name of the generated client method, e.g.
+                "market_prices_price_monthly_get"
+            params (Mapping[str, Any]): Parameters the result was fetched with
+
+        Returns:
+            pyarrow.Table | None: Stored table, or None if there is none or it
+                is older than ``max_age``
+        """
+        path = self.path(endpoint, params)
+        try:
+            if self.max_age is not None:
+                age = time.time() - path.stat().st_mtime
+                if age > self.max_age.total_seconds():
+                    logger.debug("Stored %s is %.0fs old, ignoring it", path, age)
+                    return None
+            table = read_ipc(path)
+        except FileNotFoundError:
+            return None
+        logger.debug(
+            "Mapped %d stored rows of %s from %s", table.num_rows, endpoint, path
+        )
+        return table
+
+    def put(self, endpoint: str, params: Mapping[str, Any], data):
+        """Store a result, replacing any stored for the same call.
+
+        Args:
+            endpoint (str): Name of the generated client method
+            params (Mapping[str, Any]): Parameters the result was fetched with
+            data (pyarrow.Table | polars.DataFrame | pandas.DataFrame): Result
+
+        Returns:
+            pyarrow.Table: The stored table, memory-mapped from its file
+        """
+        table = to_arrow_table(data)
+        entry = {
+            "endpoint": endpoint,
+            "params": json.loads(_canonical_params(params)),
+            "rows": table.num_rows,
+            "created": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+        metadata = dict(table.schema.metadata or {})
+        metadata[METADATA_KEY] = json.dumps(entry).encode()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(endpoint, params)
+        # Unique per writer, so concurrent writers never share a temporary file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            write_ipc(table.replace_schema_metadata(metadata), tmp_path)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.debug("Stored %d rows of %s in %s", table.num_rows, endpoint, path)
+        return read_ipc(path)
+
+    def remove(self, endpoint: str, params: Mapping[str, Any]) -> bool:
+        """Delete a stored result.
+
+        Returns:
+            bool: True if a result was stored
+        """
+        try:
+            self.path(endpoint, params).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        if self.root.exists():
+            for path in self.root.glob("*.arrow"):
+                path.unlink(missing_ok=True)
+
+    def catalog(self) -> pd.DataFrame:
+        """List the stored results.
+
+        Only the schema of each file is read, so listing is fast whatever the
+        size of the results.
+
+        Returns:
+            pandas.DataFrame: One row per result, with its ``endpoint``,
+            ``params`` (dict), ``rows``, ``columns``, file size in ``bytes``,
+            ``created`` time and ``path``, oldest first
+        """
+        pa = _import_pyarrow()
+        entries = []
+        paths = sorted(self.root.glob("*.arrow")) if self.root.exists() else []
+        for path in paths:
+            try:
+                with pa.memory_map(str(path)) as source:
+                    schema = pa.ipc.open_file(source).schema
+                size = path.stat().st_size
+            except (FileNotFoundError, pa.ArrowInvalid):
+                # Removed meanwhile, or not written by a store
+                continue
+            entry: Dict[str, Any] = json.loads(
+                (schema.metadata or {}).get(METADATA_KEY, b"{}")
+            )
+            if "endpoint" not in entry:
+                continue
+            entry.update(columns=len(schema), bytes=size, path=str(path))
+            entries.append(entry)
+
+        catalog = pd.DataFrame(entries, columns=list(CATALOG_COLUMNS))
+        catalog["created"] = pd.to_datetime(catalog["created"], utc=True)
+        return catalog.sort_values("created", ignore_index=True)
@@ -0,0 +1,198 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SpanHook = Callable[["Span"], None]
+
+# Stages traced by DataBridgesKnots, in call order
+SPAN_NAMES = (
+    "token",
+    "http_request",
+    "deserialize",
+    "to_dict",
+    "dataframe",
+    "postprocess",
+)
+
+
+class Span:
+    """A timed stage of an API call, shaped like an OpenTelemetry span.
+
+    Hooks receive the span when it starts (``end_time`` is None) and again when it
+    ends. Times are ``time.time_ns()`` timestamps.
+
+    Attributes:
+        name (str): Stage name, one of ``SPAN_NAMES``
+        attributes (dict): Stage details, e.g. ``endpoint``, ``page`` and ``rows``
+        start_time (int): Start timestamp in nanoseconds
+        end_time (int | None): End timestamp in nanoseconds
+        parent (Span | None): Enclosing span on the same thread
+        exception (BaseException | None): Exception raised inside the span
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "start_time",
+        "end_time",
+        "parent",
+        "exception",
+        "_tracer",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.start_time = 0
+        self.end_time: Optional[int] = None
+        self.parent: Optional[Span] = None
+        self.exception: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, or None while the span is running."""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.parent = self._tracer.current_span()
+        self._tracer._stack().append(self)
+        self.start_time = time.time_ns()
+        self._tracer._emit(0, self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_time = time.time_ns()
+        self.exception = exc
+        self._tracer._stack().pop()
+        self._tracer._emit(1, self)
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, duration={self.duration}, {self.attributes})"
+
+
+class _NoopSpan:
+    """Span returned when no hook is registered; does nothing."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Calls span hooks around the stages of a :class:`DataBridgesKnots` call.
+
+    The stages are token acquisition (``"token"``), the HTTP request
+    (``"http_request"``), model deserialization (``"deserialize"``, nested in the
+    request), and frame building: ``"to_dict"``, ``"dataframe"`` and
+    ``"postprocess"`` (the NaN replace). While no hook is registered
+    :meth:`span` returns a shared no-op object, so tracing costs nothing.
+
+    A hook raising an exception is logged and ignored; it never breaks the call.
+
+    Examples:
+        >>> client = DataBridgesKnots("data_bridges_api_config.yaml")
+        >>> client.tracer.add_hook(on_span_end=lambda span: print(span))
+        >>> df = client.get_household_survey(3094, "official")
+        Span(name='http_request', duration=0.84, {'endpoint': ..., 'page': 1})
+
+        >>> # Forward to OpenTelemetry
+        >>> from opentelemetry import trace
+        >>> otel = trace.get_tracer("data_bridges_knots")
+        >>> open_spans = {}
+        >>> client.tracer.add_hook(
+        ...     on_span_start=lambda s: open_spans.__setitem__(
+        ...         id(s), otel.start_span(s.name, attributes=s.attributes)
+        ...     ),
+        ...     on_span_end=lambda s: open_spans.pop(id(s)).end(),
+        ... )
+    """
+
+    def __init__(self):
+        self._hooks: Tuple[Tuple[Optional[SpanHook], Optional[SpanHook]], ...] = ()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """True when at least one hook is registered."""
+        return bool(self._hooks)
+
+    def add_hook(
+        self,
+        on_span_start: Optional[SpanHook] = None,
+        on_span_end: Optional[SpanHook] = None,
+    ) -> Tuple[Optional[SpanHook], Optional[SpanHook]]:
+        """Register callbacks called with the :class:`Span` when a stage starts or ends.
+
+        Returns:
+            tuple: Handle to pass to :meth:`remove_hook`
+        """
+        hook = (on_span_start, on_span_end)
+        with self._lock:
+            self._hooks = self._hooks + (hook,)
+        return hook
+
+    def remove_hook(self, hook: Tuple[Optional[SpanHook], Optional[SpanHook]]) -> None:
+        """Unregister a hook returned by :meth:`add_hook`."""
+        with self._lock:
+            self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def clear(self) -> None:
+        """Unregister all hooks."""
+        with self._lock:
+            self._hooks = ()
+
+    def span(self, name: str, **attributes: Any):
+        """Return a context manager timing the stage ``name``.
+
+        Args:
+            name (str): Stage name
+            **attributes: Span attributes
+
+        Returns:
+            Span: A new span, or a no-op span when no hook is registered
+        """
+        if not self._hooks:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def current_span(self) -> Optional[Span]:
+        """Return the innermost running span of the calling thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _emit(self, which: int, span: Span) -> None:
+        for hook in self._hooks:
+            callback = hook[which]
+            if callback is None:
+                continue
+            try:
+                callback(span)
+            except Exception:
+                logger.warning("Span hook %r failed", callback, exc_info=True)
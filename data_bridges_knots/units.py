@@ -0,0 +1,187 @@
+from typing import Optional, Tuple, Union
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _ids(values) -> np.ndarray:
+    """IDs as float64, so int, float and None-holding object columns compare equal."""
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(float)
+
+
+class UnitConversionIndex:
+    """Lookup index over a commodity unit conversion table.
+
+    Conversions are indexed on ``(commodity, from unit, to unit)`` and on
+    ``(commodity, from unit)``, so factors for a whole column of prices are found
+    with a single hash lookup. Rows without a positive factor are ignored, and the
+    first factor of duplicated keys wins.
+
+    A factor converts one ``from`` unit into ``factor`` ``to`` units, e.g. 50 for
+    a 50 KG bag to kilograms, so prices are divided by it.
+
+    Args:
+        conversions (pandas.DataFrame): Conversion table, e.g. from
+            ``get_commodity_units_conversion_list``
+        commodity_column (str, optional): Commodity ID column. Defaults to
+            "commodityID".
+        from_column (str, optional): Original unit ID column. Defaults to
+            "fromUnitID".
+        to_column (str, optional): Converted unit ID column. Defaults to
+            "toUnitID".
+        factor_column (str, optional): Conversion factor column. Defaults to
+            "conversionFactor".
+
+    Examples:
+        >>> conversions = client.get_commodity_units_conversion_list("KEN", all_pages=True)
+        >>> index = UnitConversionIndex(conversions)
+        >>> factors, units = index.lookup(prices["commodityID"], prices["commodityUnitID"])
+    """
+
+    def __init__(
+        self,
+        conversions: pd.DataFrame,
+        commodity_column: str = "commodityID",
+        from_column: str = "fromUnitID",
+        to_column: str = "toUnitID",
+        factor_column: str = "conversionFactor",
+    ):
+        table = pd.DataFrame(
+            {
+                "commodity": _ids(conversions[commodity_column]),
+                "from": _ids(conversions[from_column]),
+                "to": _ids(conversions[to_column]),
+                "factor": _ids(conversions[factor_column]),
+            }
+        )
+        usable = (
+            table[["commodity", "from", "to"]].notna().all(axis=1)
+            & np.isfinite(table["factor"])
+            & (table["factor"] > 0)
+        )
+        table = table[usable].drop_duplicates(["commodity", "from", "to"])
+        if len(table) < len(conversions):
+            logger.debug(
+                "Indexed %d of %d unit conversions", len(table), len(conversions)
+            )
+
+        self._factor = table["factor"].to_numpy()
+        self._to = table["to"].to_numpy()
+        self._by_target = pd.MultiIndex.from_arrays(
+            [table["commodity"], table["from"], table["to"]]
+        )
+        first = ~table.duplicated(["commodity", "from"]).to_numpy()
+        self._by_unit = pd.MultiIndex.from_arrays(
+            [table["commodity"][first], table["from"][first]]
+        )
+        self._by_unit_rows = np.flatnonzero(first)
+        self.target_units = np.unique(self._to)
+
+    def __len__(self) -> int:
+        return len(self._factor)
+
+    def __repr__(self) -> str:
+        return f"UnitConversionIndex(conversions={len(self)})"
+
+    def lookup(
+        self, commodity_ids, unit_ids, to_unit_id: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the conversion factor of every (commodity, unit) pair.
+
+        Args:
+            commodity_ids (array-like): Commodity ID of every price
+            unit_ids (array-like): Unit ID of every price
+            to_unit_id (int, optional): Unit to convert to. Defaults to None, the
+                unit of the first conversion available for each pair (kilogram or
+                litre in the Data Bridges table).
+
+        Returns:
+            tuple: ``(factors, to_units)`` float64 arrays, NaN where no conversion
+            exists. Prices already in the target unit get a factor of 1.
+        """
+        commodity = _ids(commodity_ids)
+        unit = _ids(unit_ids)
+        if to_unit_id is None:
+            positions = self._by_unit.get_indexer(
+                pd.MultiIndex.from_arrays([commodity, unit])
+            )
+            rows = np.full(len(positions), -1)
+            rows[positions >= 0] = self._by_unit_rows[positions[positions >= 0]]
+            identity = np.isin(unit, self.target_units)
+        else:
+            target = np.full(len(unit), float(to_unit_id))
+            rows = self._by_target.get_indexer(
+                pd.MultiIndex.from_arrays([commodity, unit, target])
+            )
+            identity = unit == float(to_unit_id)
+
+        found = rows >= 0
+        factors = np.full(len(rows), np.nan)
+        to_units = np.full(len(rows), np.nan)
+        factors[found] = self._factor[rows[found]]
+        to_units[found] = self._to[rows[found]]
+        factors[identity] = 1.0
+        to_units[identity] = unit[identity]
+        return factors, to_units
+
+
+def normalize_units(
+    prices: pd.DataFrame,
+    conversions: Union[pd.DataFrame, UnitConversionIndex],
+    to_unit_id: Optional[int] = None,
+    price_column: str = "commodityPrice",
+    commodity_column: str = "commodityID",
+    unit_column: str = "commodityUnitID",
+) -> pd.DataFrame:
+    """Convert prices to a common unit of measure in one vectorized pass.
+
+    Adds ``conversionFactor``, ``normalizedUnitID``, ``normalizedPrice`` (price
+    divided by the factor) and ``unitConverted`` to a copy of ``prices``. Rows
+    without a conversion are kept, with NaN values and ``unitConverted`` False.
+
+    Args:
+        prices (pandas.DataFrame): Prices, e.g. from ``get_prices``
+        conversions (pandas.DataFrame | UnitConversionIndex): Conversion table, or
+            an index built from one to reuse across calls
+        to_unit_id (int, optional): Unit to convert to. Defaults to None, the
+            kilogram or litre unit of each conversion.
+        price_column (str, optional): Price column. Defaults to "commodityPrice".
+        commodity_column (str, optional): Commodity ID column. Defaults to
+            "commodityID".
+        unit_column (str, optional): Unit ID column. Defaults to
+            "commodityUnitID".
+
+    Returns:
+        pandas.DataFrame: Prices with the normalized columns
+
+    Examples:
+        >>> conversions = client.get_commodity_units_conversion_list("KEN", all_pages=True)
+        >>> per_kg = normalize_units(prices, conversions)
+        >>> per_kg.loc[~per_kg["unitConverted"], "commodityUnitName"].unique()
+    """
+    index = (
+        conversions
+        if isinstance(conversions, UnitConversionIndex)
+        else UnitConversionIndex(conversions)
+    )
+    factors, to_units = index.lookup(
+        prices[commodity_column], prices[unit_column], to_unit_id
+    )
+    price = _ids(prices[price_column])
+
+    df = prices.copy()
+    df["conversionFactor"] = factors
+    df["normalizedUnitID"] = to_units
+    df["normalizedPrice"] = price / factors
+    df["unitConverted"] = ~np.isnan(factors)
+    if len(df) and not df["unitConverted"].all():
+        logger.debug(
+            "%d of %d prices have no unit conversion",
+            (~df["unitConverted"]).sum(),
+            len(df),
+        )
+    return df
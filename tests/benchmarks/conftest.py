@@ -0,0 +1,133 @@
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tests.benchmarks.stub_gateway import StubGateway
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+# Allowed relative drop in relative throughput, or growth in peak memory, over the
+# baseline
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "0.4"))
+# Rows built by the calibration loop in each of its runs
+CALIBRATION_ROWS = 100_000
+# Timed runs of the calibration loop and of each workload, keeping the fastest
+REPEAT = 3
+# Absolute peak memory slack, so tiny workloads do not fail on allocator noise
+MEMORY_SLACK_MB = 1.0
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    """Collects results and rewrites the baseline with --update-benchmark-baseline"""
+    results = {}
+    yield results
+    if request.config.getoption("--update-benchmark-baseline") and results:
+        baseline = _load_baseline()
+        baseline.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+def _load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _calibration_workload():
+    rows = [
+        {"id": i, "name": f"Market {i % 250}", "price": i * 0.01}
+        for i in range(CALIBRATION_ROWS)
+    ]
+    return pd.DataFrame.from_records(rows).groupby("name")["price"].mean()
+
+
+def _calibrate():
+    """Rows/s of a fixed dict-to-DataFrame loop on this machine.
+
+    Throughput is compared to the baseline relative to this, so the baseline holds
+    on faster or slower hardware than the machine that recorded it. It is measured
+    next to each workload, so it also follows the load of shared CI runners.
+    """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - start)
+    return CALIBRATION_ROWS / best
+
+
+@pytest.fixture
+def measure(request, benchmark_results):
+    """Runs a workload, reports rows/s and peak memory, and checks the baseline.
+
+    The workload is timed on ``REPEAT`` runs, keeping the fastest like the
+    calibration loop, and traced with tracemalloc on one more, so memory tracing
+    does not distort the throughput. Throughput is checked as
+    ``relative_throughput``, the rows/s divided by those of the calibration loop run
+    just before. Workloads bound by something other than the CPU, e.g. the latency
+    of the stub gateway, pass a wider ``tolerance`` than ``BENCHMARK_TOLERANCE``.
+    """
+
+    def run(name, func, rows=None, tolerance=TOLERANCE):
+        calibration = _calibrate()
+        elapsed = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            result = func()
+            elapsed = min(elapsed, time.perf_counter() - start)
+        if rows is None:
+            rows = len(result)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        measured = {
+            "rows_per_second": round(rows / elapsed),
+            "relative_throughput": float(f"{rows / elapsed / calibration:.4g}"),
+            "peak_memory_mb": round(peak / 2**20, 1),
+        }
+        benchmark_results[name] = measured
+        print(
+            f"\n{name}: {rows:,} rows, {measured['rows_per_second']:,} rows/s "
+            f"({elapsed:.2f}s), peak {measured['peak_memory_mb']} MB"
+        )
+
+        baseline = _load_baseline().get(name)
+        if baseline and not request.config.getoption("--update-benchmark-baseline"):
+            min_throughput = baseline["relative_throughput"] * (1 - tolerance)
+            max_memory = baseline["peak_memory_mb"] * (1 + TOLERANCE) + MEMORY_SLACK_MB
+            assert measured["relative_throughput"] >= min_throughput, (
+                f"{name} throughput regressed: {measured['relative_throughput']} "
+                f"x calibration < {min_throughput:.4f} "
+                f"(baseline {baseline['relative_throughput']})"
+            )
+            assert measured["peak_memory_mb"] <= max_memory, (
+                f"{name} peak memory regressed: {measured['peak_memory_mb']} MB "
+                f"> {max_memory:.1f} (baseline {baseline['peak_memory_mb']})"
+            )
+        return result
+
+    return run
+
+
+@pytest.fixture
+def stub_gateway():
+    """Stub gateway with realistic latency and a 429 every 25 requests"""
+    with StubGateway(latency=0.01, rate_limit_every=25) as gateway:
+        yield gateway
+
+
+@pytest.fixture
+def stub_client(stub_gateway, make_client):
+    """DataBridgesKnots client talking to the stub gateway"""
+    return make_client(host=stub_gateway.url)
@@ -0,0 +1,187 @@
+"""Local HTTP server emulating the Data Bridges gateway for offline benchmarks.
+
+Endpoints are matched on their path with slashes and case ignored, so
+``/MarketPrices/PriceMonthly`` serves ``market_prices_price_monthly_get``. Each
+endpoint returns pages of ``{"items": [...], "page": n, "totalItems": total}``
+built from a deterministic row generator, after an optional injected latency.
+Every ``rate_limit_every``-th request is answered with HTTP 429.
+"""
+
+from typing import Callable, Dict, Optional
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ADM0_CODE = 133
+
+
+def price_row(i: int) -> dict:
+    month = i % 12 + 1
+    return {
+        "commodityID": i % 40 + 1,
+        "marketID": i % 250 + 1000,
+        "priceTypeID": 15,
+        "commodityUnitID": 5,
+        "currencyID": 66,
+        "commodityName": f"Commodity {i % 40 + 1}",
+        "marketName": f"Market {i % 250 + 1000}",
+        "priceTypeName": "Retail",
+        "commodityUnitName": "KG",
+        "currencyName": "KES",
+        "adm0Code": ADM0_CODE,
+        "countryISO3": "KEN",
+        "commodityPriceDate": f"{2015 + i // 12 % 10}-{month:02d}-15T00:00:00",
+        "commodityPrice": round(20 + (i * 7919 % 10_000) / 100, 2),
+        "commodityPriceFlag": "actual",
+        "commodityPriceObservations": i % 5 + 1,
+        "commodityDateMonth": month,
+        "commodityDateYear": 2015 + i // 12 % 10,
+        "commodityPriceSourceName": "WFP",
+        "originalFrequency": "monthly",
+    }
+
+
+def exchange_rate_row(i: int) -> dict:
+    return {
+        "id": i,
+        "name": "KES",
+        "countryISO3": "KEN",
+        "value": round(100 + (i * 31 % 5000) / 100, 4),
+        "date": f"{2010 + i // 365 % 15}-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00",
+        "isOfficial": i % 2 == 0,
+    }
+
+
+def survey_row(i: int, n_questions: int = 150) -> dict:
+    row = {
+        "SvyID": 3094,
+        "RESPId": i,
+        "ADMIN1Name": f"Region {i % 8}",
+        "SvyDate": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+    }
+    for q in range(n_questions):
+        row[f"Q{q}"] = (i + q) % 5 if q % 3 else f"answer {(i * q) % 7}"
+    return row
+
+
+# Normalized path -> (row generator, page size when the request has none)
+ENDPOINTS: Dict[str, tuple] = {
+    "marketpricespricemonthly": (price_row, 1000),
+    "currencyusdindirectquotation": (exchange_rate_row, 1000),
+    "householdofficialusebasedata": (survey_row, 1000),
+    "householdpublicbasedata": (survey_row, 1000),
+}
+
+
+class StubGateway:
+    """Threaded stub of the Data Bridges gateway.
+
+    Args:
+        total_items (dict, optional): Rows served per normalized endpoint path.
+            Defaults to 10,000 for each endpoint.
+        latency (float, optional): Seconds slept before answering each request.
+        rate_limit_every (int, optional): Answer every n-th request with HTTP 429.
+            Defaults to 0 (never).
+
+    Examples:
+        >>> with StubGateway(latency=0.02, rate_limit_every=7) as gateway:
+        ...     client = DataBridgesKnots(config, host=gateway.url, requests_per_second=None)
+    """
+
+    def __init__(
+        self,
+        total_items: Optional[Dict[str, int]] = None,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+    ):
+        self.total_items = {name: 10_000 for name in ENDPOINTS}
+        self.total_items.update(total_items or {})
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._pages: Dict[tuple, bytes] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubGateway":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def page(self, endpoint: str, page: int, page_size: int) -> bytes:
+        """Return the JSON body of one page, built once and then reused."""
+        key = (endpoint, page, page_size)
+        body = self._pages.get(key)
+        if body is None:
+            row: Callable[[int], dict] = ENDPOINTS[endpoint][0]
+            total = self.total_items[endpoint]
+            start = (page - 1) * page_size
+            items = [row(i) for i in range(start, min(start + page_size, total))]
+            body = json.dumps(
+                {"items": items, "page": page, "totalItems": total}
+            ).encode()
+            self._pages[key] = body
+        return body
+
+    def _handler_class(self):
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                endpoint = url.path.replace("/", "").lower()
+                # Drop the API version prefix, e.g. "v2"
+                for name in ENDPOINTS:
+                    if endpoint.endswith(name):
+                        endpoint = name
+                        break
+                else:
+                    self._reply(404, b'{"error": "unknown endpoint"}')
+                    return
+
+                with gateway._lock:
+                    gateway.requests += 1
+                    limited = (
+                        gateway.rate_limit_every
+                        and gateway.requests % gateway.rate_limit_every == 0
+                    )
+                    if limited:
+                        gateway.rate_limited += 1
+                if gateway.latency:
+                    time.sleep(gateway.latency)
+                if limited:
+                    self._reply(429, b'{"error": "rate limited"}', retry_after=0)
+                    return
+
+                query = {k.lower(): v[0] for k, v in parse_qs(url.query).items()}
+                page = int(query.get("page", 1))
+                page_size = int(query.get("pagesize", ENDPOINTS[endpoint][1]))
+                self._reply(200, gateway.page(endpoint, page, page_size))
+
+            def _reply(self, status, body, retry_after=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,41 @@
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+N_PRICES = 20_000
+N_EXCHANGE_RATES = 10_000
+N_SURVEY_ROWS = 5_000
+# Bound by the latency of the stub gateway and thread scheduling as much as by the
+# CPU, so the calibration loop predicts these less closely
+TOLERANCE = 0.6
+
+
+def test_get_prices_throughput(stub_client, stub_gateway, measure):
+    stub_gateway.total_items["marketpricespricemonthly"] = N_PRICES
+    df = measure(
+        "get_prices",
+        lambda: stub_client.get_prices("KEN", "2015-01-01", "2024-12-31"),
+        tolerance=TOLERANCE,
+    )
+    assert len(df) == N_PRICES
+    assert stub_gateway.rate_limited > 0
+
+
+def test_get_exchange_rates_throughput(stub_client, stub_gateway, measure):
+    stub_gateway.total_items["currencyusdindirectquotation"] = N_EXCHANGE_RATES
+    df = measure(
+        "get_exchange_rates",
+        lambda: stub_client.get_exchange_rates("KEN"),
+        tolerance=TOLERANCE,
+    )
+    assert len(df) == N_EXCHANGE_RATES
+
+
+def test_get_household_survey_throughput(stub_client, stub_gateway, measure):
+    stub_gateway.total_items["householdofficialusebasedata"] = N_SURVEY_ROWS
+    df = measure(
+        "get_household_survey",
+        lambda: stub_client.get_household_survey(3094, "official", page_size=500),
+        tolerance=TOLERANCE,
+    )
+    assert len(df) == N_SURVEY_ROWS
@@ -0,0 +1,33 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+# Cumulative import time budget for a bare `import data_bridges_knots`
+IMPORT_BUDGET_MS = 50
+RUNS = 5
+
+
+def _import_time_ms(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like: "import time:  self [us] | cumulative | module"
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$")
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_import_time_within_budget():
+    best = min(_import_time_ms("data_bridges_knots") for _ in range(RUNS))
+    print(f"\nimport data_bridges_knots: {best:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    assert best < IMPORT_BUDGET_MS
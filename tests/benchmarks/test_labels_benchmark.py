@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.labels import (
+    get_choice_labels,
+    get_variable_labels,
+    map_value_labels,
+)
+
+pytestmark = pytest.mark.benchmark
+
+N_QUESTIONS = 400
+N_ROWS = 20_000
+
+
+@pytest.fixture(scope="module")
+def large_xlsform_df():
+    """XLSForm with one select_one question in three, as returned by the API"""
+    rows = []
+    for q in range(N_QUESTIONS):
+        if q % 3 == 0:
+            choices = [{"name": str(c), "label": f"Choice {c}"} for c in range(5)]
+            choice_list = {"name": f"list{q}", "choices": choices}
+            rows.append((f"q{q}", f"Question {q}", "select_one", choice_list))
+        else:
+            rows.append((f"q{q}", f"Question {q}", "integer", None))
+    return pd.DataFrame(rows, columns=["name", "label", "type", "choiceList"])
+
+
+@pytest.fixture(scope="module")
+def large_survey_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {f"q{q}": rng.integers(0, 5, N_ROWS) for q in range(N_QUESTIONS)}
+    )
+
+
+def test_get_variable_labels_throughput(large_xlsform_df, measure):
+    measure(
+        "get_variable_labels",
+        lambda: get_variable_labels(large_xlsform_df),
+        rows=len(large_xlsform_df),
+    )
+
+
+def test_get_choice_labels_throughput(large_xlsform_df, measure):
+    measure(
+        "get_choice_labels",
+        lambda: get_choice_labels(large_xlsform_df.copy()),
+        rows=len(large_xlsform_df),
+    )
+
+
+def test_map_value_labels_throughput(large_survey_df, large_xlsform_df, measure):
+    df = measure(
+        "map_value_labels",
+        lambda: map_value_labels(large_survey_df, large_xlsform_df),
+    )
+    assert df.shape == large_survey_df.shape
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.load_stata import (
+    load_stata,
+    prepare_stata_columns,
+    write_dta,
+)
+
+pytestmark = pytest.mark.benchmark
+
+N_ROWS = 20_000
+N_COLUMNS = 400
+
+
+@pytest.fixture(scope="module")
+def wide_survey_df():
+    """Survey-shaped frame: mostly coded numerics, some text, dates and categoricals"""
+    rng = np.random.default_rng(0)
+    columns = {}
+    for i in range(N_COLUMNS):
+        kind = i % 10
+        if kind < 6:
+            columns[f"q{i}"] = rng.integers(0, 10, N_ROWS)
+        elif kind < 8:
+            values = rng.normal(1000, 250, N_ROWS)
+            values[rng.random(N_ROWS) < 0.1] = np.nan
+            columns[f"q{i}"] = values
+        elif kind == 8:
+            columns[f"q{i}"] = pd.Categorical(
+                rng.choice(["Non", "Oui", "Ne sait pas"], N_ROWS)
+            )
+        else:
+            columns[f"q{i}"] = rng.choice(
+                ["Marche local", "Consommation", None], N_ROWS
+            )
+    columns["SvyDate"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        rng.integers(0, 90, N_ROWS), unit="D"
+    )
+    return pd.DataFrame(columns)
+
+
+def test_prepare_stata_columns_throughput(wide_survey_df, measure):
+    measure(
+        "prepare_stata_columns",
+        lambda: prepare_stata_columns(wide_survey_df),
+        rows=len(wide_survey_df),
+    )
+
+
+def test_write_dta_throughput(wide_survey_df, measure, tmp_path):
+    path = measure(
+        "write_dta",
+        lambda: write_dta(wide_survey_df, tmp_path / "survey.dta"),
+        rows=len(wide_survey_df),
+    )
+    assert path.stat().st_size > 0
+
+
+def test_load_stata_throughput(wide_survey_df, measure):
+    pytest.importorskip("stata_setup")
+    measure(
+        "load_stata",
+        lambda: load_stata(wide_survey_df),
+        rows=len(wide_survey_df),
+    )
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_bridges_knots.client import OUTPUT_POLICIES
+
+pytestmark = pytest.mark.benchmark
+
+N_PRICES = 200_000
+
+
+def price_records(n):
+    """Records shaped like ``get_prices`` items, with gaps in IDs and prices"""
+    start = datetime(2015, 1, 15)
+    return [
+        {
+            "commodityPriceID": i,
+            "marketID": i % 300,
+            "marketName": f"Market {i % 300}",
+            "adm0Code": 133,
+            "adm1Code": None if i % 9 == 0 else i % 47,
+            "adm1Name": f"Region {i % 47}",
+            "commodityID": i % 80,
+            "commodityName": f"Commodity {i % 80}",
+            "commodityUnitID": 5,
+            "commodityUnitName": "KG",
+            "priceTypeID": 15,
+            "priceTypeName": "Retail",
+            "currencyID": 66,
+            "currencyName": "KES",
+            "commodityPrice": None if i % 17 == 0 else 10.0 + i % 500,
+            "commodityPriceDate": start + timedelta(days=30 * (i % 120)),
+            "commodityPriceFlag": "actual",
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def records():
+    return price_records(N_PRICES)
+
+
+@pytest.mark.parametrize("policy", OUTPUT_POLICIES)
+def test_price_frame_output_policy(make_client, measure, records, policy):
+    if policy == "arrow":
+        pytest.importorskip("pyarrow")
+    client = make_client(output_policy=policy)
+    df = measure(
+        f"to_frame_{policy}",
+        lambda: client._to_frame("market_prices_price_monthly_get", records),
+    )
+    memory_mb = df.memory_usage(deep=True).sum() / 2**20
+    print(f"to_frame_{policy}: frame uses {memory_mb:.1f} MB")
+    assert len(df) == N_PRICES
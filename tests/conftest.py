@@ -39,6 +39,32 @@ def sample_values_labels_expected():
         return json.load(f)
 
 
+@pytest.fixture
+def make_client(monkeypatch):
+    """Factory of DataBridgesKnots clients that never request a token"""
+    pytest.importorskip("data_bridges_client")
+    import data_bridges_knots.client as client_module
+
+    class OfflineToken:
+        def __init__(self, api_key=None, api_secret=None):
+            pass
+
+        def refresh(self):
+            return "offline-token"
+
+    monkeypatch.setattr(client_module, "WfpApiToken", OfflineToken)
+
+    def make(**kwargs):
+        kwargs.setdefault("requests_per_second", None)
+        kwargs.setdefault("retry_backoff", 0)
+        return client_module.DataBridgesKnots(
+            {"WFP_API_CLIENT_ID": "client-id", "WFP_API_CLIENT_SECRET": "secret"},
+            **kwargs,
+        )
+
+    return make
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--run-integration",
@@ -46,14 +72,32 @@ def pytest_addoption(parser):
         default=False,
         help="Run integration tests (API calls)",
     )
+    parser.addoption(
+        "--run-benchmark",
+        action="store_true",
+        default=False,
+        help="Run performance benchmarks",
+    )
+    parser.addoption(
+        "--update-benchmark-baseline",
+        action="store_true",
+        default=False,
+        help="Store benchmark results as the new regression baseline",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
-    if config.getoption("--run-integration"):
-        return
-
-    skip_integration = pytest.mark.skip(reason="need --run-integration option to run")
+    skips = {}
+    if not config.getoption("--run-integration"):
+        skips["integration"] = pytest.mark.skip(
+            reason="need --run-integration option to run"
+        )
+    if not config.getoption("--run-benchmark"):
+        skips["benchmark"] = pytest.mark.skip(
+            reason="need --run-benchmark option to run"
+        )
 
     for item in items:
-        if "integration" in item.keywords:
-            item.add_marker(skip_integration)
+        for keyword, skip in skips.items():
+            if keyword in item.keywords:
+                item.add_marker(skip)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.anomalies import detect_anomalies, series_metrics
+
+
+def price_rows(market, commodity, dates, values):
+    return pd.DataFrame(
+        {
+            "marketID": market,
+            "marketName": f"Market {market}",
+            "commodityID": commodity,
+            "commodityUnitID": 5,
+            "priceTypeID": 15,
+            "currencyID": 66,
+            "commodityPriceDate": pd.to_datetime(dates),
+            "commodityPrice": values,
+        }
+    )
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(1)
+    frames = []
+    for market in (1, 2, 3):
+        for commodity in (7, 8):
+            dates = pd.date_range("2020-03-01", periods=40, freq="MS") + pd.Timedelta(
+                days=14
+            )
+            keep = rng.random(40) > 0.15
+            values = rng.normal(100, 5, 40).round(1)
+            frames.append(price_rows(market, commodity, dates[keep], values[keep]))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def expected_metrics(prices, window, min_periods):
+    month = prices["commodityPriceDate"].dt.to_period("M")
+    keys = ["marketID", "commodityID"]
+    cells = (
+        prices.assign(month=month).groupby(keys + ["month"])["commodityPrice"].mean()
+    )
+
+    def per_series(series):
+        series = series.droplevel(keys)
+        full = pd.period_range(f"{series.index.min().year}-01", series.index.max())
+        series = series.reindex(full)
+        prior = series.shift(1).rolling(window, min_periods=min_periods)
+        mean, std = prior.mean(), prior.std()
+        same_month_before = series.groupby(series.index.month).transform(
+            lambda s: s.expanding().mean().shift(1)
+        )
+        return pd.DataFrame(
+            {
+                "price": series,
+                "rollingMean": mean,
+                "zScore": (series - mean) / std,
+                "momChange": series / series.shift(1) - 1,
+                "yoyChange": series / series.shift(12) - 1,
+                "seasonalDeviation": series / same_month_before - 1,
+            }
+        ).dropna(subset=["price"])
+
+    return cells.groupby(level=keys).apply(per_series)
+
+
+def test_matches_groupby_apply(prices):
+    df = detect_anomalies(prices, window=6, min_periods=3)
+    expected = expected_metrics(prices, 6, 3)
+
+    assert len(df) == len(expected)
+    assert df["marketName"].iloc[0] == "Market 1"
+    assert df["month"].iloc[0] == pd.Period("2020-03", freq="M")
+    for column in expected.columns:
+        np.testing.assert_allclose(df[column], expected[column], rtol=1e-9)
+
+
+def test_flags_spikes_and_handles_flat_windows():
+    dates = pd.date_range("2022-01-01", periods=24, freq="MS")
+    values = np.r_[np.full(12, 50.0), 50.0 + np.arange(11) % 2, 200.0]
+    df = detect_anomalies(price_rows(1, 7, dates, values), window=6)
+
+    # A flat window has no spread, so no z-score
+    assert np.isnan(df["zScore"].iloc[6])
+    assert df["anomaly"].tolist() == [False] * 23 + [True]
+    assert df["yoyChange"].iloc[-1] == 3.0
+    assert df["seasonalMean"].iloc[-1] == 50.0
+
+
+def test_skips_unusable_rows_and_empty_input(prices):
+    broken = prices.copy()
+    broken.iloc[0, broken.columns.get_loc("commodityPrice")] = None
+    broken.iloc[1, broken.columns.get_loc("marketID")] = None
+    assert len(detect_anomalies(broken)) == len(detect_anomalies(prices)) - 2
+
+    empty = detect_anomalies(prices.iloc[:0])
+    assert len(empty) == 0
+    assert {"zScore", "anomaly", "marketID"} <= set(empty.columns)
+
+    with pytest.raises(ValueError):
+        detect_anomalies(prices, window=1)
+
+
+def test_chunks_match_single_block(prices, monkeypatch):
+    whole = detect_anomalies(prices)
+    monkeypatch.setattr("data_bridges_knots.anomalies._CHUNK_ELEMENTS", 50)
+    pd.testing.assert_frame_equal(detect_anomalies(prices), whole)
+
+
+def test_series_metrics_shapes():
+    values = np.full((2, 24), np.nan)
+    values[0, ::3] = 10.0
+    metrics = series_metrics(values, window=4, min_periods=2)
+    assert all(array.shape == values.shape for array in metrics.values())
+    assert np.isnan(metrics["rollingMean"][1]).all()
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from data_bridges_knots.bundle import LabelBundle, compile_label_bundle
+from data_bridges_knots.labels import get_choice_labels, get_variable_labels
+
+
+@pytest.fixture
+def bundle(tmp_path, sample_xlsform_df):
+    path = compile_label_bundle(sample_xlsform_df, tmp_path / "2075", xls_form_id=2075)
+    return LabelBundle.load(path)
+
+
+def test_bundle_matches_variable_labels(bundle, sample_xlsform_df):
+    assert bundle.variable_labels() == get_variable_labels(sample_xlsform_df)
+
+
+def test_bundle_matches_choice_labels(bundle, sample_xlsform_df):
+    assert bundle.choice_labels() == get_choice_labels(sample_xlsform_df)
+
+
+def test_bundle_question_types(bundle):
+    types = bundle.question_types()
+    assert types["chocImpactAlim"] == "select_one"
+
+
+def test_bundle_choices_as_arrays(bundle):
+    values, labels = bundle.choices("chocImpactAlim")
+    assert values.tolist() == ["0", "1"]
+    assert labels.tolist() == ["Non", "Oui"]
+
+
+def test_bundle_map_value_labels(bundle):
+    survey = pd.DataFrame({"chocImpactAlim": [1, 0, 2], "other": [1, 0, 2]})
+    result = bundle.map_value_labels(survey)
+    assert result["chocImpactAlim"].tolist() == ["Oui", "Non", 2]
+    assert result["other"].tolist() == [1, 0, 2]
+
+
+def test_bundle_rejects_other_versions(tmp_path, sample_xlsform_df):
+    path = compile_label_bundle(sample_xlsform_df, tmp_path / "bundle")
+    (path / "bundle.json").write_text('{"format_version": 0}')
+    with pytest.raises(ValueError):
+        LabelBundle.load(path)
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from data_bridges_knots.cache import XlsFormCache
+
+
+@pytest.fixture
+def xlsform_definition():
+    return pd.DataFrame(
+        {
+            "id": [2067],
+            "fields": [
+                [
+                    {
+                        "name": "q1",
+                        "label": "Question 1",
+                        "choiceList": {
+                            "name": "yesno",
+                            "choices": [{"name": "1", "label": "Yes"}],
+                        },
+                    }
+                ]
+            ],
+        }
+    )
+
+
+def test_cache_keys_by_form_id_and_env(xlsform_definition):
+    cache = XlsFormCache()
+    entry = cache.put(2067, "prod", xlsform_definition)
+
+    assert cache.get(2067, "prod") is entry
+    assert cache.get(2067, "dev") is None
+    assert cache.get(2068, "prod") is None
+
+
+def test_cache_evicts_least_recently_used(xlsform_definition):
+    cache = XlsFormCache(maxsize=2)
+    cache.put(1, "prod", xlsform_definition)
+    cache.put(2, "prod", xlsform_definition)
+    cache.get(1, "prod")
+    cache.put(3, "prod", xlsform_definition)
+
+    assert len(cache) == 2
+    assert (1, "prod") in cache
+    assert (2, "prod") not in cache
+
+
+def test_cache_reloads_from_disk(tmp_path, xlsform_definition):
+    XlsFormCache(cache_dir=tmp_path).put(2067, "prod", xlsform_definition)
+
+    entry = XlsFormCache(cache_dir=tmp_path).get(2067, "prod")
+
+    assert entry is not None
+    assert entry.xlsform["fields"].iloc[0][0]["name"] == "q1"
+
+
+def test_cache_rejects_invalid_maxsize():
+    with pytest.raises(ValueError):
+        XlsFormCache(maxsize=0)
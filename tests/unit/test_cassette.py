@@ -0,0 +1,86 @@
+import gzip
+
+import pytest
+
+from data_bridges_knots.cassette import Cassette, CassetteMissError
+
+
+class PagedMarkets:
+    """Stand-in for a generated response model"""
+
+    def __init__(self, items, total_items):
+        self.items = items
+        self.total_items = total_items
+
+    def to_dict(self):
+        return {"items": self.items, "totalItems": self.total_items}
+
+    @classmethod
+    def from_dict(cls, obj):
+        return cls(obj["items"], obj["totalItems"])
+
+
+class FakeMarketsApi:
+    def __init__(self):
+        self.calls = 0
+
+    def markets_list_get(self, api_key=None, page=1, env="prod"):
+        self.calls += 1
+        return PagedMarkets([{"marketId": page}], total_items=2)
+
+
+def test_record_then_replay(make_client, tmp_path):
+    path = tmp_path / "markets.jsonl.gz"
+    api = FakeMarketsApi()
+
+    client = make_client(cassette=Cassette(path, mode="record"))
+    for page in (1, 2):
+        client._call_api(api.markets_list_get, "secret", page=page)
+
+    with gzip.open(path, "rt") as f:
+        content = f.read()
+    assert '"secret"' not in content
+    assert "<scrubbed>" in content
+
+    cassette = Cassette(path, mode="replay", model_modules=[__name__])
+    client = make_client(cassette=cassette)
+    response = client._call_api(api.markets_list_get, "secret", page=2)
+
+    assert api.calls == 2
+    assert isinstance(response, PagedMarkets)
+    assert response.items == [{"marketId": 2}]
+    assert client.metrics.as_dict()["endpoints"]["markets_list_get"]["requests"] == 1
+
+
+def test_replay_miss(make_client, tmp_path):
+    path = tmp_path / "empty.jsonl.gz"
+    Cassette(path, mode="record")
+    client = make_client(cassette=Cassette(path, mode="replay"))
+    with pytest.raises(CassetteMissError):
+        client._call_api(FakeMarketsApi().markets_list_get, page=1)
+
+
+def test_replay_only_builds_allowed_classes(make_client, tmp_path):
+    path = tmp_path / "markets.jsonl.gz"
+    api = FakeMarketsApi()
+    make_client(cassette=Cassette(path, mode="record"))._call_api(
+        api.markets_list_get, page=1
+    )
+
+    # The test module is not data_bridges_client.models, nor a submodule of it
+    for modules in (None, [__name__.rpartition(".")[0] + ".test_cass"]):
+        client = make_client(
+            cassette=Cassette(path, mode="replay", model_modules=modules)
+        )
+        with pytest.raises(ValueError, match="outside the allowed modules"):
+            client._call_api(api.markets_list_get, page=1)
+
+
+def test_replay_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Cassette(tmp_path / "missing.jsonl.gz", mode="replay")
+
+
+def test_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "c.jsonl.gz", mode="rewind")
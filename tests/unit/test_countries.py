@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from data_bridges_knots.countries import CountryRegistry, get_country_registry
+from data_bridges_knots.helpers import get_adm0_code
+
+
+@pytest.fixture
+def registry():
+    return get_country_registry()
+
+
+def test_registry_is_cached(registry):
+    assert get_country_registry() is registry
+
+
+def test_registry_lookups_in_every_direction(registry):
+    assert registry.get("AFG", "iso3", "adm0") == 1
+    assert registry.get(1, "adm0", "iso3") == "AFG"
+    assert registry.get("af", "iso2", "numeric") == 4
+    assert registry.get("afghanistan", "name", "iso3") == "AFG"
+    assert registry.get("XXX", "iso3", "adm0") is None
+
+
+def test_registry_returns_python_scalars(registry):
+    assert type(get_adm0_code("ETH")) is int
+    assert type(registry.get(1, "adm0", "numeric")) is int
+    assert type(registry.get(1, "adm0", "iso3")) is str
+
+
+def test_registry_country_without_adm0(registry):
+    assert registry.get("ALA", "iso3", "adm0") is None
+
+
+def test_registry_convert_series(registry):
+    adm0 = pd.Series([1, None, 1, 999999], index=[10, 11, 12, 13])
+    result = registry.convert(adm0, "adm0", "iso3")
+    assert result.index.tolist() == [10, 11, 12, 13]
+    assert result.tolist() == ["AFG", pd.NA, "AFG", pd.NA]
+
+    back = registry.convert(pd.Series(["afg", "ETH"]), "iso3", "adm0")
+    assert str(back.dtype) == "Int64"
+    assert back.iloc[0] == 1
+
+
+def test_registry_is_immutable(registry):
+    with pytest.raises(AttributeError):
+        registry.extra = 1
+
+
+def test_registry_rejects_unknown_field(registry):
+    with pytest.raises(ValueError):
+        registry.get("AFG", "iso3", "capital")
+
+
+def test_get_adm0_code_uses_registry():
+    assert get_adm0_code("afg") == 1
+    assert get_adm0_code("XXX") is None
+    with pytest.raises(TypeError):
+        get_adm0_code(1)
+
+
+def test_registry_from_records():
+    registry = CountryRegistry(
+        [{"iso3Alpha3": "AAA", "iso3Alpha2": "AA", "name": "A", "adm0Code": 7}]
+    )
+    assert len(registry) == 1
+    assert registry.get(7, "adm0", "iso2") == "AA"
+    assert registry.get("AAA", "iso3", "numeric") is None
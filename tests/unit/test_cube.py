@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.cube import PriceCube
+
+
+@pytest.fixture
+def prices():
+    rows = []
+    for market in (10, 20):
+        for commodity, base in ((1, 100.0), (2, 50.0)):
+            for month in range(1, 7):
+                if (market, commodity, month) == (20, 2, 3):
+                    continue  # a gap
+                rows.append(
+                    {
+                        "marketID": market,
+                        "marketName": f"Market {market}",
+                        "commodityID": commodity,
+                        "commodityName": f"Commodity {commodity}",
+                        "commodityUnitID": 5,
+                        "priceTypeID": 15,
+                        "currencyID": 66,
+                        "commodityPriceDate": f"2024-{month:02d}-15T00:00:00",
+                        "commodityPrice": base + month + (market == 20) * 10,
+                    }
+                )
+    df = pd.DataFrame(rows)
+    # A second price in one month is averaged, unusable rows are skipped
+    extra = df.iloc[[0, 0, 0]].reset_index(drop=True)
+    extra["commodityPrice"] = [103.0, None, 1.0]
+    extra.loc[2, "commodityPriceDate"] = None
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def test_from_prices_builds_dense_cube(prices):
+    cube = PriceCube.from_prices(prices)
+
+    assert cube.shape == (2, 2, 6)
+    assert cube.markets["marketID"].tolist() == [10, 20]
+    assert cube.markets["marketName"].tolist() == ["Market 10", "Market 20"]
+    assert cube.series["commodityName"].tolist() == ["Commodity 1", "Commodity 2"]
+    assert str(cube.months[0]) == "2024-01" and str(cube.months[-1]) == "2024-06"
+    assert cube.values[0, 0, 0] == pytest.approx((101.0 + 103.0) / 2)
+    assert cube.values[1, 1, 1] == 62.0
+    assert np.isnan(cube.values[1, 1, 2])
+    assert cube.fill_ratio == pytest.approx(23 / 24)
+
+
+def test_sel(prices):
+    cube = PriceCube.from_prices(prices)
+    part = cube.sel(markets=[20], commodities=[2], start="2024-02", end="2024-04")
+
+    assert part.shape == (1, 1, 3)
+    np.testing.assert_array_equal(part.values[0, 0], [62.0, np.nan, 64.0])
+    part.values[:] = 0
+    assert cube.values[1, 1, 1] == 62.0
+
+
+def test_rolling_mean_and_pct_change(prices):
+    cube = PriceCube.from_prices(prices).sel(markets=[20], commodities=[2])
+    series = pd.Series(cube.values[0, 0])
+
+    rolling = cube.rolling_mean(3, min_periods=2).values[0, 0]
+    expected = series.rolling(3, min_periods=2).mean().to_numpy()
+    np.testing.assert_allclose(rolling, expected)
+
+    change = cube.pct_change(1).values[0, 0]
+    np.testing.assert_allclose(change, series.pct_change(fill_method=None).to_numpy())
+
+
+def test_aggregate(prices):
+    cube = PriceCube.from_prices(prices)
+
+    national = cube.aggregate("market", "median")
+    assert national.shape == (2, 6)
+    assert national.index.names == [
+        "commodityID",
+        "commodityUnitID",
+        "priceTypeID",
+        "currencyID",
+    ]
+    assert national.loc[(2, 5, 15, 66), pd.Period("2024-03", "M")] == 53.0
+    assert national.iloc[0, 1] == pytest.approx((102.0 + 112.0) / 2)
+
+    counts = cube.aggregate("month", "count")
+    assert counts.loc[20].tolist() == [6, 5]
+    with pytest.raises(ValueError):
+        cube.aggregate("commodity")
+
+
+def test_to_frame_round_trip(prices):
+    cube = PriceCube.from_prices(prices)
+    df = cube.to_frame()
+
+    assert len(df) == 23
+    rebuilt = PriceCube.from_prices(
+        df.assign(commodityPriceDate=df["month"].dt.to_timestamp()),
+        date_column="commodityPriceDate",
+        price_column="price",
+    )
+    np.testing.assert_array_equal(rebuilt.values, cube.values)
+
+
+def test_empty_prices(prices):
+    cube = PriceCube.from_prices(prices.iloc[:0])
+    assert cube.shape == (0, 0, 0)
+    assert "no months" in repr(cube)
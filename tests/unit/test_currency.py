@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.currency import (
+    ExchangeRateIndex,
+    convert_to_usd,
+    prepare_rates,
+)
+
+
+@pytest.fixture
+def rates():
+    # Unsorted, with a duplicated date and unusable rows
+    return pd.DataFrame(
+        {
+            "name": ["KES", "kes", "KES", "UGX", "KES", "KES"],
+            "date": [
+                "2024-02-29T00:00:00",
+                "2024-01-31T00:00:00",
+                "2024-02-29T00:00:00",
+                "2024-01-01T00:00:00",
+                None,
+                "2024-03-31T00:00:00",
+            ],
+            "value": [150.0, 140.0, 155.0, 3800.0, 1.0, None],
+            "isOfficial": [False, True, True, True, True, True],
+            "countryISO3": ["KEN"] * 6,
+        }
+    )
+
+
+@pytest.fixture
+def prices():
+    return pd.DataFrame(
+        {
+            "currencyName": ["KES", "KES", "UGX", "USD", "KES", None, "KES"],
+            "commodityPriceDate": [
+                "2024-03-15T00:00:00",
+                "2024-01-15T00:00:00",
+                "2024-02-15T00:00:00",
+                "2024-02-15T00:00:00",
+                None,
+                "2024-03-01T00:00:00",
+                "2024-02-29T00:00:00",
+            ],
+            "commodityPrice": [310.0, 300.0, 7600.0, 2.0, 1.0, 1.0, 155.0],
+            "countryISO3": ["KEN"] * 7,
+        }
+    )
+
+
+def test_prepare_rates_sorts_and_prefers_official(rates):
+    series = prepare_rates(rates)
+
+    assert series["currency"].tolist() == ["UGX", "KES", "KES"]
+    assert series["date"].is_monotonic_increasing
+    assert series["rate"].tolist() == [3800.0, 140.0, 155.0]
+
+    unofficial = prepare_rates(rates, official=False)
+    assert unofficial["rate"].tolist() == [150.0]
+
+
+def test_convert_to_usd_as_of_join(prices, rates):
+    df = convert_to_usd(prices, prepare_rates(rates))
+
+    np.testing.assert_allclose(
+        df["exchangeRate"], [155.0, np.nan, 3800.0, 1.0, np.nan, np.nan, 155.0]
+    )
+    np.testing.assert_allclose(
+        df["usdPrice"], [2.0, np.nan, 2.0, 2.0, np.nan, np.nan, 1.0]
+    )
+    assert df["exchangeRateDate"].iloc[0] == pd.Timestamp("2024-02-29")
+    # Original order and columns are kept
+    assert df["commodityPrice"].tolist() == prices["commodityPrice"].tolist()
+    assert "usdPrice" not in prices
+
+
+def test_convert_to_usd_tolerance(prices, rates):
+    df = convert_to_usd(prices, prepare_rates(rates), tolerance="20D")
+
+    # The UGX rate is 45 days old, the March KES price 15 days
+    assert np.isnan(df["usdPrice"].iloc[2])
+    assert df["usdPrice"].iloc[0] == 2.0
+
+
+def test_index_lookup_matches_merge_asof(prices, rates):
+    index = ExchangeRateIndex(rates)
+    expected = convert_to_usd(prices, prepare_rates(rates))
+    df = convert_to_usd(prices, index)
+
+    np.testing.assert_array_equal(df["exchangeRate"], expected["exchangeRate"])
+    np.testing.assert_array_equal(df["exchangeRateDate"], expected["exchangeRateDate"])
+    pd.testing.assert_frame_equal(index.to_frame(), prepare_rates(rates))
+
+
+def test_index_rate_types_and_tolerance(rates):
+    index = ExchangeRateIndex(rates)
+
+    assert index.currencies == ["KES", "UGX"]
+    assert len(index) == 4
+    assert index.rate("kes", "2024-03-10") == 155.0
+    assert index.rate("KES", "2024-03-10", official=False) == 150.0
+    assert index.rate("KES", "2024-02-10") == 140.0
+    assert np.isnan(index.rate("KES", "2024-01-01"))
+    assert np.isnan(index.rate("KES", "2024-03-10", tolerance="5D"))
+    assert np.isnan(index.rate("EUR", "2024-03-10"))
+    assert np.isnan(index.rate("KES", None))
+
+    rates_out, dates_out = index.lookup(["UGX", None, "KES"], ["2024-05-01"] * 3)
+    np.testing.assert_array_equal(rates_out, [3800.0, np.nan, 155.0])
+    assert np.isnat(dates_out[1])
+
+
+def test_index_append_newer_and_revised_rates(rates):
+    index = ExchangeRateIndex(rates.iloc[:3])
+    assert np.isnan(index.rate("UGX", "2024-05-01"))
+
+    index.append(rates.iloc[3:])
+    assert index.rate("UGX", "2024-05-01") == 3800.0
+
+    newer = pd.DataFrame(
+        {
+            "name": ["KES", "KES"],
+            "date": ["2024-04-30", "2024-01-31"],
+            "value": [160.0, 141.0],
+            "isOfficial": [True, True],
+        }
+    )
+    index.append(newer)
+    assert index.rate("KES", "2024-05-01") == 160.0
+    # A rate given again for a known date replaces the old one
+    assert index.rate("KES", "2024-02-10") == 141.0
+    assert index.to_frame()["date"].is_monotonic_increasing
+
+    merged = ExchangeRateIndex()
+    merged.append(index)
+    assert len(merged) == len(index)
+    assert len(ExchangeRateIndex().to_frame()) == 0
+
+
+def test_client_convert_to_usd_caches_rates(make_client, prices, rates):
+    client = make_client()
+    calls = []
+
+    def get_exchange_rates(country_iso3, page_size=1000):
+        calls.append(country_iso3)
+        return rates
+
+    client.get_exchange_rates = get_exchange_rates
+
+    first = client.convert_to_usd(prices)
+    second = client.convert_to_usd(prices, tolerance="20D")
+
+    assert calls == ["KEN"]
+    assert first["usdPrice"].iloc[2] == 2.0
+    assert np.isnan(second["usdPrice"].iloc[2])
+
+    # The index holds both rate types, so filtering needs no new request
+    unofficial = client.convert_to_usd(prices, official=False)
+    assert calls == ["KEN"]
+    assert unofficial["exchangeRate"].iloc[0] == 150.0
+
+    with pytest.raises(ValueError):
+        client.convert_to_usd(prices.drop(columns="countryISO3"))
@@ -0,0 +1,190 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.helpers import (
+    compact_frame,
+    get_frame_countries,
+    is_polars_frame,
+    records_to_arrow,
+    records_to_polars,
+    to_pandas_frame,
+    to_polars_frame,
+)
+
+
+def price_records(n=200):
+    return [
+        {
+            "marketID": i % 5,
+            "marketName": f"Market {i % 5}",
+            "adm1Code": None if i % 7 == 0 else 1000 + i % 3,
+            "commodityPrice": None if i % 11 == 0 else 10.0 + i,
+            "commodityPriceDate": datetime(2024, 1 + i % 12, 15),
+            "commodityPriceInsertDate": f"2024-{1 + i % 12:02d}-20T10:00:00",
+            "commodityPriceFlag": "actual",
+            "commodityPriceSourceName": f"Source {i}",
+            "isOfficial": None if i % 13 == 0 else bool(i % 2),
+        }
+        for i in range(n)
+    ]
+
+
+def test_compact_frame_types_columns_by_content():
+    legacy = pd.DataFrame(price_records()).replace({np.nan: None})
+    df = compact_frame(pd.DataFrame(price_records(), dtype=object))
+
+    assert df["marketID"].dtype == "Int32"
+    assert df["adm1Code"].dtype == "Int32"
+    assert df["adm1Code"].isna().sum() == legacy["adm1Code"].isna().sum()
+    assert df["commodityPrice"].dtype == "float64"
+    assert df["commodityPriceDate"].dtype.kind == "M"
+    assert df["commodityPriceInsertDate"].dtype.kind == "M"
+    assert df["isOfficial"].dtype == "boolean"
+    assert isinstance(df["marketName"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["commodityPriceFlag"].dtype, pd.CategoricalDtype)
+    # Mostly distinct strings gain nothing from categories
+    assert not isinstance(df["commodityPriceSourceName"].dtype, pd.CategoricalDtype)
+
+    assert df.memory_usage(deep=True).sum() < legacy.memory_usage(deep=True).sum() / 3
+
+
+def test_compact_frame_keeps_typed_and_mixed_columns():
+    source = pd.DataFrame(
+        {
+            "price": [1.5, np.nan],
+            "mixed": pd.Series([1, "a"], dtype=object),
+            "big": pd.Series([2**40, None], dtype=object),
+            "notDate": ["2024-01-01", "soon"],
+        }
+    )
+    df = compact_frame(source, category_ratio=0)
+
+    assert df["price"].dtype == "float64"
+    assert df["mixed"].dtype == object
+    assert df["big"].dtype == "Int64"
+    assert df["notDate"].tolist() == ["2024-01-01", "soon"]
+    assert source["big"].dtype == object
+    assert len(compact_frame(pd.DataFrame())) == 0
+
+
+def test_compact_frame_keeps_missing_strings():
+    source = pd.DataFrame({"src": ["a", "b", None, "d"]}, dtype=object)
+    df = compact_frame(source)
+
+    assert not isinstance(df["src"].dtype, pd.CategoricalDtype)
+    assert df["src"].isna().tolist() == [False, False, True, False]
+    assert df["src"].dropna().tolist() == ["a", "b", "d"]
+
+
+def test_get_frame_countries():
+    df = pd.DataFrame({"countryISO3": ["ken", None, "KEN", "uga"]})
+    assert get_frame_countries(df) == ["KEN", "UGA"]
+    assert get_frame_countries(df, column="iso3") == []
+
+
+def test_client_to_frame_compact(make_client):
+    client = make_client()
+    records = price_records()
+
+    legacy = client._to_frame("market_prices_price_monthly_get", records)
+    compact = client._to_frame("market_prices_price_monthly_get", records, compact=True)
+
+    assert legacy["adm1Code"].dtype == object
+    assert legacy["adm1Code"].iloc[0] is None
+    assert compact["adm1Code"].dtype == "Int32"
+    pd.testing.assert_series_equal(
+        compact["commodityPrice"],
+        legacy["commodityPrice"].astype(float),
+    )
+
+
+def test_records_to_arrow_stringifies_mixed_columns():
+    pytest.importorskip("pyarrow")
+    table = records_to_arrow(
+        [{"id": 1, "code": "A1"}, {"id": None, "code": 7, "extra": float("nan")}]
+    )
+
+    assert table.column_names == ["id", "code", "extra"]
+    assert table.column("id").to_pylist() == [1, None]
+    assert table.column("code").to_pylist() == ["A1", "7"]
+    assert table.column("extra").null_count == 2
+    assert records_to_arrow([]).num_rows == 0
+
+    mixed = records_to_arrow([{"v": 1}, {"v": "x"}, {"v": float("nan")}, {"v": [1]}])
+    assert mixed.column("v").to_pylist() == ["1", "x", None, "[1]"]
+
+
+def test_client_output_policies(make_client):
+    records = price_records()
+
+    nullable = make_client(output_policy="pandas_nullable")._to_frame(
+        "market_prices_price_monthly_get", records
+    )
+    pd.testing.assert_frame_equal(
+        nullable, compact_frame(pd.DataFrame(records, dtype=object))
+    )
+
+    pytest.importorskip("pyarrow")
+    client = make_client(output_policy="arrow")
+    df = client._to_frame("market_prices_price_monthly_get", records)
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    assert df["adm1Code"].isna().sum() == nullable["adm1Code"].isna().sum()
+    assert df["commodityPrice"].sum() == pytest.approx(nullable["commodityPrice"].sum())
+    # Raw frames keep pandas' own types in every policy
+    raw = client._to_frame("household_full_data_get", records, replace_nan=False)
+    assert raw["commodityPrice"].dtype == "float64"
+
+    with pytest.raises(ValueError, match="output_policy"):
+        make_client(output_policy="polars")
+
+
+def test_client_pandas_nullable_keeps_missing_strings(make_client):
+    records = price_records()
+    for record in records[::4]:
+        record["commodityPriceSourceName"] = None
+
+    df = make_client(output_policy="pandas_nullable")._to_frame(
+        "market_prices_price_monthly_get", records
+    )
+
+    source = df["commodityPriceSourceName"]
+    assert source.isna().sum() == len(records[::4])
+    assert "None" not in set(source.dropna())
+
+
+def test_records_to_polars_falls_back_to_strings():
+    pytest.importorskip("polars")
+    df = records_to_polars([{"a": [1], "b": 1}, {"a": 2, "c": None}])
+
+    assert df.columns == ["a", "b", "c"]
+    assert df["a"].to_list() == ["[1]", "2"]
+    assert df["b"].to_list() == [1, None]
+    assert records_to_polars([]).shape == (0, 0)
+
+    assert is_polars_frame(df)
+    assert not is_polars_frame(pd.DataFrame())
+    pytest.importorskip("pyarrow")
+    assert isinstance(to_pandas_frame(df), pd.DataFrame)
+    assert to_polars_frame(to_pandas_frame(df)).equals(df)
+
+
+def test_client_polars_backend(make_client):
+    pl = pytest.importorskip("polars")
+    client = make_client(backend="polars", output_policy="pandas_nullable")
+    records = price_records()
+
+    df = client._to_frame("market_prices_price_monthly_get", records)
+    assert isinstance(df, pl.DataFrame)
+    assert df["adm1Code"].dtype == pl.Int64
+    assert df["adm1Code"].null_count() == sum(r["adm1Code"] is None for r in records)
+    assert df["commodityPriceDate"].dtype == pl.Datetime
+    assert isinstance(
+        client._to_frame("xls_forms_definition_get", records, backend="pandas"),
+        pd.DataFrame,
+    )
+
+    with pytest.raises(ValueError, match="backend"):
+        make_client(backend="spark")
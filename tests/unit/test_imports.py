@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("data_bridges_client", "pandas", "numpy", "yaml")
+
+
+def _modules_after(statement):
+    code = (
+        f"import sys; {statement}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return [m for m in output.stdout.strip().split(",") if m]
+
+
+def test_package_import_defers_heavy_modules():
+    assert _modules_after("import data_bridges_knots") == []
+
+
+def test_labels_do_not_load_generated_client():
+    assert "data_bridges_client" not in _modules_after(
+        "from data_bridges_knots import get_variable_labels"
+    )
+
+
+def test_unknown_attribute_raises():
+    import data_bridges_knots
+
+    with pytest.raises(AttributeError):
+        data_bridges_knots.does_not_exist
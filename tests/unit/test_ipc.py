@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from data_bridges_knots.helpers import (
+    frame_library,
+    is_arrow_table,
+    to_arrow_table,
+    to_frame_library,
+    to_pandas_frame,
+)
+from data_bridges_knots.ipc import read_ipc, write_ipc
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def table():
+    return pa.table(
+        {
+            "hhId": pa.array(range(100_000), pa.int64()),
+            "region": pa.array(["north", None, "south", "east"] * 25_000),
+            "fcs": pa.array([12.5, None, 40.0, 55.5] * 25_000),
+        }
+    )
+
+
+def test_write_and_memory_map(tmp_path, table):
+    write_ipc(table, tmp_path / "survey.arrow", chunk_size=30_000)
+
+    allocated = pa.total_allocated_bytes()
+    mapped = read_ipc(tmp_path / "survey.arrow")
+    # The columns point into the mapped file
+    assert pa.total_allocated_bytes() == allocated
+    assert mapped.equals(table)
+    assert mapped.column("hhId").num_chunks == 4
+
+    read = read_ipc(tmp_path / "survey.arrow", memory_map=False)
+    assert read.equals(table)
+
+
+def test_write_compressed_and_other_libraries(tmp_path, table):
+    write_ipc(table, tmp_path / "survey.feather", compression="zstd")
+    assert read_ipc(tmp_path / "survey.feather").equals(table)
+
+    df = table.to_pandas()
+    write_ipc(df, tmp_path / "pandas.arrow")
+    pd.testing.assert_frame_equal(read_ipc(tmp_path / "pandas.arrow").to_pandas(), df)
+
+    with pytest.raises(ValueError, match="compression"):
+        write_ipc(table, tmp_path / "survey.arrow", compression="gzip")
+
+
+def test_polars_frames_share_buffers(tmp_path, table):
+    pl = pytest.importorskip("polars")
+    df = pl.from_arrow(table)
+
+    assert is_arrow_table(to_arrow_table(df))
+    write_ipc(df, tmp_path / "polars.arrow")
+    assert pl.from_arrow(read_ipc(tmp_path / "polars.arrow")).equals(df)
+
+
+def test_frame_library_round_trip(table):
+    table = table.slice(0, 8)
+    df = to_pandas_frame(table)
+
+    assert isinstance(df, pd.DataFrame)
+    assert frame_library(table) == "arrow"
+    assert frame_library(df) == "pandas"
+    assert not is_arrow_table(df)
+    assert to_frame_library(df, "arrow").to_pylist() == table.to_pylist()
+    assert to_frame_library(df, "pandas") is df
+
+
+def test_client_arrow_backend(make_client):
+    client = make_client(backend="arrow", output_policy="pandas_nullable")
+    records = [
+        {"marketId": 1, "adm1Code": 10, "commodityPrice": 12.5},
+        {"marketId": 2, "adm1Code": None, "commodityPrice": None},
+    ]
+
+    table = client._to_frame("market_prices_price_monthly_get", records)
+    assert is_arrow_table(table)
+    assert table.schema.field("adm1Code").type == pa.int64()
+    assert table.column("commodityPrice").null_count == 1
+    assert isinstance(
+        client._to_frame("xls_forms_definition_get", records, backend="pandas"),
+        pd.DataFrame,
+    )
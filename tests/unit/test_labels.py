@@ -1,10 +1,16 @@
 from typing import Dict
 
+import json
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from data_bridges_knots.bundle import LabelBundle, compile_label_bundle
 from data_bridges_knots.labels import (
     get_choice_labels,
     get_variable_labels,
+    map_value_labels,
 )
 
 
@@ -32,6 +38,12 @@ def test_get_variable_labels_empty_label():
     assert result == expected
 
 
+def test_get_variable_labels_missing_label():
+    df = pd.DataFrame({"name": ["q1", "q2", "q3"], "label": [None, np.nan, "Q3"]})
+    result = get_variable_labels(df)
+    assert result == {"q1": "q1", "q2": "q2", "q3": "Q3"}
+
+
 def test_get_variable_labels_duplicate_names():
     data = {"name": ["q1", "q1", "q2"], "label": ["First", "Second", "Second Question"]}
     df = pd.DataFrame(data)
@@ -83,3 +95,89 @@ def test_return_value_labels_as_dict(sample_xlsform_df):
 def test_return_value_labels_as_json(sample_xlsform_df):
     result = get_choice_labels(sample_xlsform_df, "json")
     assert isinstance(result, str)
+
+
+# % TESTS FOR the polars implementations
+def test_polars_labels_match_pandas(sample_xlsform_df):
+    pl = pytest.importorskip("polars")
+    xlsform = pl.from_pandas(sample_xlsform_df)
+
+    assert get_choice_labels(xlsform) == get_choice_labels(sample_xlsform_df.copy())
+    assert get_variable_labels(xlsform) == get_variable_labels(sample_xlsform_df)
+    assert isinstance(get_variable_labels(xlsform, format="df"), pl.DataFrame)
+
+
+def test_polars_variable_labels_duplicates_and_empty():
+    pl = pytest.importorskip("polars")
+    df = pl.DataFrame(
+        {"name": ["q1", "q2", "q1", "q3"], "label": ["First", "", "Second", None]}
+    )
+    assert get_variable_labels(df) == {"q1": "Second", "q2": "q2", "q3": "q3"}
+    assert get_variable_labels(df.clear()) == {}
+
+
+def test_polars_choice_labels_from_api_structs():
+    pl = pytest.importorskip("polars")
+    xlsform = pl.from_dicts(
+        [
+            {
+                "name": "q1",
+                "label": "Q1",
+                "choiceList": {
+                    "name": "yesno",
+                    "choices": [
+                        {"name": "0", "label": "No"},
+                        {"name": "1", "label": "Yes"},
+                    ],
+                },
+            },
+            {"name": "q2", "label": "Q2", "choiceList": None},
+        ]
+    )
+    assert get_choice_labels(xlsform) == {"q1": {"0": "No", "1": "Yes"}}
+    assert json.loads(get_choice_labels(xlsform, format="json")) == {
+        "q1": {"0": "No", "1": "Yes"}
+    }
+
+    survey = pl.DataFrame({"q1": [0, 1, None, 7], "other": [0, 1, 2, 3]})
+    labelled = map_value_labels(survey, xlsform)
+    assert labelled["q1"].to_list() == ["No", "Yes", None, "7"]
+    assert labelled["other"].to_list() == [0, 1, 2, 3]
+
+
+def test_polars_map_value_labels_matches_bundle(
+    tmp_path, sample_survey_df, sample_xlsform_df
+):
+    pl = pytest.importorskip("polars")
+    compile_label_bundle(sample_xlsform_df, tmp_path / "bundle")
+    expected = LabelBundle.load(tmp_path / "bundle").map_value_labels(sample_survey_df)
+    labelled = map_value_labels(
+        pl.from_pandas(sample_survey_df), pl.from_pandas(sample_xlsform_df)
+    )
+    assert labelled.columns == list(expected.columns)
+    for column in expected.columns:
+        assert labelled[column].cast(pl.String).to_list() == [
+            str(value) for value in expected[column]
+        ]
+
+
+def test_arrow_map_value_labels():
+    pa = pytest.importorskip("pyarrow")
+    xlsform = pd.DataFrame(
+        {
+            "name": ["q1", "q2"],
+            "choiceList": [
+                {"choices": [{"name": 0, "label": "No"}, {"name": 1, "label": "Yes"}]},
+                {"choices": [{"name": "a", "label": "Option A"}]},
+            ],
+        }
+    )
+    survey = pa.table({"q1": [0, 1, 7], "q2": ["a", "b", None], "other": [1, 2, 3]})
+
+    labelled = map_value_labels(survey, xlsform)
+
+    assert isinstance(labelled, pa.Table)
+    assert labelled.column_names == ["q1", "q2", "other"]
+    # Unlabelled codes next to labels are kept as strings
+    assert labelled.column("q1").to_pylist() == ["No", "Yes", "7"]
+    assert labelled.column("q2").to_pylist() == ["Option A", "b", None]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.labels import get_variable_labels
+from data_bridges_knots.load_stata import prepare_stata_columns, write_dta
+
+
+@pytest.fixture
+def dta_path(tmp_path):
+    return tmp_path / "survey.dta"
+
+
+def test_write_dta_round_trip(dta_path, sample_survey_df):
+    write_dta(sample_survey_df, dta_path)
+    result = pd.read_stata(dta_path, convert_categoricals=False)
+    assert result.shape == sample_survey_df.shape
+    assert result["HHIncSec_Est"].tolist() == sample_survey_df["HHIncSec_Est"].tolist()
+
+
+def test_write_dta_labels_from_xlsform(dta_path, sample_survey_df, sample_xlsform_df):
+    write_dta(sample_survey_df, dta_path, xlsform_df=sample_xlsform_df)
+
+    with pd.io.stata.StataReader(dta_path) as reader:
+        variable_labels = reader.variable_labels()
+        value_labels = reader.value_labels()
+
+    expected = get_variable_labels(sample_xlsform_df)["HHAssetSofa"]
+    assert variable_labels["HHAssetSofa"] == expected[:80]
+    assert value_labels["chocImpactAlim"] == {0: "Non", 1: "Oui"}
+
+
+def test_write_dta_text_codes_and_names(dta_path):
+    df = pd.DataFrame(
+        {
+            "bad name": ["yes", "no", None],
+            "when": pd.to_datetime(["2024-01-01", "2024-02-01", None]),
+        }
+    )
+    write_dta(df, dta_path, value_labels={"bad name": {"yes": "Yes", "no": "No"}})
+
+    result = pd.read_stata(dta_path)
+    assert list(result.columns) == ["bad_name", "when"]
+    assert result["bad_name"].tolist()[:2] == ["Yes", "No"]
+    assert result["when"].iloc[1] == pd.Timestamp("2024-02-01")
+
+
+def test_write_dta_unmatched_codes_stay_unlabelled(dta_path):
+    df = pd.DataFrame({"q1": ["yes", "maybe"]})
+    write_dta(df, dta_path, value_labels={"q1": {"yes": "Yes"}})
+    assert pd.read_stata(dta_path)["q1"].tolist() == ["yes", "maybe"]
+
+
+def test_prepare_stata_columns_dates_as_day_numbers():
+    df = pd.DataFrame({"when": pd.to_datetime(["1960-01-02", None, "2024-01-01"])})
+    (column,) = prepare_stata_columns(df)
+    assert column.format == "%tdCCYY-NN-DD"
+    np.testing.assert_array_equal(column.values, [1, np.nan, 23376])
+
+
+def test_prepare_stata_columns_types():
+    df = pd.DataFrame(
+        {
+            "cat": pd.Categorical(["a", None, "b"]),
+            "small": [1, 2, 3],
+            "large": [1, 2, 300_000],
+            "text": ["é", None, "abc"],
+        }
+    )
+    cat, small, large, text = prepare_stata_columns(df)
+    assert cat.value_labels == {1: "a", 2: "b"}
+    np.testing.assert_array_equal(cat.values, [1, np.nan, 2])
+    assert (small.storage, large.storage) == ("byte", "long")
+    assert (text.storage, text.str_length) == ("str", 3)
+    assert text.values.tolist() == ["é", "", "abc"]
@@ -0,0 +1,33 @@
+import io
+import logging
+
+from data_bridges_knots.log import PACKAGE_LOGGER, disable_logging, enable_logging
+
+
+def test_package_logger_has_no_output_by_default():
+    import data_bridges_knots  # noqa: F401
+
+    handlers = logging.getLogger(PACKAGE_LOGGER).handlers
+    assert all(isinstance(h, logging.NullHandler) for h in handlers)
+
+
+def test_enable_logging_through_queue_with_request_fields():
+    stream = io.StringIO()
+    enable_logging(handler=logging.StreamHandler(stream))
+    logging.getLogger(f"{PACKAGE_LOGGER}.client").info(
+        "Request completed",
+        extra={"endpoint": "markets_list_get", "page": 2, "latency": 0.5, "rows": 10},
+    )
+    disable_logging()
+
+    line = stream.getvalue()
+    assert "Request completed" in line
+    assert "endpoint=markets_list_get page=2 latency=0.5 rows=10" in line
+
+
+def test_disable_logging_removes_handler():
+    stream = io.StringIO()
+    enable_logging(handler=logging.StreamHandler(stream), use_queue=False)
+    disable_logging()
+    logging.getLogger(PACKAGE_LOGGER).info("dropped")
+    assert stream.getvalue() == ""
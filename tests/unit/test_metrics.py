@@ -0,0 +1,96 @@
+import pytest
+
+from data_bridges_knots.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    metrics = MetricsRegistry(latency_buckets=(0.1, 1.0))
+    metrics.record_request("markets_list_get", 0.05, bytes_received=100)
+    metrics.record_request("markets_list_get", 0.5, bytes_received=200)
+    metrics.record_retry("markets_list_get")
+    metrics.record_conversion("markets_list_get", 0.002, rows=30)
+    return metrics
+
+
+def test_registry_as_dict(registry):
+    endpoint = registry.as_dict()["endpoints"]["markets_list_get"]
+    assert endpoint["requests"] == 2
+    assert endpoint["retries"] == 1
+    assert endpoint["bytes_received"] == 300
+    assert endpoint["rows_parsed"] == 30
+    assert endpoint["latency_seconds"]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 2}
+    assert endpoint["latency_seconds"]["count"] == 2
+    assert endpoint["conversion_seconds"]["count"] == 1
+
+
+def test_registry_to_prometheus(registry):
+    text = registry.to_prometheus()
+    assert "# TYPE databridges_requests_total counter" in text
+    assert 'databridges_requests_total{endpoint="markets_list_get"} 2' in text
+    assert (
+        'databridges_request_latency_seconds_bucket{endpoint="markets_list_get",'
+        'le="0.1"} 1' in text
+    )
+    assert (
+        'databridges_request_latency_seconds_bucket{endpoint="markets_list_get",'
+        'le="+Inf"} 2' in text
+    )
+    assert (
+        'databridges_request_latency_seconds_count{endpoint="markets_list_get"} 2'
+        in text
+    )
+    assert "databridges_token_refresh_seconds_count 0" in text
+
+
+def test_registry_reset(registry):
+    registry.reset()
+    assert registry.as_dict()["endpoints"] == {}
+
+
+class _FakeResponse:
+    def __init__(self, data, raw_data):
+        self.data = data
+        self.raw_data = raw_data
+
+
+class _FakeApi:
+    def __init__(self, failures):
+        self.failures = failures
+
+    def markets_list_get(self, **kwargs):
+        return self.markets_list_get_with_http_info(**kwargs).data
+
+    def markets_list_get_with_http_info(self, **kwargs):
+        from data_bridges_client.rest import ApiException
+
+        if self.failures:
+            self.failures -= 1
+            raise ApiException(status=429, reason="Too Many Requests")
+        return _FakeResponse([{"marketId": 1}, {"marketId": 2}], b"x" * 42)
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(max_retries=2)
+
+
+def test_call_api_records_metrics_and_retries(client):
+    api = _FakeApi(failures=1)
+    items = client._call_api(api.markets_list_get, page=1)
+    df = client._to_frame("markets_list_get", items)
+
+    endpoint = client.metrics.as_dict()["endpoints"]["markets_list_get"]
+    assert endpoint["requests"] == 2
+    assert endpoint["errors"] == 1
+    assert endpoint["retries"] == 1
+    assert endpoint["bytes_received"] == 42
+    assert endpoint["rows_parsed"] == len(df) == 2
+
+
+def test_call_api_gives_up_after_max_retries(client):
+    from data_bridges_client.rest import ApiException
+
+    with pytest.raises(ApiException):
+        client._call_api(_FakeApi(failures=5).markets_list_get)
+    assert client.metrics.as_dict()["endpoints"]["markets_list_get"]["retries"] == 2
@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+
+import threading
+import time
+
+import pytest
+
+from data_bridges_knots.pagination import RateLimiter, page_count
+
+
+def test_page_count():
+    assert page_count(0, 0) == 1
+    assert page_count(20, 20) == 1
+    assert page_count(21, 20) == 2
+    assert page_count(2500, 1000) == 3
+
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(requests_per_second=None)
+    assert all(limiter.acquire() == 0 for _ in range(100))
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(requests_per_second=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # The first request is free, the next five wait 1/50 s each
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_rate_limiter_validates_arguments():
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_second=0)
+    with pytest.raises(ValueError):
+        RateLimiter(burst=0)
+
+
+class Page:
+    def __init__(self, items, total_items):
+        self.items = items
+        self.total_items = total_items
+
+
+class FakeListApi:
+    def __init__(self, total_items, page_length, report_total=True):
+        self.total_items = total_items
+        self.page_length = page_length
+        self.report_total = report_total
+        self.pages = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def markets_list_get(self, page=1, env="prod"):
+        with self._lock:
+            self.pages.append(page)
+            self.threads.add(threading.get_ident())
+        time.sleep(0.01)
+        start = (page - 1) * self.page_length
+        stop = min(start + self.page_length, self.total_items)
+        items = [{"row": i} for i in range(start, stop)]
+        return Page(items, self.total_items if self.report_total else None)
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(max_workers=4)
+
+
+def test_fetch_single_page(client):
+    api = FakeListApi(total_items=95, page_length=20)
+    items = client._fetch_pages(api.markets_list_get, page=3, env="prod")
+    assert [item["row"] for item in items] == list(range(40, 60))
+    assert api.pages == [3]
+
+
+def test_fetch_all_pages_concurrently_in_order(client):
+    api = FakeListApi(total_items=95, page_length=20)
+    items = client._fetch_pages(api.markets_list_get, page=3, all_pages=True)
+    assert [item["row"] for item in items] == list(range(95))
+    assert sorted(api.pages) == [1, 2, 3, 4, 5]
+    assert len(api.threads) > 1
+
+
+def test_fetch_all_pages_without_total_items(client):
+    api = FakeListApi(total_items=45, page_length=20, report_total=False)
+    items = client._fetch_pages(api.markets_list_get, all_pages=True)
+    assert len(items) == 45
+    assert api.pages == [1, 2, 3]
+
+
+class ExpiringTokenApi(FakeListApi):
+    """Rejects the first token from page 3 on, like a token expiring mid-fetch"""
+
+    def __init__(self, client, **kwargs):
+        super().__init__(**kwargs)
+        self.api_client = SimpleNamespace(configuration=client.configuration)
+        self.rejected = 0
+
+    def markets_list_get(self, page=1, env="prod"):
+        from data_bridges_client.rest import ApiException
+
+        if page >= 3 and self.api_client.configuration.access_token == "expired":
+            with self._lock:
+                self.rejected += 1
+            raise ApiException(status=401, reason="Unauthorized")
+        return super().markets_list_get(page=page, env=env)
+
+
+def test_fetch_all_pages_renews_expired_token(client, monkeypatch):
+    client.configuration.access_token = "expired"
+    tokens = iter(["renewed", "renewed-again"])
+    monkeypatch.setattr(
+        client,
+        "_setup_configuration_and_authentication",
+        lambda config: SimpleNamespace(access_token=next(tokens)),
+    )
+    api = ExpiringTokenApi(client, total_items=95, page_length=20)
+
+    items = client._fetch_pages(api.markets_list_get, all_pages=True)
+
+    assert [item["row"] for item in items] == list(range(95))
+    # Concurrent rejections renew the token once
+    assert client.configuration.access_token == "renewed"
+    assert api.rejected >= 1
+
+
+def test_rejected_renewed_token_is_raised(client, monkeypatch):
+    from data_bridges_client.rest import ApiException
+
+    client.configuration.access_token = "expired"
+    monkeypatch.setattr(
+        client,
+        "_setup_configuration_and_authentication",
+        lambda config: SimpleNamespace(access_token="expired"),
+    )
+    api = ExpiringTokenApi(client, total_items=95, page_length=20)
+
+    with pytest.raises(ApiException):
+        client._fetch_pages(api.markets_list_get, page=3)
+    assert api.rejected == 2
+
+
+def test_page_size_is_deprecated(client, monkeypatch):
+    monkeypatch.setattr(client, "_fetch_pages", lambda *args, **kwargs: [])
+
+    with pytest.warns(DeprecationWarning, match="page_size"):
+        client.get_exchange_rates("KEN", page_size=500)
+    with pytest.warns(DeprecationWarning, match="page_size"):
+        client.get_prices("KEN", "2024-01-01", page_size=500)
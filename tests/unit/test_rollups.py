@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.rollups import PriceRollups
+
+
+def price_rows(rows):
+    return pd.DataFrame(
+        [
+            {
+                "marketID": market,
+                "commodityID": commodity,
+                "commodityUnitID": 5,
+                "priceTypeID": 15,
+                "currencyID": 66,
+                "adm0Code": 133,
+                "commodityPriceDate": date,
+                "commodityPrice": price,
+            }
+            for market, commodity, date, price in rows
+        ]
+    )
+
+
+@pytest.fixture
+def markets():
+    return pd.DataFrame({"marketID": [1, 2, 3], "adm1Code": [10, 10, 20]})
+
+
+@pytest.fixture
+def rollups(markets):
+    return PriceRollups(
+        levels={"national": ["adm0Code"], "admin1": ["adm0Code", "adm1Code"]},
+        market_areas=markets,
+    )
+
+
+def full_recompute(prices, markets):
+    fresh = PriceRollups(
+        levels={"national": ["adm0Code"], "admin1": ["adm0Code", "adm1Code"]},
+        market_areas=markets,
+    )
+    fresh.update(prices)
+    return fresh
+
+
+INITIAL = [
+    (1, 7, "2024-01-05", 10.0),
+    (1, 7, "2024-01-20", 14.0),  # second price in the month, averaged
+    (2, 7, "2024-01-10", 20.0),
+    (3, 7, "2024-01-10", 40.0),
+    (1, 7, "2024-02-10", 11.0),
+    (3, 8, "2024-02-10", 5.0),
+]
+
+
+def test_initial_rollups(rollups):
+    counts = rollups.update(price_rows(INITIAL))
+    assert counts == {"national": 3, "admin1": 4}
+
+    national = rollups.get("national")
+    january = national.loc[(133, 7, 5, 15, 66, pd.Timestamp("2024-01-01"))]
+    assert january["mean"] == pytest.approx((12 + 20 + 40) / 3)
+    assert january["median"] == 20.0
+    assert january["markets"] == 3
+    assert national["markets"].dtype == "Int64"
+
+    admin1 = rollups.get("admin1", commodity_id=7, start="2024-01", end="2024-01")
+    assert admin1["median"].tolist() == [16.0, 40.0]
+
+
+def test_incremental_update_touches_only_affected_groups(rollups, markets):
+    rollups.update(price_rows(INITIAL))
+    before = rollups.get("admin1").copy()
+
+    update = [
+        (2, 7, "2024-01-10", 26.0),  # revision
+        (2, 7, "2024-03-10", 22.0),  # new month
+    ]
+    counts = rollups.update(price_rows(update))
+    assert counts == {"national": 2, "admin1": 2}
+
+    after = rollups.get("admin1")
+    assert after["markets"].dtype == "Int64"
+    untouched = before.index.drop([(133, 10, 7, 5, 15, 66, pd.Timestamp("2024-01-01"))])
+    pd.testing.assert_frame_equal(after.loc[untouched], before.loc[untouched])
+    assert (
+        after.loc[(133, 10, 7, 5, 15, 66, pd.Timestamp("2024-01-01")), "mean"] == 19.0
+    )
+
+    expected = full_recompute(
+        price_rows(INITIAL[:2] + [update[0]] + INITIAL[3:] + [update[1]]), markets
+    )
+    for level in ("national", "admin1"):
+        pd.testing.assert_frame_equal(rollups.get(level), expected.get(level))
+
+
+def test_update_skips_unusable_rows_and_validates_levels(rollups):
+    rows = price_rows(INITIAL)
+    rows.loc[0, "commodityPrice"] = None
+    rows.loc[1, "commodityPriceDate"] = None
+    rollups.update(rows)
+    # Market 1 lost both January prices
+    assert rollups.get("national")["markets"].iloc[0] == 2
+    assert rollups.update(rows.iloc[:0]) == {"national": 0, "admin1": 0}
+
+    with pytest.raises(ValueError, match="market_areas"):
+        PriceRollups(levels={"admin1": ["adm1Code"]}).update(rows)
+    with pytest.raises(KeyError):
+        rollups.get("admin2")
+
+
+def test_matches_groupby_on_larger_data(markets):
+    rng = np.random.default_rng(0)
+    n = 2000
+    rows = price_rows(
+        zip(
+            rng.integers(1, 4, n),
+            rng.integers(1, 6, n),
+            pd.to_datetime("2023-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+            rng.uniform(1, 100, n).round(2),
+        )
+    )
+    rollups = PriceRollups(market_areas=markets)
+    rollups.update(rows.iloc[:1500])
+    rollups.update(rows.iloc[1500:])
+
+    deduplicated = rows.drop_duplicates(
+        ["marketID", "commodityID", "commodityPriceDate"], keep="last"
+    )
+    month = deduplicated["commodityPriceDate"].dt.to_period("M").dt.to_timestamp()
+    cells = (
+        deduplicated.assign(month=month)
+        .groupby(["marketID", "commodityID", "month"])["commodityPrice"]
+        .mean()
+    )
+    expected = cells.groupby(level=["commodityID", "month"]).median()
+
+    national = rollups.get("national")["median"]
+    national.index = national.index.droplevel(
+        ["adm0Code", "commodityUnitID", "priceTypeID", "currencyID"]
+    )
+    pd.testing.assert_series_equal(
+        national.sort_index(),
+        expected.sort_index(),
+        check_names=False,
+        check_index_type=False,
+    )
@@ -0,0 +1,251 @@
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.spatial import (
+    MarketIndex,
+    geojson_to_frame,
+    haversine_km,
+    write_geoparquet,
+)
+
+
+@pytest.fixture
+def markets():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame(
+        {
+            "marketId": np.arange(n) + 1000,
+            "marketName": [f"Market {i}" for i in range(n)],
+            # Kenya-sized box, with one market lacking coordinates
+            "latitude": np.append(rng.uniform(-4.5, 4.5, n - 1), None),
+            "longitude": np.append(rng.uniform(34, 41.5, n - 1), None),
+        }
+    )
+
+
+def brute_force(index, lat, lng):
+    return haversine_km(lat[:, None], lng[:, None], index.lat, index.lng)
+
+
+def test_haversine_known_distance():
+    # Nairobi to Mombasa, about 440 km
+    assert haversine_km(-1.2864, 36.8172, -4.0435, 39.6682) == pytest.approx(440, abs=5)
+    assert haversine_km(10.0, 20.0, 10.0, 20.0) == 0
+
+
+def test_index_skips_markets_without_coordinates(markets):
+    index = MarketIndex(markets)
+    assert len(index) == len(markets) - 1
+    assert index.markets["marketId"].tolist() == markets["marketId"][:-1].tolist()
+
+
+def test_index_finds_coordinate_columns_case_insensitively(markets):
+    renamed = markets.rename(
+        columns={"latitude": "MarketLatitude", "longitude": "MarketLongitude"}
+    )
+    assert len(MarketIndex(renamed)) == len(markets) - 1
+    with pytest.raises(ValueError, match="lat_column"):
+        MarketIndex(markets.drop(columns="latitude"))
+
+
+def test_query_matches_brute_force(markets, monkeypatch):
+    # Small chunks, so queries span several of them
+    monkeypatch.setattr("data_bridges_knots.spatial._CHUNK_ELEMENTS", 1000)
+    index = MarketIndex(markets)
+    rng = np.random.default_rng(1)
+    lat, lng = rng.uniform(-5, 5, 50), rng.uniform(33, 42, 50)
+
+    distances, positions = index.query(lat, lng, k=3)
+
+    expected = np.sort(brute_force(index, lat, lng), axis=1)[:, :3]
+    np.testing.assert_allclose(distances, expected, rtol=1e-9)
+    np.testing.assert_allclose(
+        distances,
+        haversine_km(
+            lat[:, None], lng[:, None], index.lat[positions], index.lng[positions]
+        ),
+    )
+
+
+def test_query_invalid_points_and_large_k(markets):
+    index = MarketIndex(markets.head(3))
+    distances, positions = index.query([0.0, np.nan], [37.0, 37.0], k=5)
+
+    assert positions.shape == (2, 5)
+    assert (positions[0, :3] >= 0).all() and (positions[0, 3:] == -1).all()
+    assert (positions[1] == -1).all() and np.isnan(distances[1]).all()
+    assert np.all(np.diff(distances[0, :3]) >= 0)
+
+
+def test_query_radius_matches_brute_force(markets):
+    index = MarketIndex(markets)
+    rng = np.random.default_rng(2)
+    lat, lng = rng.uniform(-5, 5, 40), rng.uniform(33, 42, 40)
+
+    queries, positions, distances = index.query_radius(lat, lng, radius_km=80)
+
+    full = brute_force(index, lat, lng)
+    expected_q, expected_m = np.nonzero(full <= 80)
+    assert sorted(zip(queries, positions)) == sorted(zip(expected_q, expected_m))
+    np.testing.assert_allclose(distances, full[queries, positions])
+    # Ordered by query, then distance
+    assert np.all(np.diff(queries) >= 0)
+    same_query = np.diff(queries) == 0
+    assert np.all(np.diff(distances)[same_query] >= 0)
+
+
+def test_nearest_and_within_frames(markets):
+    index = MarketIndex(markets)
+    target = index.markets.iloc[10]
+
+    nearest = index.nearest([target["latitude"], np.nan], [target["longitude"], 0])
+    assert nearest["query_index"].tolist() == [0, 1]
+    assert nearest.loc[0, "marketId"] == target["marketId"]
+    assert nearest.loc[0, "distance_km"] == pytest.approx(0, abs=1e-6)
+    assert pd.isna(nearest.loc[1, "marketId"])
+
+    within = index.within(target["latitude"], target["longitude"], radius_km=50)
+    assert within["marketId"].iloc[0] == target["marketId"]
+    assert (within["distance_km"] <= 50).all()
+    assert list(within.columns[:2]) == ["query_index", "distance_km"]
+
+    empty = index.within(target["latitude"], target["longitude"], radius_km=0.0)
+    assert len(empty) == 1
+
+
+def test_from_geojson():
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [36.8, -1.3]},
+                "properties": {"marketId": 1},
+            },
+            {"type": "Feature", "geometry": None, "properties": {"marketId": 2}},
+        ],
+    }
+    index = MarketIndex.from_geojson(geojson)
+    assert len(index) == 1
+    assert index.nearest(-1.3, 36.8)["marketId"].tolist() == [1]
+    assert len(MarketIndex.from_geojson({"features": []})) == 0
+
+
+def test_client_caches_index_per_country(make_client, markets, monkeypatch):
+    client = make_client()
+    calls = []
+
+    def get_markets_list(country_iso3=None, page=1, all_pages=False):
+        calls.append((country_iso3, all_pages))
+        return markets
+
+    monkeypatch.setattr(client, "get_markets_list", get_markets_list)
+
+    index = client.get_market_index("ken")
+    assert client.get_market_index("KEN") is index
+    assert calls == [("KEN", True)]
+    assert client.get_market_index("KEN", refresh=True) is not index
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        client.get_market_index()
+
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [36.8, -1.3]},
+            "properties": {"marketId": 1, "marketName": "Nairobi", "adm1Code": 10},
+        },
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [39.7, -4.0, 12.0]},
+            "properties": {"marketId": 2, "marketName": "Mombasa", "adm1Code": 20},
+        },
+        {"type": "Feature", "geometry": None, "properties": {"marketId": 3}},
+    ],
+}
+
+
+def test_geojson_to_frame():
+    df = geojson_to_frame(GEOJSON)
+
+    assert df["marketId"].tolist() == [1, 2, 3]
+    assert df["longitude"].dtype == np.float64
+    np.testing.assert_array_equal(df["longitude"], [36.8, 39.7, np.nan])
+    np.testing.assert_array_equal(df["latitude"], [-1.3, -4.0, np.nan])
+
+    empty = geojson_to_frame({"features": []})
+    assert len(empty) == 0
+    assert {"longitude", "latitude"} <= set(empty.columns)
+
+
+def test_write_geoparquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "markets.parquet"
+
+    write_geoparquet(geojson_to_frame(GEOJSON), path)
+
+    table = pq.read_table(path)
+    geo = json.loads(table.schema.metadata[b"geo"])
+    assert geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
+    assert geo["columns"]["geometry"]["bbox"] == [36.8, -4.0, 39.7, -1.3]
+
+    geometry = table.column("geometry").to_pylist()
+    assert geometry[2] is None
+    order, kind, x, y = struct.unpack("<BIdd", geometry[1])
+    assert (order, kind, x, y) == (1, 1, 39.7, -4.0)
+    assert table.column("marketName").to_pylist()[:2] == ["Nairobi", "Mombasa"]
+
+
+def test_client_geojson_table(make_client, monkeypatch, tmp_path):
+    pytest.importorskip("pyarrow")
+    client = make_client()
+    monkeypatch.setattr(client, "get_market_geojson_list", lambda iso3: GEOJSON)
+
+    df = client.get_market_geojson_table("KEN", tmp_path / "ken.parquet")
+
+    assert len(df) == 3
+    assert (tmp_path / "ken.parquet").exists()
+
+
+def test_polars_geojson_table(make_client, monkeypatch, tmp_path):
+    pl = pytest.importorskip("polars")
+    pq = pytest.importorskip("pyarrow.parquet")
+    client = make_client(backend="polars")
+    monkeypatch.setattr(client, "get_market_geojson_list", lambda iso3: GEOJSON)
+
+    df = client.get_market_geojson_table("KEN", tmp_path / "ken.parquet")
+
+    assert isinstance(df, pl.DataFrame)
+    assert df["marketId"].to_list() == [1, 2, 3]
+    assert df["latitude"].dtype == pl.Float64
+    table = pq.read_table(tmp_path / "ken.parquet")
+    assert table.column("geometry").to_pylist()[2] is None
+    assert json.loads(table.schema.metadata[b"geo"])["columns"]["geometry"]["bbox"] == [
+        36.8,
+        -4.0,
+        39.7,
+        -1.3,
+    ]
+    assert len(geojson_to_frame({"features": []}, backend="polars")) == 0
+
+
+def test_arrow_geojson_table(make_client, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    client = make_client(backend="arrow")
+    monkeypatch.setattr(client, "get_market_geojson_list", lambda iso3: GEOJSON)
+
+    table = client.get_market_geojson_table("KEN")
+
+    assert isinstance(table, pa.Table)
+    assert table.column("marketId").to_pylist() == [1, 2, 3]
+    assert table.schema.field("latitude").type == pa.float64()
+    assert geojson_to_frame({"features": [{}, {}]}, backend="arrow").num_rows == 2
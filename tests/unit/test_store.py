@@ -0,0 +1,182 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from data_bridges_knots.store import DatasetStore
+
+pa = pytest.importorskip("pyarrow")
+
+RECORDS = [
+    {"marketId": 1, "adm1Code": 10, "commodityPrice": 12.5, "isOfficial": True},
+    {"marketId": 2, "adm1Code": None, "commodityPrice": None, "isOfficial": None},
+    {"marketId": 3, "adm1Code": 30, "commodityPrice": 14.0, "isOfficial": False},
+]
+
+
+@pytest.fixture
+def table():
+    return pa.Table.from_pylist(RECORDS)
+
+
+def test_put_and_get_memory_mapped(tmp_path, table):
+    store = DatasetStore(tmp_path / "store")
+    params = {"country_code": "KEN", "market_id": 0}
+
+    assert store.get("market_prices_price_monthly_get", params) is None
+    store.put("market_prices_price_monthly_get", params, table)
+
+    allocated = pa.total_allocated_bytes()
+    stored = store.get(
+        "market_prices_price_monthly_get", dict(reversed(params.items()))
+    )
+    assert pa.total_allocated_bytes() == allocated
+    assert stored.select(table.column_names).equals(table)
+    assert store.get("market_prices_price_monthly_get", {"country_code": "UGA"}) is None
+    assert len(store) == 1
+
+
+def test_catalog_remove_and_clear(tmp_path, table):
+    store = DatasetStore(tmp_path)
+    store.put("market_prices_price_monthly_get", {"country_code": "KEN"}, table)
+    store.put("household_public_base_data_get", {"survey_id": 3094}, table.to_pandas())
+    (tmp_path / "other.arrow").write_bytes(b"not arrow")
+
+    catalog = store.catalog()
+    assert catalog["endpoint"].tolist() == [
+        "market_prices_price_monthly_get",
+        "household_public_base_data_get",
+    ]
+    assert catalog["params"].iloc[1] == {"survey_id": 3094}
+    assert catalog["rows"].tolist() == [3, 3]
+    assert catalog["columns"].tolist() == [4, 4]
+    assert catalog["created"].is_monotonic_increasing
+
+    assert store.remove("household_public_base_data_get", {"survey_id": 3094})
+    assert not store.remove("household_public_base_data_get", {"survey_id": 3094})
+    store.clear()
+    assert len(store.catalog()) == 0
+
+
+def test_max_age(tmp_path, table):
+    store = DatasetStore(tmp_path, max_age="1h")
+    path = store.path("currency_list_get", {})
+    store.put("currency_list_get", {}, table)
+    assert store.get("currency_list_get", {}) is not None
+
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    assert store.get("currency_list_get", {}) is None
+
+
+def test_replacing_keeps_mapped_tables_valid(tmp_path, table):
+    store = DatasetStore(tmp_path)
+    first = store.put("currency_list_get", {}, table)
+    store.put("currency_list_get", {}, table.slice(0, 1))
+
+    assert first.num_rows == 3
+    assert first.column("marketId").to_pylist() == [1, 2, 3]
+    assert store.get("currency_list_get", {}).num_rows == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+# Codes mixed with text, and nested values, as in raw survey columns
+MIXED_RECORDS = [
+    {"hhId": 1, "q1": 1, "q2": {"a": 1}, "fcs": 12.5},
+    {"hhId": 2, "q1": "N/A", "q2": [1, 2], "fcs": None},
+    {"hhId": 3, "q1": None, "q2": "other", "fcs": 40.0},
+    {"hhId": 4, "q1": 2.5, "q2": None, "fcs": 55.5},
+]
+
+OPTIONS = [
+    {},
+    {"output_policy": "pandas_nullable"},
+    {"output_policy": "arrow"},
+    {"backend": "arrow"},
+    {"backend": "polars"},
+]
+
+
+def assert_same_frame(df, expected):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(df, expected)
+    else:
+        # Arrow tables and polars frames
+        assert df.equals(expected)
+
+
+def fetch_records(records, calls):
+    def fetch_pages(api_call, *args, **kwargs):
+        calls.append(kwargs)
+        return [dict(record) for record in records]
+
+    return fetch_pages
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_client_keeps_mixed_columns(make_client, tmp_path, options):
+    if options.get("backend") == "polars":
+        pytest.importorskip("polars")
+    calls = []
+    fresh = make_client(**options)
+    fresh._fetch_pages = fetch_records(MIXED_RECORDS, calls)
+    client = make_client(dataset_store=tmp_path, **options)
+    client._fetch_pages = fetch_records(MIXED_RECORDS, calls)
+
+    expected = fresh.get_prices("KEN", "2024-01-01", "2024-12-31")
+    for _ in range(2):
+        df = client.get_prices("KEN", "2024-01-01", "2024-12-31")
+        assert_same_frame(df, expected)
+    assert len(calls) == 2
+    if not options:
+        assert df["q1"].tolist() == [1, "N/A", None, 2.5]
+
+
+@pytest.mark.parametrize("options", OPTIONS[:1] + OPTIONS[3:])
+def test_client_stores_household_surveys(make_client, tmp_path, options):
+    if options.get("backend") == "polars":
+        pytest.importorskip("polars")
+    calls = []
+    fresh = make_client(**options)
+    fresh._fetch_pages = fetch_records(MIXED_RECORDS, calls)
+    client = make_client(dataset_store=tmp_path, **options)
+    client._fetch_pages = fetch_records(MIXED_RECORDS, calls)
+
+    expected = fresh.get_household_survey(3094, "official")
+    for _ in range(2):
+        assert_same_frame(client.get_household_survey(3094, "official"), expected)
+    assert len(calls) == 2
+
+    # Another access type is another entry
+    client.get_household_survey(3094, "public")
+    assert len(calls) == 3
+    catalog = client.dataset_store.catalog()
+    assert catalog["params"].iloc[0]["survey_id"] == 3094
+    assert "api_key" not in catalog["params"].iloc[0]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_client_reads_stored_results(make_client, tmp_path, options):
+    if options.get("backend") == "polars":
+        pytest.importorskip("polars")
+    calls = []
+    fetch_pages = fetch_records(RECORDS, calls)
+    fresh = make_client(**options)
+    fresh._fetch_pages = fetch_pages
+    expected = fresh.get_prices("KEN", "2024-01-01", "2024-12-31")
+
+    clients = [make_client(dataset_store=tmp_path, **options) for _ in range(2)]
+    for client in clients:
+        client._fetch_pages = fetch_pages
+    first = clients[0].get_prices("KEN", "2024-01-01", "2024-12-31")
+    second = clients[1].get_prices("KEN", "2024-01-01", "2024-12-31")
+
+    # The second client maps the file the first one stored
+    assert len(calls) == 2
+    for df in (first, second):
+        assert_same_frame(df, expected)
+
+    clients[1].get_prices("KEN", "2024-01-01", "2025-12-31")
+    assert len(calls) == 3
+    assert len(clients[0].dataset_store.catalog()) == 2
@@ -0,0 +1,60 @@
+import pytest
+
+from data_bridges_knots.tracing import Tracer
+
+
+def test_span_is_noop_without_hooks():
+    tracer = Tracer()
+    assert not tracer.enabled
+    assert tracer.span("dataframe") is tracer.span("to_dict")
+
+
+def test_hooks_receive_nested_spans():
+    tracer = Tracer()
+    started, ended = [], []
+    tracer.add_hook(on_span_start=started.append, on_span_end=ended.append)
+
+    with tracer.span("http_request", endpoint="markets_list_get") as outer:
+        with tracer.span("deserialize") as inner:
+            pass
+        outer.set_attribute("bytes", 42)
+
+    assert [s.name for s in started] == ["http_request", "deserialize"]
+    assert [s.name for s in ended] == ["deserialize", "http_request"]
+    assert inner.parent is outer
+    assert outer.attributes == {"endpoint": "markets_list_get", "bytes": 42}
+    assert outer.duration >= inner.duration >= 0
+    assert tracer.current_span() is None
+
+
+def test_span_records_exception_and_failing_hook_is_ignored():
+    tracer = Tracer()
+    ended = []
+
+    def broken_hook(span):
+        raise RuntimeError("hook failure")
+
+    tracer.add_hook(on_span_start=broken_hook, on_span_end=ended.append)
+    with pytest.raises(ValueError):
+        with tracer.span("postprocess"):
+            raise ValueError("boom")
+    assert isinstance(ended[0].exception, ValueError)
+
+
+def test_remove_hook():
+    tracer = Tracer()
+    hook = tracer.add_hook(on_span_end=print)
+    tracer.remove_hook(hook)
+    assert not tracer.enabled
+
+
+def test_to_frame_traces_frame_stages(make_client):
+    client = make_client()
+    ended = []
+    client.tracer.add_hook(on_span_end=ended.append)
+
+    df = client._to_frame("markets_list_get", [{"marketId": 1}, {"marketId": 2}])
+
+    assert len(df) == 2
+    assert [s.name for s in ended] == ["to_dict", "dataframe", "postprocess"]
+    assert ended[0].attributes == {"endpoint": "markets_list_get", "rows": 2}
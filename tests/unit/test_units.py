@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_bridges_knots.units import UnitConversionIndex, normalize_units
+
+KG, LITRE, BAG_50KG, TIN_4L, PIECE = 5, 15, 30, 40, 99
+
+
+@pytest.fixture
+def conversions():
+    return pd.DataFrame(
+        {
+            "commodityID": [1, 1, 2, 2, 3, 3],
+            "fromUnitID": [BAG_50KG, BAG_50KG, TIN_4L, TIN_4L, BAG_50KG, PIECE],
+            "toUnitID": [KG, KG, LITRE, KG, KG, KG],
+            # Duplicated key keeps the first factor; missing factors are ignored
+            "conversionFactor": [50.0, 49.0, 4.0, 3.6, 50.0, None],
+        }
+    )
+
+
+@pytest.fixture
+def prices():
+    return pd.DataFrame(
+        {
+            "commodityID": [1, 1, 2, 3, 3, None],
+            "commodityUnitID": [BAG_50KG, KG, TIN_4L, PIECE, 77, KG],
+            "commodityPrice": [2500.0, 55.0, 800.0, 10.0, 1.0, 3.0],
+            "countryISO3": ["KEN"] * 6,
+        }
+    )
+
+
+def test_index_skips_unusable_conversions(conversions):
+    index = UnitConversionIndex(conversions)
+    assert len(index) == 4
+    assert index.target_units.tolist() == [KG, LITRE]
+
+
+def test_lookup_default_target(conversions):
+    index = UnitConversionIndex(conversions)
+    factors, units = index.lookup(
+        [1, 2, 1, 3, "2"], [BAG_50KG, TIN_4L, KG, PIECE, float(TIN_4L)]
+    )
+    np.testing.assert_array_equal(factors, [50.0, 4.0, 1.0, np.nan, 4.0])
+    np.testing.assert_array_equal(units, [KG, LITRE, KG, np.nan, LITRE])
+
+
+def test_lookup_explicit_target(conversions):
+    index = UnitConversionIndex(conversions)
+    factors, units = index.lookup([2, 2, 1], [TIN_4L, KG, BAG_50KG], to_unit_id=KG)
+    np.testing.assert_array_equal(factors, [3.6, 1.0, 50.0])
+    np.testing.assert_array_equal(units, [KG, KG, KG])
+
+
+def test_normalize_units_flags_unconvertible_rows(prices, conversions):
+    df = normalize_units(prices, conversions)
+
+    assert len(df) == len(prices)
+    assert "normalizedPrice" not in prices
+    assert df["unitConverted"].tolist() == [True, True, True, False, False, True]
+    np.testing.assert_allclose(
+        df["normalizedPrice"], [50.0, 55.0, 200.0, np.nan, np.nan, 3.0]
+    )
+    np.testing.assert_array_equal(
+        df["normalizedUnitID"], [KG, KG, LITRE, np.nan, np.nan, KG]
+    )
+
+
+def test_normalize_units_handles_none_ids_and_empty_tables(prices, conversions):
+    with_none = prices.astype(object).where(prices.notna(), None)
+    df = normalize_units(with_none, UnitConversionIndex(conversions))
+    assert df["unitConverted"].sum() == 4
+
+    empty = normalize_units(prices, conversions.iloc[:0])
+    # Only prices already in kilograms or litres could be kept, and none are known
+    assert not empty["unitConverted"].any()
+    assert len(normalize_units(prices.iloc[:0], conversions)) == 0
+
+
+def test_client_normalize_units_caches_index(make_client, prices, conversions):
+    client = make_client()
+    calls = []
+
+    def get_conversions(country_iso3=None, all_pages=False):
+        calls.append((country_iso3, all_pages))
+        return conversions
+
+    client.get_commodity_units_conversion_list = get_conversions
+
+    first = client.normalize_units(prices)
+    second = client.normalize_units(prices, to_unit_id=KG)
+
+    assert calls == [("KEN", True)]
+    assert first["normalizedPrice"].iloc[0] == 50.0
+    assert second["normalizedPrice"].iloc[2] == pytest.approx(800 / 3.6)
+
+    client.normalize_units(prices.assign(countryISO3=["KEN", "UGA"] * 3))
+    assert calls[-1] == (None, True)
+
+
+def test_client_normalize_units_polars_prices(make_client, prices, conversions):
+    pl = pytest.importorskip("polars")
+    pytest.importorskip("pyarrow")
+    client = make_client(backend="polars")
+    client.get_commodity_units_conversion_list = (
+        lambda country_iso3=None, all_pages=False: pl.from_pandas(conversions)
+    )
+
+    df = client.normalize_units(pl.from_pandas(prices))
+
+    assert isinstance(df, pl.DataFrame)
+    assert df["unitConverted"].to_list() == [True, True, True, False, False, True]